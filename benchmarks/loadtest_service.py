@@ -0,0 +1,167 @@
+# 계산 HTTP 서비스 부하 테스트 -> 합성 선대 (run_benchmarks.make_fleet)로 요청을 만들어 동시 연결로 보내고
+# 경로별 처리량 (요청/s, 선박/s)과 지연 시간 (p50 / p95 / p99)을 출력
+#
+#  python benchmarks/loadtest_service.py                          # 로컬 서비스를 띄워서 측정 (끝나면 종료)
+#  python benchmarks/loadtest_service.py --url http://127.0.0.1:8765 --concurrency 8 --requests 500
+#
+# 경로별로 선박 1척 요청 ("fuel_data")과 --batch 척을 한 번에 보내는 일괄 요청 ("vessels")을 비교
+# 로컬 서비스는 빈 임시 캐시 폴더로 시작 (1척 요청은 같은 선박이 반복되면 결과 캐시를 사용)
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run_benchmarks import make_fleet, vessel_records  # noqa: E402
+
+REQUEST_COLUMNS = {
+    "FEUM": ["연료종류", "LHV", "WtW", "역내", "역외"],
+    "GFI": ["연료종류", "LHV", "WtW", "사용량"],
+}
+REGIME_PATHS = {"FEUM": "/fueleu", "GFI": "/gfi"}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# 로컬 서비스 시작 -> /health가 응답할 때까지 대기
+def start_local_service(cache_dir: str, timeout: float = 30.0) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "compliance.service", "--port", str(port), "--cache-dir", cache_dir, "--quiet"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서비스가 시작되지 않았습니다 (종료 코드 {process.returncode})")
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1):
+                return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"서비스가 {timeout:.0f}초 안에 응답하지 않았습니다")
+
+# 요청 본문 목록 (미리 JSON bytes로 변환) -> 선박 1척 요청 또는 batch 척씩 묶은 일괄 요청
+def make_payloads(regime: str, n_vessels: int, batch: int, seed: int) -> list[bytes]:
+    fleet = make_fleet(n_vessels, regime, seed)
+    records = vessel_records(fleet, range(n_vessels), REQUEST_COLUMNS[regime])
+    if batch <= 1:
+        bodies = [{"fuel_data": rows} for rows in records]
+    else:
+        bodies = [
+            {"vessels": {f"V{start + i}": rows for i, rows in enumerate(records[start:start + batch])}}
+            for start in range(0, len(records), batch)
+        ]
+    return [json.dumps(body, ensure_ascii=False).encode("utf-8") for body in bodies]
+
+# 동시 연결 concurrency개로 payloads를 순서대로 나눠 보냄 (연결은 keep-alive로 재사용)
+def run_load(url: str, path: str, payloads: list[bytes], n_requests: int, concurrency: int) -> dict:
+    target = urlsplit(url)
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        conn = http.client.HTTPConnection(target.hostname, target.port, timeout=60)
+        local, local_errors = [], []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            try:
+                conn.request("POST", path, body=payloads[i % len(payloads)], headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors.append(response.status)
+            except (OSError, http.client.HTTPException) as e:
+                local_errors.append(type(e).__name__)
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port, timeout=60)
+            local.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": seconds,
+        "rps": len(latencies) / seconds,
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GFI / FuelEU 계산 HTTP 서비스 부하 테스트")
+    parser.add_argument("--url", default=None, help="실행 중인 서비스 주소 (없으면 로컬 서비스를 띄워서 측정)")
+    parser.add_argument("--regimes", default="FEUM,GFI", help="측정할 규제 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=200, help="경로별 선박 1척 요청 수")
+    parser.add_argument("--batch-requests", type=int, default=20, help="경로별 일괄 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 연결 수")
+    parser.add_argument("--batch", type=int, default=100, help="일괄 요청 1건에 담는 선박 수")
+    parser.add_argument("--vessels", type=int, default=500, help="합성 선대 크기 (요청 본문을 돌려 가며 사용)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    process, tmp = None, None
+    url = args.url
+    if url is None:
+        tmp = tempfile.TemporaryDirectory(prefix="compliance-loadtest-")
+        process, url = start_local_service(tmp.name)
+        print(f"로컬 서비스: {url}")
+
+    failed = False
+    try:
+        print(f"{'경로':<16} {'선박/요청':>9} {'요청':>6} {'오류':>5} {'요청/s':>9} {'선박/s':>10} "
+              f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+        for regime in [regime.strip() for regime in args.regimes.split(",") if regime.strip()]:
+            path = REGIME_PATHS[regime]
+            for batch in (1, args.batch):
+                payloads = make_payloads(regime, args.vessels, batch, args.seed)
+                n_requests = args.requests if batch <= 1 else args.batch_requests
+                r = run_load(url, path, payloads, n_requests, args.concurrency)
+                failed |= r["errors"] > 0
+                print(f"{path:<16} {batch:>9} {r['requests']:>6} {r['errors']:>5} {r['rps']:>9.1f} {r['rps'] * batch:>10.1f} "
+                      f"{r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+            tmp.cleanup()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# 계산 경로별 벤치마크 -> 합성 선대 (선박당 연료 1 ~ 20줄)로 시간을 재서 history.jsonl에 기록하고
+# 같은 머신의 최근 기록보다 thresholds.json 기준 이상 느려지면 종료 코드 1
+#
+#  python benchmarks/run_benchmarks.py                      # 1 / 100 / 10k / 100k 척
+#  python benchmarks/run_benchmarks.py --sizes 1,100 --no-record
+#
+# 선박 단위 경로 (calculate_fueleu_result 등)는 --sample 척만 재서 1척당 시간으로 비교하고 전체 시간은 환산값으로 기록,
+# 선대 단위 경로 (calculate_fueleu_batch, project_gfi)는 선대 전체를 한 번에 계산
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from compliance import (  # noqa: E402
+    GFI_YEARS,
+    calculate_fueleu_batch,
+    calculate_fueleu_result,
+    calculate_gfi_projection,
+    calculate_gfi_result,
+    calculate_green_fuel_table,
+    calculate_pooling_table,
+    expand_mixed_fuel_GFI,
+    generate_FEUM_fuel_defaults,
+    generate_GFI_fuel_defaults,
+    get_factor_table,
+    get_merged_fueleu_data,
+    get_merged_gfi_data,
+    project_gfi,
+)
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_SIZES = [1, 100, 10_000, 100_000]
+
+# 합성 선대 연료 후보 (화석연료 위주 + 혼합/바이오/LNG 일부)
+FEUM_FLEET_FUELS = {
+    "HFO (Grades RME to RMK)": 6, "LFO (Grades RMA to RMD)": 4, "MDO MGO (Grades DMX to DMB)": 4,
+    "LNG / LNG Otto (dual fuel medium speed)": 1, "Bio(Fame)": 1, "B24(HFO)": 1, "B30(LFO)": 1,
+}
+GFI_FLEET_FUELS = {
+    "HSFO": 6, "VLSFO": 4, "LSMGO": 4, "LNG / LNG Otto (dual fuel medium speed)": 1, "Bio(Fame)": 1,
+    "B24(HSFO)": 1, "B30(VLSFO)": 1,
+}
+
+# 합성 선대 (선박, 기간, 연료종류, LHV, WtW, 역내, 역외, 사용량) -> 선박당 연료 1 ~ 20줄, 같은 seed면 같은 선대
+def make_fleet(n_vessels: int, regime: str, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng([seed, n_vessels, int(regime == "GFI")])
+    table = get_factor_table(regime)
+    weights = FEUM_FLEET_FUELS if regime == "FEUM" else GFI_FLEET_FUELS
+    names = np.array([fuel for fuel in weights if fuel in table])
+    p = np.array([weights[fuel] for fuel in names], dtype=float)
+
+    lines = rng.integers(1, 21, n_vessels)
+    fuel = rng.choice(names, size=lines.sum(), p=p / p.sum())
+    idx = table.lookup(fuel)
+    inside = rng.uniform(0, 3000, len(fuel)).round(1)
+    outside = rng.uniform(0, 3000, len(fuel)).round(1)
+    return pd.DataFrame({
+        "선박": np.repeat(np.arange(n_vessels), lines),
+        "기간": 2025,
+        "연료종류": fuel,
+        "LHV": table.lhv[idx],
+        "WtW": table.wtw[idx],
+        "역내": inside,
+        "역외": outside,
+        "사용량": inside + outside,
+    })
+
+# 선박별 레코드 리스트 (선박 단위 경로 입력)
+def vessel_records(fleet: pd.DataFrame, vessels, columns) -> list[list[dict]]:
+    sample = fleet[fleet["선박"].isin(vessels)]
+    return [group[columns].to_dict("records") for _, group in sample.groupby("선박", sort=False)]
+
+def _best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# 경로 하나 측정 -> scope "vessel"은 1척당 시간, "fleet"은 선대 전체 시간이 비교 기준값 (value)
+def _measure(path, scope, n_vessels, rows, func, count, repeat):
+    seconds = _best_time(func, repeat)
+    per_vessel = seconds / count if count else None
+    return {
+        "path": path,
+        "scope": scope,
+        "vessels": n_vessels,
+        "rows": int(rows),
+        "measured_vessels": count,
+        "seconds": seconds if scope == "fleet" else per_vessel * n_vessels,
+        "value": seconds if scope == "fleet" else per_vessel,
+    }
+
+# 선대 크기 하나에 대해 모든 경로 측정
+def run_size(n_vessels: int, sample: int, repeat: int, seed: int) -> list[dict]:
+    fuel_defaults_FEUM = get_factor_table("FEUM").defaults
+    fuel_defaults_GFI = get_factor_table("GFI").defaults
+    feum = make_fleet(n_vessels, "FEUM", seed)
+    gfi = make_fleet(n_vessels, "GFI", seed)
+    measured = np.arange(min(sample, n_vessels))
+    results = []
+
+    # 선박 단위 경로
+    feum_records = vessel_records(feum, measured, ["연료종류", "LHV", "WtW", "역내", "역외"])
+    gfi_records = vessel_records(gfi, measured, ["연료종류", "LHV", "WtW", "사용량"])
+    merged = [get_merged_fueleu_data(records) for records in feum_records]
+    fueleu_results = [calculate_fueleu_result(records, fuel_defaults_FEUM) for records in merged]
+    deficit = [r for r in fueleu_results if r["avg_ghg_intensity"] > r["standard_now"]]
+    surplus = [r for r in fueleu_results if r["avg_ghg_intensity"] < r["standard_now"]]
+    gfi_results = [calculate_gfi_result(records, fuel_defaults_GFI) for records in gfi_records]
+    years = np.array(GFI_YEARS)
+
+    vessel_paths = [
+        ("expand_mixed_fuel_GFI", gfi, gfi_records, lambda: [expand_mixed_fuel_GFI(r, fuel_defaults_GFI) for r in gfi_records]),
+        ("get_merged_fueleu_data", feum, feum_records, lambda: [get_merged_fueleu_data(r) for r in feum_records]),
+        ("get_merged_gfi_data", gfi, gfi_records, lambda: [get_merged_gfi_data(r) for r in gfi_records]),
+        ("calculate_fueleu_result", feum, merged, lambda: [calculate_fueleu_result(r, fuel_defaults_FEUM) for r in merged]),
+        ("calculate_gfi_result", gfi, gfi_records, lambda: [calculate_gfi_result(r, fuel_defaults_GFI) for r in gfi_records]),
+        ("calculate_green_fuel_table", feum, deficit, lambda: [calculate_green_fuel_table(r, fuel_defaults_FEUM) for r in deficit]),
+        ("calculate_pooling_table", feum, surplus, lambda: [calculate_pooling_table(r, fuel_defaults_FEUM) for r in surplus]),
+        ("calculate_gfi_projection", gfi, gfi_results, lambda: [calculate_gfi_projection(r["gfi"], r["total_energy"], years) for r in gfi_results]),
+    ]
+    for path, fleet, items, func in vessel_paths:
+        if items:
+            results.append(_measure(path, "vessel", n_vessels, len(fleet), func, len(items), repeat))
+
+    # 선대 단위 경로
+    results.append(_measure("calculate_fueleu_batch", "fleet", n_vessels, len(feum),
+                            lambda: calculate_fueleu_batch(feum, vessel_col="선박"), n_vessels, repeat))
+    results.append(_measure("project_gfi", "fleet", n_vessels, len(gfi),
+                            lambda: project_gfi(gfi[["선박", "연료종류", "사용량"]], GFI_YEARS), n_vessels, repeat))
+    return results
+
+# 선대 크기와 무관한 경로 (계수표 생성)
+def run_static(repeat: int) -> list[dict]:
+    return [
+        _measure("generate_FEUM_fuel_defaults", "fleet", 0, 0, generate_FEUM_fuel_defaults, 0, repeat),
+        _measure("generate_GFI_fuel_defaults", "fleet", 0, 0, generate_GFI_fuel_defaults, 0, repeat),
+    ]
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# 경로별 기준 설정 (기본값 + 경로별 덮어쓰기)
+def _limit(thresholds: dict, path: str) -> dict:
+    return {**thresholds.get("default", {}), **thresholds.get("paths", {}).get(path, {})}
+
+# 같은 머신의 최근 기록 중앙값과 비교 -> 느려진 경로 목록
+def check_regressions(results: list[dict], history: list[dict], thresholds: dict, host: str) -> list[dict]:
+    window = thresholds.get("history_window", 5)
+    regressions = []
+    for result in results:
+        limit = _limit(thresholds, result["path"])
+        previous = [h["value"] for h in history
+                    if h["host"] == host and h["path"] == result["path"] and h["vessels"] == result["vessels"]][-window:]
+        reasons = []
+        if "max_value" in limit and result["value"] > limit["max_value"]:
+            reasons.append(f"max {limit['max_value']:.6g}s")
+        if previous:
+            baseline = statistics.median(previous)
+            if result["value"] > baseline * limit.get("ratio", 1.5) and result["value"] - baseline > limit.get("min_delta", 0.0):
+                reasons.append(f"baseline {baseline:.6g}s × {limit.get('ratio', 1.5)}")
+        if reasons:
+            regressions.append({**result, "reasons": reasons})
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GFI / FuelEU 계산 경로 벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="선대 크기 목록 (쉼표 구분)")
+    parser.add_argument("--sample", type=int, default=200, help="선박 단위 경로에서 실제로 재는 선박 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history", type=Path, default=BENCH_DIR / "history.jsonl")
+    parser.add_argument("--thresholds", type=Path, default=BENCH_DIR / "thresholds.json")
+    parser.add_argument("--no-record", action="store_true", help="history에 기록하지 않음")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    host = platform.node()
+    thresholds = json.loads(args.thresholds.read_text(encoding="utf-8")) if args.thresholds.exists() else {}
+    history = load_history(args.history)
+
+    results = run_static(args.repeat)
+    for n_vessels in sizes:
+        results += run_size(n_vessels, args.sample, args.repeat, args.seed)
+
+    print(f"{'경로':<30} {'선박':>8} {'행':>10} {'기준값 (s)':>12} {'전체 (s)':>12}")
+    for r in results:
+        print(f"{r['path']:<30} {r['vessels']:>8} {r['rows']:>10} {r['value']:>12.6f} {r['seconds']:>12.4f}")
+
+    regressions = check_regressions(results, history, thresholds, host)
+    for r in regressions:
+        print(f"느려짐: {r['path']} ({r['vessels']}척) {r['value']:.6g}s -> {', '.join(r['reasons'])}", file=sys.stderr)
+
+    if not args.no_record:
+        meta = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "host": host,
+            "python": platform.python_version(),
+            "commit": _git_commit(),
+        }
+        with args.history.open("a", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps({**meta, **r}, ensure_ascii=False) + "\n")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# GFI & FuelEU Maritime 계산 엔진 (Streamlit 없이 import 가능)
+#
+# import compliance는 계산 모듈만 불러옴 -> 결과 내보내기 / 그래프 / 화면 표시 / 선대 / 시나리오 / HTTP / 비동기 창구는
+# 처음 사용할 때 불러옴 (from compliance import ComplianceService 처럼 쓰면 그때 compliance.service를 import)
+
+import importlib
+
+from .allocation import SortedAllocation
+from .batch import calculate_fueleu_batch
+from .blends import BLEND_COMPONENTS, FEUM_BLEND_COMPONENTS, blend_defaults, expand_blend_rows, make_blends
+from .cache import (
+    ResultCache,
+    cached_fueleu_batch,
+    cached_fueleu_result,
+    cached_gfi_result,
+    cached_result,
+    default_cache,
+    result_key,
+)
+from .factors import (
+    FACTOR_SET_VERSION,
+    FactorTable,
+    apply_factor_overrides,
+    factor_set_version,
+    fill_fuel_defaults,
+    generate_FEUM_fuel_defaults,
+    generate_GFI_fuel_defaults,
+    get_factor_table,
+)
+from .fueleu import (
+    GREEN_FUEL_CANDIDATES,
+    calculate_b24_b30_outside_ton,
+    calculate_blend_outside_ton,
+    calculate_fueleu,
+    calculate_fueleu_result,
+    calculate_green_fuel_outside_required,
+    calculate_green_fuel_table,
+    calculate_required_green_fuel_inside,
+    get_merged_fueleu_data,
+)
+from .gfi import (
+    BASE_GFI_2028,
+    DIRECT_GFI_2028,
+    GFI_BLEND_COMPONENTS,
+    GFI_REFERENCE,
+    calculate_gfi,
+    calculate_gfi_result,
+    expand_mixed_fuel_GFI,
+    get_merged_gfi_data,
+)
+from .incremental import IncrementalFuelEU, IncrementalGFI
+from .ingest import (
+    FEUM_NAME_ALIASES,
+    GFI_NAME_ALIASES,
+    FuelLogAccumulator,
+    build_name_map,
+    ingest_fuel_log,
+    iter_log_chunks,
+    map_fuel_names,
+    read_fuel_sheet,
+)
+from .planner import plan_fleet_fuel_mix, plan_fuel_mix
+from .pooling import (
+    POOLING_CANDIDATES,
+    calculate_pooling_capacity,
+    calculate_pooling_table,
+    optimize_pooling,
+    penalty_rate,
+    surplus_value,
+)
+from .projection import (
+    FEUM_REDUCTION_STEPS,
+    GFI_YEARS,
+    PROJECTION_YEARS,
+    calculate_fueleu_projection,
+    calculate_gfi_batch,
+    calculate_gfi_projection,
+    calculate_gfi_surplus_offset,
+    fueleu_standard,
+    fueleu_standard_steps,
+    gfi_targets,
+    project_compliance,
+    project_fueleu,
+    project_gfi,
+)
+from .results import FuelEUResult, GFIResult
+from .trace import Trace, current_trace, stage, start_tracing, stop_tracing, traced, tracing
+from .uncertainty import default_ranges, run_monte_carlo, run_monte_carlo_vessel, sample_wtw
+
+# 처음 사용할 때 불러오는 이름 -> 모듈
+_LAZY_MODULES = {
+    "async_front": ["AsyncCalculator", "CalculatorThread"],
+    "charts": ["carbon_tax_figure", "figure_png", "fueleu_intensity_figure", "gfi_intensity_figure"],
+    "display": ["format_frame", "format_values", "gfi_projection_view"],
+    "export": ["RESULT_DTYPES", "detail_frame", "read_results", "result_summary", "results_frame", "to_arrow",
+               "typed_frame", "write_results"],
+    "fleet": ["FLEET_TOTAL_COLUMNS", "Fleet"],
+    "service": ["ComplianceService", "make_server", "serve"],
+    "sweep": ["SWEEP_DEFAULTS", "iter_sweep", "run_sweep", "scenario_grid"],
+}
+_LAZY = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
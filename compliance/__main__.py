@@ -0,0 +1,7 @@
+# python -m compliance -> 선대 보고서 일괄 계산 (compliance.cli)
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
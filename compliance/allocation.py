@@ -0,0 +1,150 @@
+# FuelEU 발열량 채워넣기용 정렬 배분 구조
+#  WtW 오름차순 (안정 정렬) 블록의 누적 크기 / 누적 배출량을 들고 있다가 벌금 기준 발열량이 주어지면
+#  이분 탐색으로 경계 블록을 찾음 -> 정렬 후 채워넣기 한 번은 O(log n), 블록 추가/삭제는 제자리 갱신
+#  블록 크기 = size + per_unit × x  (x: 추가 연료 사용량 등 what-if 변수, 기본 0)
+
+from bisect import bisect_right
+
+import numpy as np
+
+class SortedAllocation:
+    def __init__(self, wtw, size, per_unit=None):
+        wtw = np.asarray(wtw, dtype=float)
+        size = np.asarray(size, dtype=float)
+        per_unit = np.zeros(len(wtw)) if per_unit is None else np.asarray(per_unit, dtype=float)
+        self.order = np.argsort(wtw, kind="stable")   # 생성 시 입력 순서 -> 정렬 순서
+        self.wtw, self.size, self.per_unit = wtw[self.order], size[self.order], per_unit[self.order]
+        self._update_prefix()
+
+    def __len__(self):
+        return len(self.wtw)
+
+    # 누적 합 갱신 (채워넣기 반복문의 누적 에너지와 같은 순서로 더함)
+    def _update_prefix(self):
+        self.end = np.cumsum(self.size)
+        self.start = np.concatenate([[0.0], self.end[:-1]])
+        self.per_unit_end = np.cumsum(self.per_unit)
+        self.per_unit_start = np.concatenate([[0.0], self.per_unit_end[:-1]])
+        self.emission_end = np.cumsum(self.size * self.wtw)
+        self.per_unit_emission_end = np.cumsum(self.per_unit * self.wtw)
+
+    # 블록 추가 -> position이 없으면 같은 WtW 블록 뒤에 삽입, 삽입 위치 반환
+    def insert(self, wtw: float, size: float, per_unit: float = 0.0, position: int | None = None) -> int:
+        if position is None:
+            position = int(np.searchsorted(self.wtw, wtw, side="right"))
+        self.wtw = np.insert(self.wtw, position, wtw)
+        self.size = np.insert(self.size, position, size)
+        self.per_unit = np.insert(self.per_unit, position, per_unit)
+        self._update_prefix()
+        return position
+
+    # 정렬 위치 position의 블록 삭제
+    def remove(self, position: int):
+        self.wtw = np.delete(self.wtw, position)
+        self.size = np.delete(self.size, position)
+        self.per_unit = np.delete(self.per_unit, position)
+        self._update_prefix()
+
+    # 전량 반영되는 블록 수 (누적 크기가 벌금 기준 발열량 이하인 블록)
+    def cutoff(self, penalty_basis_energy: float, x: float = 0.0) -> int:
+        if x == 0:
+            return int(np.searchsorted(self.end, penalty_basis_energy, side="right"))
+        return bisect_right(range(len(self)), penalty_basis_energy, key=lambda i: self.end[i] + self.per_unit_end[i] * x)
+
+    # 경계 블록 위치와 경계 블록부터 반영되는 발열량 (채워넣기 반복문과 같은 순서로 계산, 없으면 빈 목록)
+    def _boundary(self, penalty_basis_energy, x):
+        k = self.cutoff(penalty_basis_energy, x)
+        cumulative = self.start[k] + self.per_unit_start[k] * x if k < len(self) else 0.0
+        return k, _fill_tail(self.size[k:] + self.per_unit[k:] * x, cumulative, penalty_basis_energy)
+
+    # 선택된 블록별 반영 발열량 (정렬 순서, 부분 반영 블록과 그 뒤에 남는 크기 0 / 끝자리 블록까지)
+    def fill(self, penalty_basis_energy: float, x: float = 0.0) -> np.ndarray:
+        k, tail = self._boundary(penalty_basis_energy, x)
+        return np.concatenate([self.size[:k] + self.per_unit[:k] * x, tail])
+
+    # 반영 발열량 합계 (MJ)와 배출량 합계 (gCO₂eq)
+    def totals(self, penalty_basis_energy: float, x: float = 0.0) -> tuple[float, float]:
+        k, tail = self._boundary(penalty_basis_energy, x)
+        energy = emission = 0.0
+        if k > 0:
+            energy = self.end[k - 1] + self.per_unit_end[k - 1] * x
+            emission = self.emission_end[k - 1] + self.per_unit_emission_end[k - 1] * x
+        for i, used in enumerate(tail, start=k):
+            energy += used
+            emission += used * self.wtw[i]
+        return float(energy), float(emission)
+
+# 경계 블록부터 채워넣기 반복문 그대로 진행 -> 부분 반영 블록, 그 뒤의 크기 0 블록,
+# 부분 반영 후 누적값이 끝자리만큼 모자라면 다음 블록의 끝자리 반영량까지 포함 (보통 1 ~ 2 블록)
+def _fill_tail(size: np.ndarray, cumulative: float, penalty_basis_energy: float) -> list:
+    used = []
+    for block in size.tolist():
+        if cumulative + block <= penalty_basis_energy:
+            step = block
+        else:
+            step = penalty_basis_energy - cumulative
+            if step <= 0:
+                break
+        cumulative += step
+        used.append(step)
+    return used
+
+# 그룹별 합계 (그룹 안에서 행 순서대로 더함) -> 선박 1척 계산과 선대 일괄 계산이 같은 순서로 더하도록 함께 사용
+def group_sum(values: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(group, weights=values, minlength=n_groups)
+
+# 그룹별 발열량 채워넣기 (선박 1척 계산과 선대 일괄 계산 공용)
+#  group, wtw, size: 블록별 그룹 번호, WtW, 계산 기준 발열량 / penalty_basis_energy: 그룹별 벌금 기준 발열량
+#  반환: (정렬 순서 (그룹, WtW 안정 정렬), 정렬 순서의 블록별 반영 발열량, 선택 여부)
+#  그룹 안 누적값은 행 순서대로 더하고 (누적 합 + 경계 탐색), 경계 블록부터는 채워넣기 반복문과 같은 규칙으로 진행
+def fill_groups(group: np.ndarray, wtw: np.ndarray, size: np.ndarray,
+                penalty_basis_energy: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n_groups = len(penalty_basis_energy)
+    order = np.lexsort((wtw, group))
+    group, size = group[order], size[order]
+    n = len(group)
+    if n == 0:
+        return order, np.zeros(0), np.zeros(0, dtype=bool)
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    first = np.full(n_groups, n)
+    first[group[starts]] = starts
+    count = np.bincount(group, minlength=n_groups)
+    position = np.arange(n) - first[group]
+
+    # 그룹 안 누적 합 (그룹이 하나면 cumsum, 여러 개면 순번별로 모든 그룹을 한 번에 더함)
+    if n_groups == 1:
+        end = np.cumsum(size)
+    else:
+        end = np.empty(n)
+        cumulative = np.zeros(n_groups)
+        by_position = np.argsort(position, kind="stable")
+        bounds = np.searchsorted(position[by_position], np.arange(int(position.max()) + 2))
+        for k in range(len(bounds) - 1):
+            idx = by_position[bounds[k]:bounds[k + 1]]
+            cumulative[group[idx]] += size[idx]
+            end[idx] = cumulative[group[idx]]
+
+    # 경계 블록 = 그룹 안에서 처음으로 누적 합이 벌금 기준 발열량을 넘는 블록
+    pbe = np.asarray(penalty_basis_energy, dtype=float)
+    over = end > pbe[group]
+    boundary = count.copy()
+    np.minimum.at(boundary, group[over], position[over])
+    selected = position < boundary[group]
+    used = np.where(selected, size, 0.0)
+
+    # 경계 블록부터 반복문 규칙으로 진행 (남은 블록이 있는 그룹만, 보통 1 ~ 2회)
+    cursor = first + boundary
+    last = first + count
+    cumulative = np.where(boundary > 0, end[np.clip(cursor - 1, 0, n - 1)], 0.0)
+    active = np.flatnonzero(cursor < last)
+    while len(active):
+        i = cursor[active]
+        fits = cumulative[active] + size[i] <= pbe[active]
+        step = np.where(fits, size[i], pbe[active] - cumulative[active])
+        keep = fits | (step > 0)
+        used[i[keep]] = step[keep]
+        selected[i[keep]] = True
+        cumulative[active[keep]] += step[keep]
+        cursor[active] += 1
+        active = active[keep & (cursor[active] < last[active])]
+    return order, used, selected
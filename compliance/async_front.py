@@ -0,0 +1,189 @@
+# 비동기 계산 창구 -> 여러 사용자가 동시에 보낸 계산 요청을 이벤트 루프 하나에서 받아서
+#  1) 같은 연료 목록 요청은 한 번만 계산 (single-flight: 정규화한 연료 목록 해시 -> 진행 중인 Future 공유)
+#  2) 요약 요청은 max_wait 초 동안 (또는 max_batch 건이 찰 때까지) 모아서 선대 일괄 계산 경로로 한 번에 계산
+#
+#  front = AsyncCalculator(cache=default_cache())
+#  result = await front.result("GFI", fuel_data)     # calculate_gfi_result 결과 dict (연료별 표 포함, 디스크 캐시 공유)
+#  summary = await front.summary("FEUM", fuel_data)  # 요약 dict (result_summary와 같은 키)
+#
+# 요약은 선대 일괄 계산 경로 (calculate_fueleu_batch / calculate_gfi_batch) 결과 -> 선박 1척 계산과 부동소수점 오차 수준까지 같음
+#
+# 정규화: 기본값으로 LHV/WtW를 채운 목록 (FuelEU는 중복 연료 병합 후) -> 입력 순서나 중복 행이 달라도 같은 계산이면 같은 키
+# 계산은 스레드 풀에서 실행 (이벤트 루프는 요청을 모으고 결과를 나눠 주기만 함)
+# 스레드에서 부르는 곳 (Streamlit 세션, HTTP 서비스 스레드)은 CalculatorThread로 백그라운드 루프에 요청을 넘김
+
+import asyncio
+import threading
+
+import pandas as pd
+
+from .batch import calculate_fueleu_batch
+from .cache import ResultCache, cached_fueleu_result, cached_gfi_result, result_key
+from .factors import fill_fuel_defaults, get_factor_table
+from .fueleu import get_merged_fueleu_data
+from .projection import calculate_gfi_batch
+from .trace import stage
+
+REGIME_KINDS = {"FEUM": "fueleu", "GFI": "gfi"}
+REQUIRED_KEYS = {"FEUM": ("연료종류", "역내", "역외"), "GFI": ("연료종류", "사용량")}
+SUMMARY_COLUMNS = {
+    "FEUM": ["avg_ghg_intensity", "standard_now", "cb", "penalty_eur", "total_energy", "total_emission", "surplus"],
+    "GFI": ["gfi", "tier", "cb", "penalty", "total_energy", "total_emission", "surplus"],
+}
+
+# 요약 일괄 계산 -> 정규화된 연료 목록 리스트를 선박 번호 열로 묶어 한 번에 계산, 요청 순서대로 요약 dict 리스트 반환
+def _summary_batch(regime: str, fuel_lists: list[list[dict]], table) -> list[dict]:
+    df = pd.DataFrame([{**row, "선박": i} for i, rows in enumerate(fuel_lists) for row in rows])
+    if regime == "FEUM":
+        batch = calculate_fueleu_batch(df.assign(기간=0), table)
+        batch["surplus"] = batch["avg_ghg_intensity"] < batch["standard_now"]
+    else:
+        batch = calculate_gfi_batch(df, table)
+    batch = batch.set_index("선박").reindex(range(len(fuel_lists)))
+    return [
+        {col: value.item() if hasattr(value, "item") else value for col, value in row.items()}
+        for row in batch[SUMMARY_COLUMNS[regime]].to_dict("records")
+    ]
+
+# 비동기 계산 창구 (이벤트 루프 하나에서만 사용할 것)
+#  max_batch: 요약 일괄 계산 1회 최대 요청 수, max_wait: 첫 요청 이후 다음 요청을 기다리는 시간 (초)
+class AsyncCalculator:
+    def __init__(self, cache: ResultCache | None = None, fuel_defaults_GFI: dict | None = None,
+                 fuel_defaults_FEUM: dict | None = None, max_batch: int = 256, max_wait: float = 0.002, executor=None):
+        self.cache = cache
+        self.fuel_defaults = {"GFI": fuel_defaults_GFI, "FEUM": fuel_defaults_FEUM}
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.executor = executor
+        self.stats = {"requests": 0, "shared": 0, "batches": 0, "batched": 0}
+        self._inflight = {}                                  # 키 -> 진행 중인 Future
+        self._pending = {regime: [] for regime in REGIME_KINDS}   # 규제 -> [(연료 목록, Future)]
+        self._timers = {}
+
+    def _defaults(self, regime: str) -> dict:
+        defaults = self.fuel_defaults[regime]
+        return get_factor_table(regime).defaults if defaults is None else defaults
+
+    # 연료 목록 정규화 -> 계산에 넘길 목록 (결과 캐시 키도 이 목록으로 생성)
+    def _normalize(self, regime: str, fuel_data: list[dict]) -> list[dict]:
+        if regime not in REGIME_KINDS:
+            raise ValueError(f"알 수 없는 규제 구분: {regime}")
+        if not fuel_data:
+            raise ValueError("연료 데이터가 비어 있습니다.")
+        for row in fuel_data:
+            missing = [key for key in REQUIRED_KEYS[regime] if key not in row]
+            if missing:
+                raise ValueError(f"필수 값이 없습니다: {', '.join(missing)}")
+        records = fill_fuel_defaults(fuel_data, self._defaults(regime))
+        return get_merged_fueleu_data(records) if regime == "FEUM" else records
+
+    # 같은 키가 진행 중이면 그 Future를 기다림, 아니면 start()로 새로 시작
+    async def _single_flight(self, key: str, start):
+        self.stats["requests"] += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = start()
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["shared"] += 1
+        return await asyncio.shield(future)   # 기다리던 쪽이 취소돼도 계산은 계속 (다른 요청이 공유)
+
+    # 계산 결과 dict (calculate_fueleu_result / calculate_gfi_result와 같은 결과, 디스크 캐시 사용)
+    #  같은 요청끼리 같은 dict 객체를 받으므로 수정하지 말 것
+    async def result(self, regime: str, fuel_data: list[dict]) -> dict:
+        records = self._normalize(regime, fuel_data)
+        key = result_key(f"{REGIME_KINDS[regime]}.result", records, regime, self.fuel_defaults[regime])
+        cached = cached_fueleu_result if regime == "FEUM" else cached_gfi_result
+        loop = asyncio.get_running_loop()
+        return await self._single_flight(key, lambda: loop.run_in_executor(
+            self.executor, lambda: cached(records, self.fuel_defaults[regime], cache=self.cache)))
+
+    # 요약 dict (FuelEU: avg_ghg_intensity, cb, penalty_eur, ... / GFI: gfi, tier, cb, penalty, ...)
+    async def summary(self, regime: str, fuel_data: list[dict]) -> dict:
+        records = self._normalize(regime, fuel_data)
+        key = result_key(f"{REGIME_KINDS[regime]}.summary", records, regime, self.fuel_defaults[regime])
+        return dict(await self._single_flight(key, lambda: self._enqueue(regime, records)))
+
+    def _enqueue(self, regime: str, records: list[dict]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending[regime]
+        pending.append((records, future))
+        if len(pending) >= self.max_batch:
+            self._flush(regime)
+        elif regime not in self._timers:
+            self._timers[regime] = loop.call_later(self.max_wait, self._flush, regime)
+        return future
+
+    # 모아 둔 요약 요청을 일괄 계산으로 넘기고, 끝나면 요청별 Future에 결과 전달
+    def _flush(self, regime: str):
+        timer = self._timers.pop(regime, None)
+        if timer is not None:
+            timer.cancel()
+        items, self._pending[regime] = self._pending[regime], []
+        if not items:
+            return
+        self.stats["batches"] += 1
+        self.stats["batched"] += len(items)
+
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.executor, self._compute_batch, regime, [records for records, _ in items])
+
+        def deliver(task):
+            try:
+                values = task.result()
+            except Exception as e:
+                values = [e] * len(items)
+            for (_, future), value in zip(items, values):
+                if future.done():
+                    continue
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+        task.add_done_callback(deliver)
+
+    # 일괄 계산 (스레드 풀) -> 실패하면 요청별로 다시 계산해서 잘못된 요청만 예외로 돌려줌
+    def _compute_batch(self, regime: str, fuel_lists: list[list[dict]]) -> list:
+        table = get_factor_table(regime) if self.fuel_defaults[regime] is None else self.fuel_defaults[regime]
+        with stage(f"async_front.{REGIME_KINDS[regime]}.batch", rows=len(fuel_lists)):
+            try:
+                return _summary_batch(regime, fuel_lists, table)
+            except (KeyError, ValueError, TypeError):
+                if len(fuel_lists) == 1:
+                    raise
+        values = []
+        for rows in fuel_lists:
+            try:
+                values.append(_summary_batch(regime, [rows], table)[0])
+            except (KeyError, ValueError, TypeError) as e:
+                values.append(e)
+        return values
+
+# 스레드에서 쓰는 창구 -> 백그라운드 스레드의 이벤트 루프에서 AsyncCalculator를 돌리고 결과를 기다림
+#  front = CalculatorThread(cache=default_cache())   # 프로세스당 하나 (Streamlit은 st.cache_resource로 공유)
+#  front.summary("GFI", fuel_data)
+class CalculatorThread:
+    def __init__(self, **options):
+        self.loop = asyncio.new_event_loop()
+        self.front = AsyncCalculator(**options)
+        self._thread = threading.Thread(target=self.loop.run_forever, name="compliance-front", daemon=True)
+        self._thread.start()
+
+    def _call(self, coro, timeout):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def result(self, regime: str, fuel_data: list[dict], timeout: float | None = None) -> dict:
+        return self._call(self.front.result(regime, fuel_data), timeout)
+
+    def summary(self, regime: str, fuel_data: list[dict], timeout: float | None = None) -> dict:
+        return self._call(self.front.summary(regime, fuel_data), timeout)
+
+    @property
+    def stats(self) -> dict:
+        return dict(self.front.stats)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -0,0 +1,122 @@
+# FuelEU Maritime 선대 일괄 계산 -> 선박 x 기간 단위로 calculate_fueleu_result와 같은 결과를 한 번에 계산
+
+import numpy as np
+import pandas as pd
+
+from .allocation import fill_groups, group_sum
+from .factors import FactorTable, get_factor_table
+from .fueleu import (
+    FEUM_REFERENCE,
+    OUTSIDE_HALF_FUELS,
+    PENALTY_EUR_PER_TON,
+    VLSFO_LHV,
+)
+from .trace import traced
+
+# dict 기본값이 들어오면 배열 표로 변환, 없으면 컴파일된 FuelEU 계수표 사용
+def _factor_table(fuel_defaults_FEUM) -> FactorTable:
+    if fuel_defaults_FEUM is None:
+        return get_factor_table("FEUM")
+    if isinstance(fuel_defaults_FEUM, FactorTable):
+        return fuel_defaults_FEUM
+    return FactorTable.from_defaults(fuel_defaults_FEUM, "FEUM")
+
+# 혼합연료를 구성 연료 행으로 분리 (행 순서는 단일 선박 계산과 동일하게 유지)
+def expand_fueleu_batch(df: pd.DataFrame, table: FactorTable, keys: list[str]) -> pd.DataFrame:
+    data = df[keys + ["연료종류", "역내", "역외"]].copy()
+    data["역내"] = data["역내"].astype(float)
+    data["역외"] = data["역외"].astype(float)
+
+    # LHV/WtW 입력값이 없으면 기본값 사용 (연료 인덱스로 배열 조회)
+    idx = table.lookup(data["연료종류"])
+    for col, values in [("LHV", table.lhv), ("WtW", table.wtw)]:
+        defaults = pd.Series(np.where(idx >= 0, values[idx], np.nan), index=data.index)
+        data[col] = df[col].astype(float).fillna(defaults) if col in df.columns else defaults
+
+    unknown = data.loc[data["LHV"].isna() | data["WtW"].isna(), "연료종류"].unique()
+    if len(unknown) > 0:
+        raise ValueError(f"알 수 없는 연료 종류: {', '.join(map(str, unknown))}")
+
+    # 분리 행렬로 한 번에 분리 (혼합연료가 아닌 행은 그대로, 혼합연료 행은 구성 연료 기본값 사용)
+    row, part, component, amounts, from_blend = table.expand_blends(idx, data[["역내", "역외"]].to_numpy())
+    if not from_blend.any():
+        return data.assign(_row=np.arange(len(data)), _part=0)
+
+    expanded = data.iloc[row].reset_index(drop=True)
+    expanded["역내"] = amounts[:, 0]
+    expanded["역외"] = amounts[:, 1]
+    names = np.asarray(table.names, dtype=object)
+    expanded.loc[from_blend, "연료종류"] = names[component[from_blend]]
+    expanded.loc[from_blend, "LHV"] = table.lhv[component[from_blend]]
+    expanded.loc[from_blend, "WtW"] = table.wtw[component[from_blend]]
+    expanded["_row"] = row
+    expanded["_part"] = part
+    return expanded
+
+# round(x, 15) 적용 -> 단일 선박 계산은 반영 발열량이 Python float (fill_groups(...) 결과의 tolist())이므로
+#  항상 Python round와 같은 결과 (np.round는 끝자리가 다를 수 있음)
+def _round15(values: np.ndarray) -> np.ndarray:
+    return np.array([round(value, 15) for value in values.tolist()], dtype=float)
+
+# FuelEU 일괄 계산 함수 -> 열 단위 표 (선박, 기간, 연료종류, 역내, 역외[, LHV, WtW])를 받아 선박/기간별 결과 반환
+#  penalty_price: VLSFO 환산 톤당 탄소세 (€, 기본 2,400)
+@traced("batch.calculate_fueleu_batch", rows=lambda df, *_, **__: len(df))
+def calculate_fueleu_batch(
+    df: pd.DataFrame,
+    fuel_defaults_FEUM: dict | FactorTable | None = None,
+    vessel_col: str = "선박",
+    period_col: str = "기간",
+    penalty_price: float = PENALTY_EUR_PER_TON
+) -> pd.DataFrame:
+    keys = [vessel_col, period_col]
+    expanded = expand_fueleu_batch(df, _factor_table(fuel_defaults_FEUM), keys)
+
+    # 선박/기간 그룹 번호 (그룹 내 입력 순서 유지)
+    group = expanded.groupby(keys, sort=True).ngroup().to_numpy()
+    n_groups = int(group.max()) + 1 if len(group) else 0
+    fuel = expanded["연료종류"].to_numpy()
+    lhv = expanded["LHV"].to_numpy(dtype=float)
+    wtw = expanded["WtW"].to_numpy(dtype=float)
+    inside = expanded["역내"].to_numpy(dtype=float)
+    outside = expanded["역외"].to_numpy(dtype=float)
+
+    # 벌금 기준 발열량 계산 (그룹 안에서 행 순서대로 합산 -> 선박 1척 계산과 같은 group_sum)
+    inside_lhv = inside * lhv
+    outside_lhv = outside * lhv * 0.5
+    penalty_basis_energy = group_sum(inside_lhv, group, n_groups) + group_sum(outside_lhv, group, n_groups)
+
+    # 계산 기준 발열량 계산 (HFO는 역외 50%, 나머지는 100% 반영)
+    half = np.isin(fuel, OUTSIDE_HALF_FUELS)
+    adj_outside = np.where(half, outside * lhv * 0.5, outside * lhv)
+    total_adj = inside_lhv + adj_outside
+
+    # 발열량 채워넣기 (선박 1척 계산과 같은 fill_groups) -> 반영 블록을 WtW 순서대로 합산
+    sort_idx, used, selected = fill_groups(group, wtw, total_adj, penalty_basis_energy)
+    s_group = group[sort_idx]
+    total_energy = group_sum(used, s_group, n_groups)
+    total_emission = group_sum(np.where(selected, used * wtw[sort_idx] / 1_000_000, 0.0), s_group, n_groups)
+
+    # 결과 계산
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = np.where(total_energy > 0, total_emission * 1_000_000 / total_energy, 0.0)
+    avg = _round15(avg)
+    standard_now = round(FEUM_REFERENCE * 0.98, 15)
+    cb = _round15((standard_now - avg) * total_energy / 1_000_000)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        penalty = np.where(
+            avg > standard_now,
+            _round15((standard_now - avg) * total_energy * penalty_price / VLSFO_LHV / avg),
+            0.0
+        )
+
+    index = expanded[keys].iloc[np.unique(group, return_index=True)[1]].reset_index(drop=True)
+    result = pd.DataFrame({
+        "penalty_basis_energy": penalty_basis_energy,
+        "total_energy": total_energy,
+        "total_emission": total_emission,
+        "avg_ghg_intensity": avg,
+        "standard_now": standard_now,
+        "cb": cb,
+        "penalty_eur": penalty
+    })
+    return pd.concat([index, result], axis=1)
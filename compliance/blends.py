@@ -0,0 +1,84 @@
+# 혼합연료 정의 및 분리 -> 혼합연료는 데이터 (구성 연료, 비율)로만 정의하고 계산 코드에는 연료 이름별 분기가 없음
+#
+# *_BLEND_COMPONENTS: {혼합연료: ((구성 연료, 비율), ...)}  첫 번째 구성이 화석연료, 나머지가 바이오/대체 연료
+# 분리 행렬: 계수표 연료마다 (구성 연료 인덱스, 비율) 한 줄 (혼합연료가 아니면 자기 자신 × 1.0)
+#  -> 선대 전체 행 분리는 행렬 조회 + 비율 곱 한 번 (행별 분기 없음)
+
+import numpy as np
+
+HFO = "HFO (Grades RME to RMK)"
+LFO = "LFO (Grades RMA to RMD)"
+MGO = "MDO MGO (Grades DMX to DMB)"
+HVO = "Hydrotreated Vegetable Oil (waste cooking oil)"
+BIO = "Bio(Fame)"
+
+# 혼합연료 목록 생성 -> 이름은 "{prefix}{혼합 %}({화석연료 약칭})" (예: B24(HFO), HVO30(MGO))
+def make_blends(fossils: dict, bio: str, percents, prefix: str = "B") -> dict:
+    return {
+        f"{prefix}{percent}({short})": ((fossil, (100 - percent) / 100), (bio, percent / 100))
+        for short, fossil in fossils.items() for percent in percents
+    }
+
+FEUM_BLEND_COMPONENTS = {
+    **make_blends({"HFO": HFO, "LFO": LFO}, BIO, [24, 30]),
+    **make_blends({"HFO": HFO, "LFO": LFO}, BIO, [10, 50]),
+    **make_blends({"LFO": LFO, "MGO": MGO}, HVO, [30, 50], prefix="HVO"),
+}
+
+# GFI 계수표에는 HVO가 없으므로 FAME 혼합연료만 정의
+GFI_BLEND_COMPONENTS = {
+    **make_blends({"HSFO": "HSFO", "VLSFO": "VLSFO"}, BIO, [24, 30]),
+    **make_blends({"HSFO": "HSFO", "VLSFO": "VLSFO"}, BIO, [10, 50]),
+}
+
+BLEND_COMPONENTS = {"FEUM": FEUM_BLEND_COMPONENTS, "GFI": GFI_BLEND_COMPONENTS}
+
+# 혼합연료 기본값 (LHV, WtW) -> 구성 연료 LHV 가중합, 배출량 합 / LHV
+def blend_defaults(parts, fuel_defaults: dict) -> dict:
+    lhv_mix = 0.0
+    total_emission = 0.0
+    for name, ratio in parts:
+        lhv_mix += fuel_defaults[name]["LHV"] * ratio
+        total_emission += fuel_defaults[name]["WtW"] * fuel_defaults[name]["LHV"] * ratio
+    return {"LHV": round(lhv_mix, 15), "WtW": round(total_emission / lhv_mix, 15)}
+
+# 연료 이름 목록 -> 분리 행렬 (구성 연료 인덱스, 비율, 혼합연료 여부)
+#  행렬 크기는 (연료 수 × 최대 구성 수), 빈 칸은 인덱스 -1 / 비율 0
+#  구성 연료가 목록에 없는 혼합연료는 분리하지 않고 그대로 사용
+def blend_matrix(names, components: dict, index: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    width = max([len(parts) for parts in components.values()], default=1)
+    part_index = np.full((len(names), width), -1)
+    part_ratio = np.zeros((len(names), width))
+    is_blend = np.zeros(len(names), dtype=bool)
+    for i, name in enumerate(names):
+        parts = components.get(name)
+        if parts is None or any(component not in index for component, _ in parts):
+            parts = ((name, 1.0),)
+        else:
+            is_blend[i] = True
+        for k, (component, ratio) in enumerate(parts):
+            part_index[i, k] = index[component]
+            part_ratio[i, k] = ratio
+    return part_index, part_ratio, is_blend
+
+# 행별 연료 인덱스 (계수표에 없으면 -1)와 양 (행 수 × 양 열 수) -> 분리된 행
+#  반환: 원래 행 번호, 구성 순번, 구성 연료 인덱스, 분리된 양, 혼합연료에서 나온 행 여부 (행 순서는 (원래 행, 구성 순번))
+#  계수표에 없는 연료는 그대로 한 행 (구성 연료 인덱스 -1)
+def expand_blend_rows(idx, amounts, matrix) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    part_index, part_ratio, is_blend = matrix
+    idx = np.asarray(idx)
+    amounts = np.asarray(amounts, dtype=float).reshape(len(idx), -1)
+    n, width = len(idx), part_index.shape[1]
+
+    known = idx >= 0
+    safe = np.where(known, idx, 0)
+    parts = np.where(known[:, None], part_index[safe], -1)
+    ratios = np.where(known[:, None], part_ratio[safe], 0.0)
+    ratios[~known, 0] = 1.0
+    present = (parts >= 0) | ((np.arange(width) == 0) & ~known[:, None])
+
+    mask = present.ravel()
+    row = np.repeat(np.arange(n), width)[mask]
+    part = np.tile(np.arange(width), n)[mask]
+    expanded = (amounts[:, None, :] * ratios[:, :, None]).reshape(n * width, -1)[mask]
+    return row, part, parts.ravel()[mask], expanded, (known & is_blend[safe])[row]
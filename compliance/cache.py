@@ -0,0 +1,265 @@
+# 계산 결과 디스크 캐시 -> (병합된 연료 목록, 계수표 버전, 혼합연료 정의, 규제 연도, 계산 종류) 해시를 키로 결과를 pickle 파일로 저장
+#
+#  cache = ResultCache()                          # COMPLIANCE_CACHE_DIR 또는 ~/.cache/compliance
+#  result = cached_fueleu_result(fuel_data, cache=cache)
+#
+# 저장은 같은 폴더의 임시 파일에 쓴 뒤 os.replace -> 여러 프로세스가 동시에 읽고 써도 반쯤 쓴 파일을 읽지 않음
+# LRU: 읽을 때마다 파일 수정 시각을 갱신하고, 전체 크기가 max_bytes를 넘으면 오래된 파일부터 삭제
+# 디스크를 쓸 수 없으면 (읽기 전용 배포 환경 등) 저장을 건너뛰고 계산만 함
+# 같은 키를 여러 스레드 (Streamlit 세션 등)가 동시에 요청하면 한 스레드만 계산하고 나머지는 그 결과를 기다림 (single-flight)
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .batch import calculate_fueleu_batch
+from .blends import BLEND_COMPONENTS
+from .factors import FactorTable, fill_fuel_defaults, get_factor_table
+from .fueleu import OUTSIDE_HALF_FUELS, calculate_fueleu_result, get_merged_fueleu_data
+from .gfi import calculate_gfi_result
+
+CACHE_FORMAT = 1                        # 결과 구조나 계산 방식이 바뀌면 올릴 것 (이전 캐시는 자연히 LRU로 삭제)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_YEARS = {"FEUM": 2025, "GFI": 2028}
+STALE_TEMP_SECONDS = 3600               # 중간에 끝난 프로세스가 남긴 임시 파일 삭제 기준
+
+_MISSING = object()
+
+# 진행 중인 계산 (같은 키를 기다리는 스레드가 공유)
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = _MISSING
+        self.error = None
+
+def _json_default(value):
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    raise TypeError(f"캐시 키로 쓸 수 없는 값: {type(value).__name__}")
+
+def _digest(payload) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# 연료 기본값 버전 -> 컴파일된 계수표 기본값이면 계수표 버전, 직접 만든 dict면 내용 해시
+def defaults_version(regime: str, fuel_defaults: dict | None = None) -> str:
+    table = get_factor_table(regime)
+    if fuel_defaults is None or fuel_defaults is table.defaults:
+        return table.version
+    return "custom-" + _digest(fuel_defaults)[:12]
+
+# 계산 규칙 버전 -> 혼합연료 정의 + 역외 50% 반영 연료 목록 해시 (계수표 밖에서 결과를 바꾸는 정의)
+def rules_version(regime: str) -> str:
+    rules = {"blends": BLEND_COMPONENTS[regime]}
+    if regime == "FEUM":
+        rules["outside_half"] = sorted(OUTSIDE_HALF_FUELS)
+    return _digest(rules)[:12]
+
+# 캐시 키 -> 계산 종류 + 연료 목록 + 계수표 버전 + 계산 규칙 버전 + 규제 연도 + 추가 조건
+def result_key(kind: str, fuel_data, regime: str, fuel_defaults: dict | None = None, year: int | None = None, **params) -> str:
+    return _digest({
+        "format": CACHE_FORMAT,
+        "kind": kind,
+        "regime": regime,
+        "factors": defaults_version(regime, fuel_defaults),
+        "rules": rules_version(regime),
+        "year": DEFAULT_YEARS[regime] if year is None else year,
+        "params": params,
+        "fuel": fuel_data
+    })
+
+# 디스크 결과 캐시 (키 -> pickle 파일, 크기 제한 LRU)
+class ResultCache:
+    def __init__(self, directory=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.environ.get("COMPLIANCE_CACHE_DIR") or Path.home() / ".cache" / "compliance"
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0      # 다른 스레드의 진행 중인 계산 결과를 받은 횟수
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._size = None   # 폴더 전체 크기 추정값 (처음 저장할 때 한 번 계산, 이후 저장할 때마다 더함)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    @staticmethod
+    def _unlink(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    # 저장된 결과 (없거나 읽을 수 없으면 default)
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except Exception:
+            # 깨진 파일이나 예전 형식 -> 지우고 다시 계산
+            self._unlink(path)
+            self.misses += 1
+            return default
+        try:
+            os.utime(path)   # LRU 순서 갱신
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".pkl")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except BaseException:
+                self._unlink(Path(tmp))
+                raise
+            size = path.stat().st_size
+        except OSError:
+            self.enabled = False
+            return
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    # 캐시에 있으면 그대로, 없으면 계산해서 저장
+    #  같은 키를 계산 중인 스레드가 있으면 다시 계산하지 않고 끝날 때까지 기다린 뒤 저장된 파일에서 읽음
+    #  (저장하지 못했으면 계산한 객체를 그대로 받음)
+    def get_or_compute(self, key: str, compute):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            self.shared += 1
+            if flight.error is not None:
+                raise flight.error
+            value = self.get(key, _MISSING) if self.enabled else _MISSING
+            return flight.value if value is _MISSING else value
+
+        try:
+            flight.value = compute()
+            self.put(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    # 캐시 폴더 전체 크기 (bytes)
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    # 오래 안 쓴 파일부터 삭제 (기본: max_bytes의 90%까지), 남은 임시 파일도 정리
+    def evict(self, target_bytes: int | None = None):
+        target = int(self.max_bytes * 0.9) if target_bytes is None else target_bytes
+        now = time.time()
+        for tmp in self.directory.glob("*/.tmp-*"):
+            try:
+                if now - tmp.stat().st_mtime > STALE_TEMP_SECONDS:
+                    tmp.unlink()
+            except OSError:
+                pass
+
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._unlink(path)
+            total -= size
+        self._size = total
+
+    def clear(self):
+        self.evict(0)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+# 프로세스 공용 캐시 (처음 호출할 때 생성, 여러 스레드가 동시에 불러도 하나만 생성)
+def default_cache() -> ResultCache:
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ResultCache()
+    return _default_cache
+
+# 계산 결과 캐시 조회 -> compute()는 캐시에 없을 때만 호출
+def cached_result(kind: str, fuel_data, regime: str, compute, fuel_defaults: dict | None = None,
+                  year: int | None = None, cache: ResultCache | None = None, **params):
+    cache = default_cache() if cache is None else cache
+    return cache.get_or_compute(result_key(kind, fuel_data, regime, fuel_defaults, year, **params), compute)
+
+# FuelEU 결과 (캐시) -> calculate_fueleu(...)처럼 기본값을 채우고 중복 연료를 합친 뒤 calculate_fueleu_result 결과 dict 반환
+def cached_fueleu_result(fuel_data: list[dict], fuel_defaults_FEUM: dict | None = None, cache: ResultCache | None = None) -> dict:
+    defaults = get_factor_table("FEUM").defaults if fuel_defaults_FEUM is None else fuel_defaults_FEUM
+    merged = get_merged_fueleu_data(fill_fuel_defaults(fuel_data, defaults))
+    return cached_result("fueleu.result", merged, "FEUM", lambda: calculate_fueleu_result(merged, defaults),
+                         fuel_defaults_FEUM, cache=cache)
+
+# GFI 결과 (캐시) -> calculate_gfi_result 결과 dict (연료별 표가 입력 행 단위이므로 병합 전 목록으로 키 생성)
+def cached_gfi_result(fuel_data: list[dict], fuel_defaults_GFI: dict | None = None, cache: ResultCache | None = None) -> dict | None:
+    defaults = get_factor_table("GFI").defaults if fuel_defaults_GFI is None else fuel_defaults_GFI
+    records = fill_fuel_defaults(fuel_data, defaults)
+    return cached_result("gfi.result", records, "GFI", lambda: calculate_gfi_result(records, defaults),
+                         fuel_defaults_GFI, cache=cache)
+
+# 선대 일괄 계산 (캐시) -> 입력 표 내용 해시를 키로 calculate_fueleu_batch 결과 저장
+def cached_fueleu_batch(df: pd.DataFrame, fuel_defaults_FEUM: dict | None = None, cache: ResultCache | None = None,
+                        **options) -> pd.DataFrame:
+    content = {
+        "columns": [str(col) for col in df.columns],
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+        "hash": hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+    }
+    defaults = fuel_defaults_FEUM.defaults if isinstance(fuel_defaults_FEUM, FactorTable) else fuel_defaults_FEUM
+    return cached_result("fueleu.batch", content, "FEUM", lambda: calculate_fueleu_batch(df, fuel_defaults_FEUM, **options),
+                         defaults, cache=cache, **options)
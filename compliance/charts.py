@@ -0,0 +1,102 @@
+# 결과 그래프 (matplotlib Figure 객체) -> pyplot 전역 상태를 쓰지 않으므로 여러 세션이 동시에 그려도 서로 섞이지 않음
+#
+#  png = figure_png(gfi_intensity_figure(gfi))   # 화면에는 PNG bytes로 표시 (UI에서 입력값 기준으로 캐시)
+#
+# 입력은 숫자 값/배열만 받음 (같은 입력이면 같은 그림 -> 입력값을 캐시 키로 쓸 수 있음)
+# matplotlib는 그래프를 그릴 때만 필요하므로 함수 안에서 import
+
+import io
+
+import numpy as np
+
+from .projection import GFI_YEARS, fueleu_standard, fueleu_standard_steps, gfi_targets
+
+def _new_figure(figsize):
+    try:
+        from matplotlib.figure import Figure
+    except ImportError as e:
+        raise ImportError("그래프를 그리려면 matplotlib이 필요합니다 (pip install matplotlib)") from e
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+# Figure -> PNG bytes (st.pyplot과 같은 설정: 여백 자동 조정, dpi 200)
+def figure_png(fig, dpi: int = 200) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+# ACTUAL GFI vs TARGET GFI (Base / Direct / ZNZ 기준선)
+def gfi_intensity_figure(gfi: float, years=GFI_YEARS):
+    years = list(years)
+    base_gfi, direct_gfi = (values.tolist() for values in gfi_targets(years))
+    znz = [19.0 if year <= 2034 else 14.0 for year in years]   # ZNZ 기준선 (연도별 19.0 or 14.0)
+
+    fig, ax = _new_figure((8, 4))
+    ax.plot(years, base_gfi, label="Base GFI(TIER2)", linestyle="--", marker="o")
+    ax.plot(years, direct_gfi, label="Direct GFI(TIER1)", linestyle=":", marker="o")
+    ax.hlines(gfi, years[0], years[-1], color="red", linestyles="-", label=f"Your GFI: {gfi:.2f}")
+    ax.step(years, znz, where="post", label="ZNZ LINE", color="gold", linewidth=2)
+
+    for x, y in zip(years, znz):
+        offset = 0.1 if x == 2035 else 0.0  # 2035년만 오른쪽으로 살짝 이동
+        ax.text(x + offset, y + 1, f"{y:.1f}", ha="center", va="bottom", fontsize=8, color="gold")
+    for values in (base_gfi, direct_gfi):
+        for x, y in zip(years, values):
+            ax.text(x, y + 1, f"{y:.1f}", ha="center", va="bottom", fontsize=8)
+
+    ax.set_xlabel("YEAR")
+    ax.set_ylabel("gCO₂eq/MJ")
+    ax.set_title("ACTUAL GFI vs TARGET GFI")
+    ax.legend()
+    return fig
+
+# 연도별 탄소세 (Tier 1 / Tier 2 막대 + 총 탄소세 선) -> calculate_gfi_projection의 탄소세 열
+def carbon_tax_figure(years, tier1_tax, tier2_tax, total_tax):
+    tier1_tax, tier2_tax, total_tax = (np.nan_to_num(np.asarray(values, dtype=float)) for values in (tier1_tax, tier2_tax, total_tax))
+    x = np.arange(len(total_tax))
+    bar_width = 0.4
+
+    fig, ax = _new_figure((10, 4))
+    ax.bar(x - bar_width/2, tier1_tax, width=bar_width, label="Tier 1 Carbon Tax", color="skyblue")
+    if (tier2_tax > 0).any():
+        ax.bar(x + bar_width/2, tier2_tax, width=bar_width, label="Tier 2 Carbon Tax", color="orange")
+    ax.plot(x, total_tax, label="Total Carbon Tax", color="red", marker="o", linewidth=2)
+
+    offset = total_tax.max(initial=0) * 0.07  # 7% 여유
+    for i, value in enumerate(total_tax):
+        ax.text(x[i], value + offset, f"${int(value):,}", ha="center", va="bottom", fontsize=8, color="red")
+
+    # 모든 연도가 Surplus면 탄소세가 0이므로 기본 범위 사용
+    max_val = max(tier1_tax.max(initial=0), tier2_tax.max(initial=0), total_tax.max(initial=0))
+    ax.set_ylim(0, max_val * 1.2 if max_val > 0 else 1)
+
+    ax.set_xticks(x, [int(year) for year in years])
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Carbon Tax ($)")
+    ax.set_title("Annual Carbon Tax")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.3)
+    return fig
+
+# FuelEU 기준선 (스텝) vs 평균 GHG Intensity -> 기준선은 2052년까지 그려서 2050년 구간이 보이게 함
+def fueleu_intensity_figure(avg_ghg_intensity: float, last_year: int = 2052):
+    steps = fueleu_standard_steps(last_year=last_year, digits=2)
+    years = list(range(2025, last_year + 1))
+    standard_values = fueleu_standard(years, digits=2).tolist()
+
+    fig, ax = _new_figure((10, 4))
+    ax.step(years, standard_values, where="post", color="blue", linewidth=2, label="TARGET GHG Intensity")
+    ax.hlines(avg_ghg_intensity, 2025, 2050, colors="red", linestyles="--", linewidth=2,
+              label=f"ACTUAL GHG Intensity: {avg_ghg_intensity:.2f} gCO₂eq/MJ")
+
+    for start, end, value in steps:
+        midpoint = (start + end) // 2
+        ax.text(midpoint, value + 1, f"{value:.1f}", ha="center", va="bottom", fontsize=8, color="blue")
+
+    ax.set_xlabel("YEAR")
+    ax.set_ylabel("gCO₂eq/MJ")
+    ax.set_xticks(range(2025, 2051, 5))
+    ax.set_ylim(0, max(standard_values) + 10)
+    ax.grid(True, linestyle="--", alpha=0.3)
+    ax.legend(loc="center left", bbox_to_anchor=(0, 0.5))   # GFI 그래프와 동일한 위치
+    return fig
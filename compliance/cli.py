@@ -0,0 +1,306 @@
+# 연말 선대 Compliance 보고서 일괄 계산 (명령행) -> 선대 연료 사용 로그 파일 하나로 선박/기간별 FuelEU, GFI 결과를 파일로 저장
+#
+#  python -m compliance fleet_2025.csv -o reports/2025              # CSV / Parquet 로그 (선박, 기간, 연료종류, 역내, 역외[, 사용량])
+#  python -m compliance fleet_2025.parquet -o reports/2025 --workers 8 --format csv
+#  python -m compliance fleet_2025.csv -o reports/2025 --resume     # 중단된 실행 이어서 계산
+#
+# 저장 파일 (출력 폴더)
+#  fueleu_summary   선박/기간별 calculate_fueleu_result 요약 (GHG Intensity, CB, 탄소세, 에너지, 배출량)
+#  fueleu_pooling   Surplus 선박의 Pooling 가능 연료량 (calculate_pooling_table)
+#  fueleu_green     Deficit 선박의 친환경 연료 필요량 (calculate_green_fuel_table)
+#  gfi_summary      선박/기간별 calculate_gfi_result 요약 (GFI, Tier, CB, 탄소세)
+#  gfi_projection   선박/기간별 연도별 GFI Compliance 표 (calculate_gfi_projection)
+#  errors           계산하지 못한 선박/기간과 오류 (있을 때만)
+#
+# 로그는 규제별로 ingest_fuel_log로 한 번 읽어 (연료 이름 별칭 변환 포함) 선박/기간/연료별로 합친 뒤,
+# 선박/기간 묶음 (--chunk 건) 단위로 프로세스 풀에서 계산하고 묶음이 끝날 때마다 체크포인트 폴더에 저장
+# --resume이면 같은 입력 / 옵션으로 저장된 묶음은 건너뜀 -> 모든 묶음이 끝나면 규제/표별로 합쳐서 한 번에 저장
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .export import RESULT_DTYPES, result_summary, write_results
+from .factors import get_factor_table
+from .fueleu import calculate_fueleu_result, calculate_green_fuel_table
+from .gfi import calculate_gfi_result
+from .ingest import ingest_fuel_log
+from .pooling import calculate_pooling_table
+from .projection import GFI_YEARS, calculate_gfi_projection
+from .trace import stage, start_tracing, stop_tracing
+
+CHECKPOINT_DIR = ".checkpoint"
+CHECKPOINT_FORMAT = 1           # 묶음 파일 구조가 바뀌면 올릴 것 (이전 체크포인트로는 이어서 계산하지 않음)
+REGIME_TABLES = {
+    "FEUM": ["fueleu_summary", "fueleu_pooling", "fueleu_green"],
+    "GFI": ["gfi_summary", "gfi_projection"],
+}
+AMOUNT_COLUMNS = {"FEUM": ["역내", "역외"], "GFI": ["사용량"]}
+TABLE_COLUMNS = {   # 표별 열 (gfi_projection은 calculate_gfi_projection 열)
+    "fueleu_summary": ["선박", "기간", *RESULT_DTYPES["FEUM"]],
+    "fueleu_pooling": ["선박", "기간", "연료", "역내 톤수", "역외 톤수"],
+    "fueleu_green": ["선박", "기간", "연료", "역내 톤수", "역외 톤수"],
+    "gfi_summary": ["선박", "기간", *RESULT_DTYPES["GFI"]],
+}
+OUTPUT_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+# 선박/기간 하나 계산 (FuelEU) -> 표 이름별 행 리스트
+def _fueleu_unit(vessel, period, rows: list[dict], fuel_defaults: dict) -> dict:
+    result = calculate_fueleu_result(rows, fuel_defaults)
+    _, summary, _ = result_summary(result)
+    keys = {"선박": vessel, "기간": period}
+    tables = {"fueleu_summary": [{**keys, **summary}], "fueleu_pooling": [], "fueleu_green": []}
+    if result["avg_ghg_intensity"] < result["standard_now"]:
+        tables["fueleu_pooling"] = [{**keys, **row} for row in calculate_pooling_table(result, fuel_defaults).to_dict("records")]
+    elif result["avg_ghg_intensity"] > result["standard_now"]:
+        tables["fueleu_green"] = [{**keys, **row} for row in calculate_green_fuel_table(result, fuel_defaults).to_dict("records")]
+    return tables
+
+# 선박/기간 하나 계산 (GFI) -> 요약 행 (연도별 표는 묶음 단위로 한 번에 계산)
+def _gfi_unit(vessel, period, rows: list[dict], fuel_defaults: dict) -> dict:
+    result = calculate_gfi_result(rows, fuel_defaults)
+    _, summary, _ = result_summary(result)
+    return {"gfi_summary": [{"선박": vessel, "기간": period, **summary}]}
+
+# 묶음 하나 계산 (프로세스 풀 작업) -> (묶음 번호, {표 이름: DataFrame}, 오류 행 리스트)
+#  data: 묶음에 속한 선박/기간의 합쳐진 연료 행 (선박, 기간, 연료종류, LHV, WtW, 사용량 열)
+def run_chunk(regime: str, chunk_id: int, data: pd.DataFrame, years=GFI_YEARS) -> tuple[int, dict, list]:
+    fuel_defaults = get_factor_table(regime).defaults
+    unit = _fueleu_unit if regime == "FEUM" else _gfi_unit
+    columns = ["연료종류", "LHV", "WtW", *AMOUNT_COLUMNS[regime]]
+    tables = {name: [] for name in REGIME_TABLES[regime]}
+    errors = []
+    for (vessel, period), group in data.groupby(["선박", "기간"], sort=True):
+        try:
+            for name, rows in unit(vessel, period, group[columns].to_dict("records"), fuel_defaults).items():
+                tables[name].extend(rows)
+        except Exception as e:   # 한 선박이 실패해도 나머지는 계속 (errors 표에 기록)
+            errors.append({"규제": regime, "선박": vessel, "기간": period, "오류": f"{type(e).__name__}: {e}"})
+
+    frames = {name: pd.DataFrame(rows, columns=TABLE_COLUMNS.get(name)) for name, rows in tables.items()}
+    if regime == "GFI":
+        frames["gfi_projection"] = _gfi_projection(frames["gfi_summary"], years)
+    return chunk_id, frames, errors
+
+# 선박/기간별 연도별 GFI Compliance -> (선박/기간 × 연도) 배열로 한 번에 계산
+def _gfi_projection(summary: pd.DataFrame, years) -> pd.DataFrame:
+    years = np.asarray(list(years), dtype=int)
+    repeat = np.repeat(np.arange(len(summary)), len(years))
+    projection = calculate_gfi_projection(summary["gfi"].to_numpy(dtype=float)[repeat],
+                                          summary["total_energy"].to_numpy(dtype=float)[repeat],
+                                          np.tile(years, len(summary)))
+    projection.insert(0, "기간", summary["기간"].to_numpy()[repeat])
+    projection.insert(0, "선박", summary["선박"].to_numpy()[repeat])
+    return projection
+
+# 입력 파일 + 옵션 지문 -> 체크포인트가 같은 실행의 것인지 확인
+def _fingerprint(path: Path, options: dict) -> dict:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"format": CHECKPOINT_FORMAT, "input": digest.hexdigest(), "options": options}
+
+# 체크포인트 폴더 준비 -> resume이면 같은 지문일 때만 기존 묶음 사용, 아니면 비우고 새로 시작
+def _prepare_checkpoint(out_dir: Path, fingerprint: dict, resume: bool) -> Path:
+    checkpoint = out_dir / CHECKPOINT_DIR
+    manifest = checkpoint / "manifest.json"
+    if checkpoint.exists():
+        same = manifest.exists() and json.loads(manifest.read_text(encoding="utf-8")) == fingerprint
+        if resume and not same:
+            raise ValueError("이어서 계산할 수 없습니다: 체크포인트의 입력 파일 또는 옵션이 다릅니다 (--resume 없이 다시 실행)")
+        if not resume:
+            shutil.rmtree(checkpoint)
+    checkpoint.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps(fingerprint, ensure_ascii=False, indent=2), encoding="utf-8")
+    return checkpoint
+
+def _part_path(checkpoint: Path, regime: str, chunk_id: int) -> Path:
+    return checkpoint / f"{regime}-{chunk_id:05d}.pkl"
+
+# 묶음 결과 저장 (임시 파일 -> os.replace, 중간에 끊겨도 반쯤 쓴 묶음을 완료로 보지 않음)
+def _save_part(path: Path, frames: dict, errors: list):
+    tmp = path.with_suffix(".tmp")
+    pd.to_pickle({"frames": frames, "errors": errors}, tmp)
+    os.replace(tmp, path)
+
+# 진행 상황 한 줄 (터미널이면 같은 줄 갱신, 아니면 1초에 한 번 이하로 줄 단위 출력)
+class Progress:
+    def __init__(self, label: str, total: int, done: int = 0, stream=None):
+        self.label, self.total, self.done = label, total, done
+        self.stream = sys.stderr if stream is None else stream
+        self.tty = self.stream.isatty()
+        self.start = time.perf_counter()
+        self.resumed = done
+        self._last = 0.0
+
+    def update(self, count: int):
+        self.done += count
+        now = time.perf_counter()
+        if not self.tty and now - self._last < 1.0 and self.done < self.total:
+            return
+        self._last = now
+        elapsed = now - self.start
+        rate = (self.done - self.resumed) / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else float("nan")
+        percent = self.done * 100 / self.total if self.total else 100.0
+        eta = time.strftime("%H:%M:%S", time.gmtime(remaining)) if np.isfinite(remaining) else "--:--:--"
+        line = f"[{self.label}] {self.done:,}/{self.total:,} 선박·기간 ({percent:5.1f}%) {rate:,.1f}/s 남은 시간 {eta}"
+        self.stream.write(("\r" + line) if self.tty else line + "\n")
+        self.stream.flush()
+
+    def close(self):
+        if self.tty:
+            self.stream.write("\n")
+            self.stream.flush()
+
+# 규제 하나 실행 -> 로그 읽기, 묶음 나누기, 남은 묶음 계산 (체크포인트에 저장)
+def run_regime(regime: str, input_path: Path, checkpoint: Path, workers: int, chunk: int,
+               ingest_options: dict, years=GFI_YEARS) -> dict:
+    with stage(f"cli.{regime}.ingest"):
+        accumulator = ingest_fuel_log(input_path, regime, **ingest_options)
+    if accumulator.unknown:
+        names = ", ".join(f"{name} ({count}행)" for name, count in accumulator.unknown.items())
+        print(f"[{regime}] 알 수 없는 연료 종류는 건너뜀: {names}", file=sys.stderr)
+
+    data = accumulator.merged
+    units = data[["선박", "기간"]].drop_duplicates().sort_values(["선박", "기간"], kind="stable").reset_index(drop=True)
+    units["_chunk"] = np.arange(len(units)) // chunk
+    data = data.merge(units, on=["선박", "기간"], how="left")
+    sizes = units.groupby("_chunk").size()
+
+    pending = [chunk_id for chunk_id in sizes.index if not _part_path(checkpoint, regime, chunk_id).exists()]
+    progress = Progress(regime, len(units), int(sizes.drop(pending).sum()))
+    progress.update(0)
+    parts = {chunk_id: data[data["_chunk"] == chunk_id].drop(columns="_chunk") for chunk_id in pending}
+
+    with stage(f"cli.{regime}.compute", rows=len(units)):
+        if workers <= 1:
+            for chunk_id in pending:
+                _, frames, errors = run_chunk(regime, chunk_id, parts.pop(chunk_id), years)
+                _save_part(_part_path(checkpoint, regime, chunk_id), frames, errors)
+                progress.update(int(sizes[chunk_id]))
+        elif pending:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(run_chunk, regime, chunk_id, parts.pop(chunk_id), years) for chunk_id in pending]
+                for future in as_completed(futures):
+                    chunk_id, frames, errors = future.result()
+                    _save_part(_part_path(checkpoint, regime, chunk_id), frames, errors)
+                    progress.update(int(sizes[chunk_id]))
+    progress.close()
+    return {"units": len(units), "chunks": len(sizes), "computed": len(pending)}
+
+# 행이 없는 표 (열 이름만 있음) -> 결과가 없어도 파일에 머리글은 씀
+def _empty_frames(regime: str) -> dict:
+    return run_chunk(regime, -1, pd.DataFrame(columns=["선박", "기간", "연료종류", "LHV", "WtW", *AMOUNT_COLUMNS[regime]]))[1]
+
+# 체크포인트 묶음을 표별로 합치기 (묶음 번호 순서 = 선박/기간 순서)
+def collect_parts(checkpoint: Path, regime: str) -> tuple[dict, list]:
+    tables = {name: [] for name in REGIME_TABLES[regime]}
+    errors = []
+    for path in sorted(checkpoint.glob(f"{regime}-*.pkl")):
+        part = pd.read_pickle(path)
+        for name, frame in part["frames"].items():
+            if not frame.empty:
+                tables[name].append(frame)
+        errors.extend(part["errors"])
+    empty = _empty_frames(regime)
+    return {name: pd.concat(frames, ignore_index=True) if frames else empty[name]
+            for name, frames in tables.items()}, errors
+
+# 표 저장 -> Parquet / Arrow는 write_results (요약 표는 숫자 타입 + 계수표 버전 메타데이터), CSV는 엑셀용 UTF-8 BOM
+def write_table(df: pd.DataFrame, out_dir: Path, name: str, fmt: str, regime: str | None = None) -> Path:
+    path = out_dir / f"{name}{OUTPUT_SUFFIXES[fmt]}"
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return path
+    summary_regime = regime if name.endswith("_summary") else None
+    return write_results(df, path, regime=summary_regime, metadata={"table": name})
+
+def _years(text: str) -> list[int]:
+    years = []
+    for part in text.split(","):
+        start, _, end = part.strip().partition("-")
+        years.extend(range(int(start), int(end or start) + 1))
+    return years
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m compliance", description="선대 연료 사용 로그로 FuelEU / GFI 보고서 일괄 계산")
+    parser.add_argument("input", type=Path, help="선대 연료 사용 로그 (CSV 또는 Parquet)")
+    parser.add_argument("-o", "--out", type=Path, required=True, help="결과 폴더")
+    parser.add_argument("--regimes", default="FEUM,GFI", help="계산할 규제 (쉼표 구분, 기본 FEUM,GFI)")
+    parser.add_argument("--format", choices=list(OUTPUT_SUFFIXES), default="parquet", help="결과 파일 형식 (기본 parquet)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="계산 프로세스 수 (1이면 현재 프로세스에서 계산)")
+    parser.add_argument("--chunk", type=int, default=100, help="작업/체크포인트 단위 선박·기간 수")
+    parser.add_argument("--resume", action="store_true", help="같은 입력으로 중단된 실행을 이어서 계산")
+    parser.add_argument("--gfi-years", default=f"{GFI_YEARS[0]}-{GFI_YEARS[-1]}", help="GFI 연도별 표 연도 (예: 2028-2035)")
+    parser.add_argument("--vessel-col", default="선박", help="선박 열 이름")
+    parser.add_argument("--period-col", default="기간", help="기간 열 이름")
+    parser.add_argument("--date-col", default=None, help="날짜 열 이름 (지정하면 --freq 단위 기간으로 묶음)")
+    parser.add_argument("--freq", default="Y", help="날짜 열을 묶을 기간 단위 (기본 Y: 연도)")
+    parser.add_argument("--strict", action="store_true", help="알 수 없는 연료 종류가 있으면 중단 (기본: 건너뛰고 경고)")
+    parser.add_argument("--keep-checkpoint", action="store_true", help="완료 후 체크포인트 폴더를 지우지 않음")
+    parser.add_argument("--trace", type=Path, default=None, help="단계별 소요 시간 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    regimes = [regime.strip().upper() for regime in args.regimes.split(",") if regime.strip()]
+    unknown = [regime for regime in regimes if regime not in REGIME_TABLES]
+    if unknown or not regimes:
+        parser.error(f"알 수 없는 규제: {', '.join(unknown) or args.regimes}")
+    if not args.input.exists():
+        parser.error(f"입력 파일이 없습니다: {args.input}")
+    if args.chunk < 1:
+        parser.error("--chunk는 1 이상이어야 합니다.")
+    years = _years(args.gfi_years)
+    ingest_options = {
+        "vessel_col": args.vessel_col, "period_col": args.period_col, "date_col": args.date_col, "freq": args.freq,
+        "errors": "raise" if args.strict else "skip",
+    }
+
+    trace = start_tracing() if args.trace else None
+    args.out.mkdir(parents=True, exist_ok=True)
+    options = {"regimes": regimes, "chunk": args.chunk, "gfi_years": years, **ingest_options}
+    try:
+        checkpoint = _prepare_checkpoint(args.out, _fingerprint(args.input, options), args.resume)
+        written, all_errors = [], []
+        for regime in regimes:
+            try:
+                stats = run_regime(regime, args.input, checkpoint, args.workers, args.chunk, ingest_options, years)
+            except KeyError as e:
+                raise ValueError(f"로그 파일에 필요한 열이 없습니다: {e.args[0]} (--vessel-col / --period-col / --date-col 확인)") from e
+            if stats["computed"] < stats["chunks"]:
+                print(f"[{regime}] 체크포인트에서 {stats['chunks'] - stats['computed']}개 묶음을 이어받음", file=sys.stderr)
+            with stage(f"cli.{regime}.write"):
+                tables, errors = collect_parts(checkpoint, regime)
+                for name, df in tables.items():
+                    written.append(write_table(df, args.out, name, args.format, regime))
+            all_errors.extend(errors)
+        if all_errors:
+            written.append(write_table(pd.DataFrame(all_errors), args.out, "errors", args.format))
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if trace is not None:
+            stop_tracing()
+            args.trace.write_text(trace.to_json(indent=2), encoding="utf-8")
+
+    if not args.keep_checkpoint:
+        shutil.rmtree(checkpoint, ignore_errors=True)
+    for path in written:
+        print(path)
+    if all_errors:
+        print(f"계산하지 못한 선박·기간 {len(all_errors)}건 -> {written[-1]}", file=sys.stderr)
+    return 1 if all_errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
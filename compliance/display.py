@@ -0,0 +1,46 @@
+# 표시용 문자열 변환 (view) -> 계산 결과는 숫자 표로 유지하고 화면에 보여줄 때만 문자열로 바꿈
+#  그래프, 내보내기, 후속 계산은 숫자 표를 그대로 사용 (문자열을 다시 숫자로 읽지 않음)
+
+import numpy as np
+import pandas as pd
+
+# 숫자 배열 -> 표시 문자열 배열 (NaN은 None)
+def format_values(values, spec: str = ",.2f", prefix: str = "", suffix: str = "") -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return np.array([None if np.isnan(v) else f"{prefix}{v:{spec}}{suffix}" for v in values.tolist()], dtype=object)
+
+# 표의 열별 표시 형식 적용 -> formats: {열: 형식 (",.2f") 또는 (형식, 앞 문자, 뒤 문자)}
+def format_frame(df: pd.DataFrame, formats: dict) -> pd.DataFrame:
+    view = df.copy()
+    for col, fmt in formats.items():
+        if col in view.columns:
+            spec, prefix, suffix = (fmt, "", "") if isinstance(fmt, str) else fmt
+            view[col] = format_values(view[col], spec, prefix, suffix)
+    return view
+
+# 연도별 GFI Compliance 표 (calculate_gfi_projection 결과) -> 화면 표
+#  Tier 별로 해당하는 칸만 표시 (Tier 2: Tier 1/2 CB·탄소세, Tier 1: Tier 1 CB·탄소세, Surplus: Surplus)
+#  어느 연도에도 해당하지 않는 열은 생략
+def gfi_projection_view(df_projection: pd.DataFrame) -> pd.DataFrame:
+    tier = df_projection["Tier"].to_numpy()
+    tier2, tier1 = tier == "Tier 2", tier == "Tier 1"
+    charged = tier2 | tier1
+    surplus = ~charged
+
+    def cells(col, mask, spec, prefix="", suffix=""):
+        return np.where(mask, format_values(df_projection[col], spec, prefix, suffix), None)
+
+    columns = {
+        "연도": df_projection["연도"].astype(int).to_numpy(),
+        "Tier": tier,
+        "Tier 1 CB (tCO₂eq)": np.where(tier2, cells("Tier 1 CB (tCO₂eq)", tier2, ",.2f", suffix=" tCO₂eq"),
+                                       cells("Tier 1 CB (tCO₂eq)", tier1, ",.0f", suffix=" tCO₂eq")),
+        "Tier 1 탄소세 ($)": cells("Tier 1 탄소세 ($)", charged, ",.0f", prefix="$"),
+        "Tier 2 CB (tCO₂eq)": cells("Tier 2 CB (tCO₂eq)", tier2, ",.2f", suffix=" tCO₂eq"),
+        "Tier 2 탄소세 ($)": cells("Tier 2 탄소세 ($)", tier2, ",.0f", prefix="$"),
+        "Surplus (tCO₂eq)": cells("Surplus (tCO₂eq)", surplus, ",.2f", suffix=" tCO₂eq"),
+        "총 탄소세 ($)": np.where(charged, format_values(df_projection["총 탄소세 ($)"], ",.0f", prefix="$"), "None"),
+    }
+    shown = {"Tier 1 CB (tCO₂eq)": charged, "Tier 1 탄소세 ($)": charged, "Tier 2 CB (tCO₂eq)": tier2,
+             "Tier 2 탄소세 ($)": tier2, "Surplus (tCO₂eq)": surplus}
+    return pd.DataFrame({col: values for col, values in columns.items() if shown.get(col, np.ones(1, bool)).any()})
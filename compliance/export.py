@@ -0,0 +1,146 @@
+# 계산 결과 열 단위 내보내기 (Arrow / Parquet) -> BI에서 문자열 파싱 없이 숫자 열을 바로 읽도록 타입이 정해진 표로 저장
+#
+#  df = results_frame({"선박A": calculate_fueleu(...), "선박B": ...})   # 또는 calculate_fueleu_batch / project_* / run_sweep 결과 표
+#  write_results(df, "fleet_2025.parquet", regime="FEUM")               # .parquet / .pq -> Parquet, .arrow / .feather -> Arrow IPC
+#
+# pyarrow는 내보내기에서만 필요하므로 함수 안에서 import
+# Arrow IPC 파일은 memory map으로 복사 없이 읽을 수 있음 (read_results)
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from .factors import factor_set_version
+from .results import FuelEUResult, GFIResult
+
+# 선박별 결과 열 타입
+RESULT_DTYPES = {
+    "FEUM": {
+        "avg_ghg_intensity": "float64", "standard_now": "float64", "cb": "float64", "penalty_eur": "float64",
+        "total_energy": "float64", "total_emission": "float64", "surplus": "bool"
+    },
+    "GFI": {
+        "gfi": "float64", "tier": "category", "cb": "float64", "penalty": "float64",
+        "total_energy": "float64", "total_emission": "float64", "surplus": "bool"
+    },
+}
+
+# 연료별 계산표 숫자 열
+DETAIL_COLUMNS = {
+    "FEUM": ["GHG Intensity (gCO₂eq/MJ)", "반영 LCV (MJ)", "배출량 (tCO₂eq)"],
+    "GFI": ["LHV", "WtW", "사용량", "총 에너지 (MJ)", "총 배출량 (tCO₂eq)"],
+}
+
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Arrow / Parquet 내보내기에는 pyarrow가 필요합니다 (pip install pyarrow)") from e
+    return pa
+
+# 결과 하나 -> (규제, 숫자 요약 dict, 연료별 계산표)  (결과 타입 또는 calculate_*_result 결과 dict)
+def result_summary(result) -> tuple[str, dict, pd.DataFrame]:
+    if isinstance(result, FuelEUResult):
+        return "FEUM", {
+            "avg_ghg_intensity": result.avg_ghg_intensity, "standard_now": result.standard, "cb": result.cb,
+            "penalty_eur": result.penalty_eur, "total_energy": result.total_energy,
+            "total_emission": result.total_emission, "surplus": result.surplus
+        }, result.table
+    if isinstance(result, GFIResult):
+        return "GFI", {
+            "gfi": result.gfi, "tier": result.tier, "cb": result.cb, "penalty": result.penalty,
+            "total_energy": result.total_energy, "total_emission": result.total_emission, "surplus": result.surplus
+        }, result.table
+    if "avg_ghg_intensity" in result:
+        return "FEUM", {
+            "avg_ghg_intensity": result["avg_ghg_intensity"], "standard_now": result["standard_now"], "cb": result["cb"],
+            "penalty_eur": result["penalty_eur"], "total_energy": result["total_energy"],
+            "total_emission": result["total_emission"], "surplus": result["avg_ghg_intensity"] < result["standard_now"]
+        }, result["df_result"]
+    return "GFI", {
+        "gfi": result["gfi"], "tier": result["tier"], "cb": result["cb_total"], "penalty": result["penalty"],
+        "total_energy": result["total_energy"], "total_emission": result["total_emission"],
+        "surplus": result["tier"] == "Surplus"
+    }, result["df"]
+
+def _items(results):
+    return results.items() if isinstance(results, dict) else enumerate(results)
+
+# 표의 알려진 열을 정해진 타입으로 변환 (문자열로 포맷된 값이 섞여 있으면 ValueError)
+def typed_frame(df: pd.DataFrame, regime: str) -> pd.DataFrame:
+    dtypes = {col: dtype for col, dtype in RESULT_DTYPES[regime].items() if col in df.columns}
+    try:
+        return df.astype(dtypes)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"숫자 열에 숫자가 아닌 값이 있습니다 (표시용 문자열은 내보낼 수 없음): {e}") from e
+
+# 선박별 결과 요약 표 -> results: {선박: 결과} 또는 결과 리스트 (FuelEU / GFI 중 한 가지)
+def results_frame(results, vessel_col: str = "선박") -> pd.DataFrame:
+    rows, regimes = [], set()
+    for vessel, result in _items(results):
+        regime, summary, _ = result_summary(result)
+        regimes.add(regime)
+        rows.append({vessel_col: vessel, **summary})
+    if len(regimes) > 1:
+        raise ValueError("FuelEU와 GFI 결과는 따로 내보내야 합니다.")
+    regime = regimes.pop() if regimes else "FEUM"
+    return typed_frame(pd.DataFrame(rows, columns=[vessel_col, *RESULT_DTYPES[regime]]), regime)
+
+# 선박별 연료 계산표를 하나로 합친 표 (합계 행 제외, 숫자 열은 float)
+def detail_frame(results, vessel_col: str = "선박") -> pd.DataFrame:
+    frames = []
+    for vessel, result in _items(results):
+        regime, _, table = result_summary(result)
+        table = table.drop(index="합계", errors="ignore")
+        columns = ["연료종류"] + DETAIL_COLUMNS[regime]
+        detail = table[columns].astype({col: "float64" for col in DETAIL_COLUMNS[regime]})
+        detail.insert(0, vessel_col, vessel)
+        frames.append(detail.reset_index(drop=True))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+# 표 -> Arrow Table (계수표 버전 / 규제 / 생성 시각을 스키마 메타데이터로 저장)
+def to_arrow(df: pd.DataFrame, regime: str | None = None, metadata: dict | None = None):
+    pa = _import_pyarrow()
+    if regime is not None:
+        df = typed_frame(df, regime)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    info = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    if regime is not None:
+        info.update({"regime": regime, "factor_set_version": factor_set_version(regime)})
+    info.update(metadata or {})
+    existing = table.schema.metadata or {}
+    return table.replace_schema_metadata({**existing, **{str(k).encode(): str(v).encode() for k, v in info.items()}})
+
+# 결과 표 저장 -> 확장자로 형식 결정 (Parquet 또는 Arrow IPC), 저장한 경로 반환 (compression은 Parquet에만 적용)
+def write_results(df: pd.DataFrame, path, regime: str | None = None, metadata: dict | None = None,
+                  compression: str = "zstd") -> Path:
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+        raise ValueError(f"지원하지 않는 형식: {suffix} (.parquet, .arrow 사용)")
+    table = to_arrow(df, regime, metadata)
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression=compression)
+    else:
+        # IPC는 압축하지 않음 -> read_results에서 memory map 버퍼를 복사 없이 그대로 사용
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression="uncompressed")
+    return path
+
+# 저장한 결과 표 읽기 -> (표, 메타데이터), Arrow IPC는 memory map으로 읽음
+def read_results(path) -> tuple[pd.DataFrame, dict]:
+    pa = _import_pyarrow()
+    path = Path(path)
+    if path.suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items() if k != b"pandas"}
+    return table.to_pandas(), metadata
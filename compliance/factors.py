@@ -0,0 +1,360 @@
+# GFI / FuelEU Maritime 연료 기본값(LHV, WtW) 생성
+
+import hashlib
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .blends import BLEND_COMPONENTS, FEUM_BLEND_COMPONENTS, GFI_BLEND_COMPONENTS, blend_defaults, blend_matrix, expand_blend_rows
+
+# 계수표 버전 -> 계수를 고치면 올릴 것 (캐시 키에 계수 내용 해시도 함께 들어감)
+FACTOR_SET_VERSION = "2025.1"
+
+# GFI 계산기용 GWP 값 / FeulEU Maritime 값 사용
+GFI_GWP_FACTORS = {
+    "CO2": 1,
+    "CH4": 28,
+    "N2O": 265
+}
+
+# GFI 계산기용 TtW 계수 / MEPC80차 기준
+GFI_TTW_FACTORS = {
+    "VLSFO": {"CO2": 3.114, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0402, "SLIP": 0, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0, "CH4_slip": 0, "N2O_slip": 0},
+    "HSFO": {"CO2": 3.114, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0402, "SLIP": 0, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0, "CH4_slip": 0, "N2O_slip": 0},
+    "LSMGO": {"CO2": 3.206, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0427, "SLIP": 0, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0, "CH4_slip": 0, "N2O_slip": 0},
+    "LNG / LNG Otto (dual fuel medium speed)": {"CO2": 2.75, "CH4": 0, "N2O": 0.00011, "LCV": 0.0480, "SLIP": 0.035, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0.0, "CH4_slip": 1, "N2O_slip": 0.0},
+    "LNG / LNG Diesel (dual fuel slow speed)": {"CO2": 2.75, "CH4": 0, "N2O": 0.00011, "LCV": 0.0480, "SLIP": 0.0015, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0.0, "CH4_slip": 1, "N2O_slip": 0.0},
+    "LPG(Propane)": {"CO2": 3.0, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0463, "SLIP": 0, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0, "CH4_slip": 0, "N2O_slip": 0},
+    "LPG(Butane)": {"CO2": 3.03, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0457, "SLIP": 0, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0, "CH4_slip": 0, "N2O_slip": 0},
+    "Bio(Fame)": {"CO2": 2.834, "CH4": 0, "N2O": 0, "LCV": 0.0372, "SLIP": 0, "Cfug": 0.0, "RWD": 0, "CO2_slip": 0, "CH4_slip": 0, "N2O_slip": 0} #바이오디젤은 RED II 기준 / 아직 안나왔으니
+}
+
+# GFI 계산기용 WtT 계수
+GFI_WTT_FACTORS = {
+    "VLSFO": 16.8,
+    "HSFO": 14.9,
+    "LSMGO": 17.7,
+    "LNG / LNG Otto (dual fuel medium speed)": 18.5,#LNG는 RED II 기준 / 아직 안나왔으니
+    "LNG / LNG Diesel (dual fuel slow speed)": 18.5,#LNG는 RED II 기준 / 아직 안나왔으니
+    "LPG(Propane)": 7.8,#LPG는 RED II 기준 / 아직 안나왔으니
+    "LPG(Butane)": 7.8,#LPG는 RED II 기준 / 아직 안나왔으니
+    "Bio(Fame)": 20.8 - 2.834 / 0.0372# WtT값이 일단 안나옴
+}
+
+# FuelEU Maritime용 GWP 값
+FEUM_GWP_FACTORS = {
+    "CO2": 1,
+    "CH4": 25,
+    "N2O": 298
+}
+
+# TtW 계수 (RED II)
+FEUM_TTW_FACTORS = {
+    # 📘 Annex II Fossil Fuels
+    "HFO (Grades RME to RMK)": {"CO2": 3.114, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0405, "SLIP": 0.0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "LFO (Grades RMA to RMD)": {"CO2": 3.151, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0410, "SLIP": 0.0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "MDO MGO (Grades DMX to DMB)": {"CO2": 3.206, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0427, "SLIP": 0.0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "LNG / LNG Otto (dual fuel medium speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.031, "RWD": 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "LNG / LNG Otto (dual fuel slow speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.017, "RWD": 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "LNG / LNG Diesel (dual fuel slow speed)": {"CO2": 2.75, "CH4": 0, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.002, "RWD": 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "LNG / LBSI": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.026, "RWD": 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "Ethane": {"CO2": 2.927, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0464, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "LPG - Butane": {"CO2": 3.030, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0460, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "LPG - Propane": {"CO2": 3.000, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0460, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "H2 (natural gas) / Fuel Cells": {"CO2": 0.000, "CH4": 0.00000, "N2O": 0.00000, "LCV": 0.1200, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "H2 (natural gas) / ICE": {"CO2": 0.000, "CH4": 0.00000, "N2O": 0.00018, "LCV": 0.1200, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "NH3 (natural gas) / Fuel Cells": {"CO2": 0.000, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0186, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "NH3 (natural gas) / ICE": {"CO2": 0.000, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0180, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "Methanol (natural gas)": {"CO2": 1.375, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0199, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+
+    # 📗 Annex II Biofuels
+    "Bio-ethanol (wheat straw)": {"CO2": 1.913, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0270, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "Bio(Fame)": {"CO2": 2.834, "CH4": 0, "N2O": 0, "LCV": 0.0370, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "Hydrotreated Vegetable Oil (waste cooking oil)": {"CO2": 3.115, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0440, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "Liquefied Biomethane (bio-waste) / Otto (dual fuel medium speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0500, "SLIP": 0.031,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "Liquefied Biomethane / Otto (dual fuel slow speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0500, "SLIP": 0.017,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "Liquefied Biomethane / Diesel (dual fuels)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0500, "SLIP": 0.002,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "Liquefied Biomethane / LBSI": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0500, "RWD" : 0,"SLIP": 0.026, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "Bio-methanol": {"CO2": 1.375, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0200, "SLIP": 0.0, "RWD" : 0,"CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "Other Production Pathways": {"CO2": 3.115, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0370, "SLIP": 0.0, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+
+    # 📙 Annex II e-Fuels
+    "e-diesel": {"CO2": 3.206, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0427, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "e-methanol": {"CO2": 1.375, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0199, "SLIP": 0.0,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "e-LNG / Otto (dual fuel medium speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.031,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "e-LNG / Otto (dual fuel slow speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.017,"RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "e-LNG / Diesel (dual fuel slow speed)": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.002, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "e-LNG / LBSI": {"CO2": 2.750, "CH4": 0.00000, "N2O": 0.00011, "LCV": 0.0491, "SLIP": 0.026, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 1.0, "N2O_slip": 0.0},
+    "e-H2 / Fuel Cells": {"CO2": 0.000, "CH4": 0.00000, "N2O": 0.00000, "LCV": 0.1200, "SLIP": 0.0, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "e-H2 / ICE": {"CO2": 0.000, "CH4": 0.00000, "N2O": 0.00018, "LCV": 0.1200, "SLIP": 0.0, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "e-NH3 / Fuel Cells": {"CO2": 0.000, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0186, "SLIP": 0.0, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0},
+    "e-NH3 / ICE": {"CO2": 0.000, "CH4": 0.00005, "N2O": 0.00018, "LCV": 0.0186, "SLIP": 0.0, "RWD" : 0, "CO2_slip": 0.0, "CH4_slip": 0.0, "N2O_slip": 0.0}
+}
+
+# WtT 계수 (RED II)
+FEUM_WTT_FACTORS = {
+    # 📘 Fossil Fuels (표 1)
+    "HFO (Grades RME to RMK)": 13.5,
+    "LFO (Grades RMA to RMD)": 13.2,
+    "MDO MGO (Grades DMX to DMB)": 14.4,
+    "LNG / LNG Otto (dual fuel medium speed)": 18.5,
+    "LNG / LNG Otto (dual fuel slow speed)": 18.5,
+    "LNG / LNG Diesel (dual fuel slow speed)": 18.5,
+    "LNG / LBSI": 18.5,
+    "Ethane": 18.5,
+    "LPG - Butane": 7.8,
+    "LPG - Propane": 7.8,
+    "H2 (natural gas) / Fuel Cells": 132.0,
+    "H2 (natural gas) / ICE": 132.0,
+    "NH3 (natural gas) / Fuel Cells": 121.0,
+    "NH3 (natural gas) / ICE": 121.0,
+    "Methanol (natural gas)": 31.3,
+
+    # 📗 Biofuels (표 2)
+    "Bio-ethanol (wheat straw)": -55.15185,
+    "Bio(Fame)": 14.6 - 2.834 / 0.037,
+    "Hydrotreated Vegetable Oil (waste cooking oil)": -54.79545,
+    "Liquefied Biomethane (bio-waste) / Otto (dual fuel medium speed)": -35.83000,
+    "Liquefied Biomethane / Otto (dual fuel slow speed)": -35.83000,
+    "Liquefied Biomethane / Diesel (dual fuels)": -35.83000,
+    "Liquefied Biomethane / LBSI": -35.83000,
+    "Bio-methanol": -58.35000,
+    "Other Production Pathways": -69.18919,
+
+    # 📙 e-Fuels (표 3)
+    "e-diesel": -63.2,
+    "e-methanol": -58.9,
+    "e-LNG / Otto (dual fuel medium speed)": -46.2,
+    "e-LNG / Otto (dual fuel slow speed)": -46.2,
+    "e-LNG / Diesel (dual fuel slow speed)": -46.2,
+    "e-LNG / LBSI": -46.2,
+    "e-H2 / Fuel Cells": 10.0,
+    "e-H2 / ICE": 10.0,
+    "e-NH3 / Fuel Cells": 10.0,
+    "e-NH3 / ICE": 10.0
+}
+
+#GFI 계산기용 GFI 연료 기본값 생성 함수 -> 혼합연료 (B10 ~ B50) wtw, lcv 포함
+def generate_GFI_fuel_defaults(gwp_factors=None, ttw_factors=None, wtt_factors=None):
+    GFI_gwp_factors = GFI_GWP_FACTORS if gwp_factors is None else gwp_factors
+    GFI_ttw_factors = GFI_TTW_FACTORS if ttw_factors is None else ttw_factors
+    GFI_wtt_factors = GFI_WTT_FACTORS if wtt_factors is None else wtt_factors
+
+    # GFI WtW 계수 함수 / 슬립 처리는 우선 FuelEU Maritime과 동일하게 사용
+
+    def calculate_ttw(fuel_type: str) -> float:
+        ttw = GFI_ttw_factors[fuel_type]
+        gwp = GFI_gwp_factors
+
+        LCV = float(ttw["LCV"])             # MJ/g
+        slip_frac = float(ttw.get("SLIP", 0.0))   # 0~1 fraction
+        if not (0.0 <= slip_frac <= 1.0):
+            raise ValueError("SLIP must be a fraction in [0,1].")
+
+        cfug_pct = float(ttw.get("Cfug", 0.0))    # %
+        if not (0.0 <= cfug_pct <= 100.0):
+            raise ValueError("Cfug must be in [0,100].")
+
+        # 연소부 배출계수 (g GHG / g fuel)
+        CfCO2 = float(ttw.get("CO2", 0.0))
+        CfCH4 = float(ttw.get("CH4", 0.0))
+        CfN2O = float(ttw.get("N2O", 0.0))
+
+        # IMO 식: C_slip_ship = C_slip × (1 − Cfug/100)
+        c_slip_ship_frac = slip_frac * (1.0 - cfug_pct / 100.0)
+        # 총 비산분(연소되지 않은 연료의 분율) = C_slip_ship + Cfug
+        total_unoxidized_frac = c_slip_ship_frac + (cfug_pct / 100.0)
+        if total_unoxidized_frac < 0 or total_unoxidized_frac > 1:
+            raise ValueError("Invalid (slip + Cfug) combination.")
+
+        oxidized_frac = 1.0 - total_unoxidized_frac
+
+        # 연소부 gCO2eq/g
+        combustion = (
+            CfCO2 * gwp["CO2"] +
+            CfCH4 * gwp["CH4"] +
+            CfN2O * gwp["N2O"]
+        )
+        combustion_term = oxidized_frac * combustion
+
+        # 슬립·누출부 gCO2eq/g (연료 성분 자체의 GWP)
+        # 제공된 *_slip 가중치 사용: LNG 계열은 CH4_slip=1, 나머지는 보통 0
+        slip_CO2 = float(ttw.get("CO2_slip", 0.0))
+        slip_CH4 = float(ttw.get("CH4_slip", 0.0))
+        slip_N2O = float(ttw.get("N2O_slip", 0.0))
+        slip_emission = (slip_CO2 * gwp["CO2"] +
+                         slip_CH4 * gwp["CH4"] +
+                         slip_N2O * gwp["N2O"])
+        slip_term = total_unoxidized_frac * slip_emission
+
+        # gCO2eq/MJ
+        return round((combustion_term + slip_term) / LCV, 15)
+
+    def calculate_wtw(fuel_type: str) -> float:
+        return round(GFI_wtt_factors.get(fuel_type, 0.0) + calculate_ttw(fuel_type), 15)
+
+    # 최종 연료 기본값 구성 (표시용 LHV는 MJ/ton: LCV(MJ/g) * 1,000,000 g/ton)
+    fuel_defaults = {}
+    for fuel in GFI_ttw_factors:
+        LCV = GFI_ttw_factors[fuel]["LCV"]
+        LHV = round(LCV * 1_000_000, 0)  # MJ/ton (표시 단위)
+        WtW = calculate_wtw(fuel)
+        fuel_defaults[fuel] = {"LHV": LHV, "WtW": WtW}
+
+    # 혼합연료 계산 (구성은 blends.GFI_BLEND_COMPONENTS)
+    for blend, parts in GFI_BLEND_COMPONENTS.items():
+        fuel_defaults[blend] = blend_defaults(parts, fuel_defaults)
+
+    return fuel_defaults
+
+# FuelEU Maritime용 연료 기본값 생성 함수 -> 혼합연료 (B10 ~ B50, HVO) wtw, lcv 포함
+def generate_FEUM_fuel_defaults(gwp_factors=None, ttw_factors=None, wtt_factors=None):
+    FEUM_gwp_factors = FEUM_GWP_FACTORS if gwp_factors is None else gwp_factors
+    FEUM_ttw_factors = FEUM_TTW_FACTORS if ttw_factors is None else ttw_factors
+    FEUM_wtt_factors = FEUM_WTT_FACTORS if wtt_factors is None else wtt_factors
+
+    def calculate_ttw(fuel_type: str) -> float:
+        ttw = FEUM_ttw_factors[fuel_type]
+        gwp = FEUM_gwp_factors
+        LCV = ttw["LCV"]
+        slip = ttw["SLIP"]
+
+        if slip == 0:
+            co2eq = ttw["CO2"] * gwp["CO2"] + ttw["CH4"] * gwp["CH4"] + ttw["N2O"] * gwp["N2O"]
+            return round(co2eq / LCV, 15)
+        elif slip > 0:
+            combustion = ttw["CO2"] * gwp["CO2"] + ttw["CH4"] * gwp["CH4"] + ttw["N2O"] * gwp["N2O"]
+            slip_CO2 = ttw.get("CO2_slip", 0)
+            slip_CH4 = ttw.get("CH4_slip", 0)
+            slip_N2O = ttw.get("N2O_slip", 0)
+            slip_emission = (slip_CO2 * gwp["CO2"] + slip_CH4 * gwp["CH4"] + slip_N2O * gwp["N2O"])
+            rwd = ttw.get("RWD", 0)
+            total_emission = (1 - slip) * combustion + slip * slip_emission
+            return round(total_emission / LCV, 15)
+        else:
+            raise ValueError(f"Unexpected slip value: {slip}")
+
+    def calculate_wtw(fuel_type: str) -> float:
+        return round(FEUM_wtt_factors.get(fuel_type, 0) + calculate_ttw(fuel_type), 15)
+
+    # 기본 연료 정의
+    fuel_defaults = {}
+    for fuel in FEUM_ttw_factors:
+        LCV = FEUM_ttw_factors[fuel]["LCV"]
+        LHV = round(LCV * 1_000_000, 15)
+        WtW = calculate_wtw(fuel)
+        fuel_defaults[fuel] = {"LHV": LHV, "WtW": WtW}
+
+    # 혼합연료 추가 (구성은 blends.FEUM_BLEND_COMPONENTS)
+    for blend, parts in FEUM_BLEND_COMPONENTS.items():
+        fuel_defaults[blend] = blend_defaults(parts, fuel_defaults)
+
+    return fuel_defaults
+
+# 레코드에 LHV/WtW가 없으면 연료 기본값으로 채우기 (입력값이 있으면 그대로 사용)
+def fill_fuel_defaults(fuel_data: list[dict], fuel_defaults: dict) -> list[dict]:
+    filled = []
+    for row in fuel_data:
+        if "LHV" in row and "WtW" in row:
+            filled.append(row)
+            continue
+        fuel_type = row["연료종류"]
+        if fuel_type not in fuel_defaults:
+            raise ValueError(f"알 수 없는 연료 종류: {fuel_type}")
+        filled.append({
+            **row,
+            "LHV": row.get("LHV", fuel_defaults[fuel_type]["LHV"]),
+            "WtW": row.get("WtW", fuel_defaults[fuel_type]["WtW"])
+        })
+    return filled
+
+# 규제별 계수표 (GWP, TtW, WtT)와 기본값 생성 함수
+REGIMES = {
+    "GFI": (GFI_GWP_FACTORS, GFI_TTW_FACTORS, GFI_WTT_FACTORS, generate_GFI_fuel_defaults),
+    "FEUM": (FEUM_GWP_FACTORS, FEUM_TTW_FACTORS, FEUM_WTT_FACTORS, generate_FEUM_fuel_defaults),
+}
+
+# 계수 일부 바꾸기 -> overrides = {"GWP": {가스: 값}, "TTW": {연료: {항목: 값}}, "WTT": {연료: 값}} (시나리오 분석용)
+def apply_factor_overrides(regime: str, overrides: dict | None = None) -> tuple[dict, dict, dict]:
+    gwp, ttw, wtt, _ = REGIMES[regime]
+    if not overrides:
+        return gwp, ttw, wtt
+    unknown = set(overrides) - {"GWP", "TTW", "WTT"}
+    if unknown:
+        raise ValueError(f"알 수 없는 계수 구분: {', '.join(sorted(unknown))}")
+    ttw_overrides = overrides.get("TTW", {})
+    missing = [fuel for fuel in ttw_overrides if fuel not in ttw]
+    if missing:
+        raise ValueError(f"알 수 없는 연료 종류: {', '.join(missing)}")
+    return (
+        {**gwp, **overrides.get("GWP", {})},
+        {fuel: {**factors, **ttw_overrides.get(fuel, {})} for fuel, factors in ttw.items()},
+        {**wtt, **overrides.get("WTT", {})}
+    )
+
+# 계수 내용 -> 버전 문자열 (FACTOR_SET_VERSION + 계수 내용 해시)
+def _factor_version(gwp: dict, ttw: dict, wtt: dict) -> str:
+    payload = json.dumps((gwp, ttw, wtt), sort_keys=True, ensure_ascii=False)
+    return f"{FACTOR_SET_VERSION}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]}"
+
+# 계수표 버전 문자열 -> 계수나 overrides가 바뀌면 버전도 바뀜 (계수표를 만들 때 한 번 계산한 값)
+def factor_set_version(regime: str, overrides: dict | None = None) -> str:
+    return get_factor_table(regime, overrides).version
+
+# 배열 기반 연료 기본값 표 (연료 인덱스 -> LHV, WtW)
+class FactorTable:
+    def __init__(self, regime: str, version: str, fuel_defaults: dict):
+        self.regime = regime
+        self.version = version
+        self.names = tuple(fuel_defaults)
+        self.index = {fuel: i for i, fuel in enumerate(self.names)}
+        self.lhv = np.array([fuel_defaults[fuel]["LHV"] for fuel in self.names], dtype=float)
+        self.wtw = np.array([fuel_defaults[fuel]["WtW"] for fuel in self.names], dtype=float)
+        self.lhv.flags.writeable = False
+        self.wtw.flags.writeable = False
+        # 기존 dict 형식 (UI 및 단일 선박 계산용) -> 공유 객체이므로 수정하지 말 것
+        self.defaults = fuel_defaults
+        self._names_index = pd.Index(self.names)
+        self._blend_matrix = None
+
+    @classmethod
+    def from_defaults(cls, fuel_defaults: dict, regime: str = "custom") -> "FactorTable":
+        return cls(regime, "custom", fuel_defaults)
+
+    # 연료명 배열 -> 인덱스 배열 (없는 연료는 -1)
+    def lookup(self, names) -> np.ndarray:
+        return self._names_index.get_indexer(names)
+
+    # 혼합연료 분리 행렬 (처음 쓸 때 한 번 생성)
+    def blend_matrix(self):
+        if self._blend_matrix is None:
+            self._blend_matrix = blend_matrix(self.names, BLEND_COMPONENTS.get(self.regime, {}), self.index)
+        return self._blend_matrix
+
+    # 연료 인덱스 배열과 양 -> 혼합연료를 구성 연료 행으로 분리 (blends.expand_blend_rows 참고)
+    def expand_blends(self, idx, amounts):
+        return expand_blend_rows(idx, amounts, self.blend_matrix())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, fuel: str) -> bool:
+        return fuel in self.index
+
+# 계수표 생성 + 버전 해시 (regime, overrides별로 프로세스당 1회)
+#  실행 중에 REGIMES의 계수 dict를 직접 고쳤다면 _compile_factor_table.cache_clear()로 다시 생성
+@lru_cache(maxsize=16)
+def _compile_factor_table(regime: str, overrides_key: str) -> FactorTable:
+    _, _, _, generate = REGIMES[regime]
+    gwp, ttw, wtt = apply_factor_overrides(regime, json.loads(overrides_key))
+    return FactorTable(regime, _factor_version(gwp, ttw, wtt), generate(gwp, ttw, wtt))
+
+# 컴파일된 계수표 (프로세스당 1회 생성, 버전은 생성할 때 계산해서 table.version에 저장)
+#  overrides가 있으면 바뀐 계수로 만든 별도 계수표 (버전 해시에 반영되므로 기본 계수표와 섞이지 않음)
+def get_factor_table(regime: str, overrides: dict | None = None) -> FactorTable:
+    if regime not in REGIMES:
+        raise ValueError(f"알 수 없는 규제 구분: {regime}")
+    overrides_key = json.dumps(overrides, sort_keys=True, ensure_ascii=False) if overrides else "{}"
+    return _compile_factor_table(regime, overrides_key)
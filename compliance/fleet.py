@@ -0,0 +1,112 @@
+# 선대 모드 -> 선박별 연료 목록 / 증분 계산 모델 (GFI, FuelEU)과 선대 합계를 함께 관리
+#
+#  fleet = Fleet(cache=default_cache())
+#  fleet.add_vessel("선박 A")
+#  fleet.model("선박 A", "FEUM").add({...})      # 선박별 모델은 IncrementalFuelEU / IncrementalGFI 그대로
+#  fleet.totals("FEUM")                          # 선대 합계 (에너지, 배출량, CB, 탄소세)
+#
+# 선대 합계는 누적값으로 유지 -> 모델 version이 바뀐 선박만 다시 요약하고 합계에는 이전 요약과의 차이만 반영
+#  (대시보드를 열어도 바뀌지 않은 선박은 다시 계산하지 않음, 결과는 모델의 디스크 캐시도 그대로 사용)
+# 누적값은 Fraction으로 더하고 빼므로 선박 추가/수정/삭제 순서와 관계없이 같은 값
+
+from fractions import Fraction
+
+import pandas as pd
+
+from .export import RESULT_DTYPES, result_summary, typed_frame
+from .incremental import IncrementalFuelEU, IncrementalGFI
+
+REGIME_MODELS = {"GFI": IncrementalGFI, "FEUM": IncrementalFuelEU}
+
+# 선대 합계 열 (선박별 요약 dict의 키)
+FLEET_TOTAL_COLUMNS = {
+    "FEUM": ["total_energy", "total_emission", "cb", "penalty_eur"],
+    "GFI": ["total_energy", "total_emission", "cb", "penalty"],
+}
+
+# 선대 (선박별 모델 + 선대 합계)
+class Fleet:
+    def __init__(self, fuel_defaults_GFI: dict | None = None, fuel_defaults_FEUM: dict | None = None, cache=None):
+        self.fuel_defaults = {"GFI": fuel_defaults_GFI, "FEUM": fuel_defaults_FEUM}
+        self.cache = cache
+        self.vessels = {}      # 선박 -> {"GFI": 모델, "FEUM": 모델}
+        self._summaries = {regime: {} for regime in REGIME_MODELS}   # 선박 -> (모델 version, 요약 dict 또는 None)
+        self._totals = {regime: dict.fromkeys(columns, Fraction(0)) for regime, columns in FLEET_TOTAL_COLUMNS.items()}
+        self._counts = {regime: {"vessels": 0, "surplus": 0} for regime in REGIME_MODELS}
+
+    def __contains__(self, name) -> bool:
+        return name in self.vessels
+
+    def __len__(self) -> int:
+        return len(self.vessels)
+
+    @property
+    def names(self) -> list:
+        return list(self.vessels)
+
+    # 선박 추가 (연료 목록을 주면 모델에 한 번에 추가)
+    def add_vessel(self, name: str, gfi_data=None, fueleu_data=None):
+        name = str(name).strip()
+        if not name:
+            raise ValueError("선박 이름을 입력해 주세요.")
+        if name in self.vessels:
+            raise ValueError(f"이미 있는 선박입니다: {name}")
+        self.vessels[name] = {
+            "GFI": IncrementalGFI(self.fuel_defaults["GFI"], gfi_data, cache=self.cache),
+            "FEUM": IncrementalFuelEU(self.fuel_defaults["FEUM"], fueleu_data, cache=self.cache),
+        }
+        return name
+
+    # 선박 삭제 -> 선대 합계에서 그 선박 요약을 뺌
+    def remove_vessel(self, name: str):
+        for regime in REGIME_MODELS:
+            _, summary = self._summaries[regime].pop(name, (None, None))
+            self._apply(regime, summary, -1)
+        del self.vessels[name]
+
+    # 선박별 모델 (regime: "GFI" 또는 "FEUM")
+    def model(self, name: str, regime: str):
+        return self.vessels[name][regime]
+
+    def _apply(self, regime: str, summary: dict | None, sign: int):
+        if summary is None:
+            return
+        totals = self._totals[regime]
+        for col in FLEET_TOTAL_COLUMNS[regime]:
+            totals[col] += sign * Fraction(summary[col])
+        self._counts[regime]["vessels"] += sign
+        self._counts[regime]["surplus"] += sign * bool(summary["surplus"])
+
+    # 바뀐 선박만 다시 요약해서 선대 합계 갱신 -> 다시 요약한 선박 수
+    def refresh(self, regime: str) -> int:
+        summaries = self._summaries[regime]
+        changed = 0
+        for name, models in self.vessels.items():
+            model = models[regime]
+            version, summary = summaries.get(name, (None, None))
+            if version == model.version:
+                continue
+            result = model.result()
+            new_summary = result_summary(result)[1] if result is not None else None
+            self._apply(regime, summary, -1)
+            self._apply(regime, new_summary, 1)
+            summaries[name] = (model.version, new_summary)
+            changed += 1
+        return changed
+
+    # 선대 합계 -> 열별 합계 + 계산된 선박 수 / Surplus 선박 수
+    def totals(self, regime: str) -> dict:
+        self.refresh(regime)
+        totals = {col: float(value) for col, value in self._totals[regime].items()}
+        totals.update(self._counts[regime])
+        return totals
+
+    # 선박별 요약 표 (연료가 입력된 선박만, 선박 추가 순서)
+    def summary(self, regime: str, vessel_col: str = "선박") -> pd.DataFrame:
+        self.refresh(regime)
+        rows = [
+            {vessel_col: name, **summary}
+            for name in self.vessels
+            for _, summary in [self._summaries[regime][name]] if summary is not None
+        ]
+        return typed_frame(pd.DataFrame(rows, columns=[vessel_col, *RESULT_DTYPES[regime]]), regime)
@@ -0,0 +1,312 @@
+# FuelEU Maritime 계산 엔진
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from .allocation import fill_groups, group_sum
+from .blends import FEUM_BLEND_COMPONENTS
+from .factors import fill_fuel_defaults, get_factor_table
+from .results import FuelEUResult
+from .trace import stage, traced
+
+# FuelEU 기준값 (2020년 기준 GHG Intensity) 및 탄소세 환산 계수
+FEUM_REFERENCE = 91.16
+PENALTY_EUR_PER_TON = 2400      # VLSFO 환산 톤당 €
+VLSFO_LHV = 41000               # MJ/ton
+
+# 계산 기준 발열량에서 역외 사용량을 50%만 반영하는 연료 (나머지는 100% 반영)
+#OUTSIDE_HALF_FUELS = ["HFO (Grades RME to RMK)", "LFO (Grades RMA to RMD)", "MDO MGO (Grades DMX to DMB)"]
+OUTSIDE_HALF_FUELS = ["HFO (Grades RME to RMK)"]
+
+#FEUM 입력 연료들 합치기 -> 중복 연료 합치기
+@traced("fueleu.get_merged_fueleu_data", rows=lambda fuel_data_list: len(fuel_data_list))
+def get_merged_fueleu_data(fuel_data_list):
+    grouped = defaultdict(lambda: {"역내": 0.0, "역외": 0.0, "LHV": 0.0, "WtW": 0.0})
+    for row in fuel_data_list:
+        key = (row["연료종류"], row["LHV"], row["WtW"])
+        grouped[key]["역내"] += row["역내"]
+        grouped[key]["역외"] += row["역외"]
+        grouped[key]["LHV"] = row["LHV"]
+        grouped[key]["WtW"] = row["WtW"]
+
+    merged_list = []
+    for (fuel_type, lhv, gfi), values in grouped.items():
+        merged_list.append({
+            "연료종류": fuel_type,
+            "LHV": lhv,
+            "WtW": gfi,
+            "역내": values["역내"],
+            "역외": values["역외"]
+        })
+    return merged_list
+
+#FuelEU Martime 계산 함수 -> 입력된 연료 리스트에 혼합연료를 구분하고 시작함
+@traced("fueleu.calculate_fueleu_result", rows=lambda fuel_data, *_: len(fuel_data))
+def calculate_fueleu_result(fuel_data: list[dict],fuel_defaults_FEUM: dict) -> dict:
+    # 혼합연료 분리 (구성 연료 기본값 × 비율, 구성은 blends.FEUM_BLEND_COMPONENTS)
+    expanded_rows = []
+    for row in fuel_data:
+        fuel_type = row["연료종류"]
+        inside = row["역내"]
+        outside = row["역외"]
+
+        parts = FEUM_BLEND_COMPONENTS.get(fuel_type)
+        if parts is None:
+            expanded_rows.append({"연료종류": fuel_type, "LHV": row["LHV"], "WtW": row["WtW"], "역내": inside, "역외": outside})
+            continue
+        for name, ratio in parts:
+            expanded_rows.append({
+                "연료종류": name, "LHV": fuel_defaults_FEUM[name]["LHV"], "WtW": fuel_defaults_FEUM[name]["WtW"],
+                "역내": inside * ratio, "역외": outside * ratio
+            })
+
+    df_expanded = pd.DataFrame(expanded_rows)
+
+    # 벌금 기준 발열량 계산
+    df_expanded["역내_LHV"] = df_expanded["역내"] * df_expanded["LHV"]
+    df_expanded["역외_LHV"] = df_expanded["역외"] * df_expanded["LHV"] * 0.5
+    single = np.zeros(len(df_expanded), dtype=int)   # 선대 일괄 계산과 같은 그룹 합계 / 채워넣기 함수 사용 (그룹 1개)
+    penalty_basis_energy = (group_sum(df_expanded["역내_LHV"].to_numpy(dtype=float), single, 1)
+                            + group_sum(df_expanded["역외_LHV"].to_numpy(dtype=float), single, 1))
+
+    # 계산 기준 발열량 계산
+    # 역외 사용량은 화석연료 50%, 친환경 연료 100% 반영
+    outside_energy = df_expanded["역외"] * df_expanded["LHV"]
+    df_expanded["adj_outside_LHV"] = outside_energy.where(~df_expanded["연료종류"].isin(OUTSIDE_HALF_FUELS), outside_energy * 0.5)
+    df_expanded["total_adj_LHV"] = df_expanded["역내_LHV"] + df_expanded["adj_outside_LHV"]
+
+    # GFI 낮은 순서대로 정렬 후 발열량 채워넣기 (누적 합 + 경계 블록 탐색)
+    with stage("fueleu.fill", rows=len(df_expanded)):
+        order, used, selected = fill_groups(single, df_expanded["WtW"].to_numpy(dtype=float),
+                                            df_expanded["total_adj_LHV"].to_numpy(dtype=float), penalty_basis_energy)
+        df_sorted = df_expanded.iloc[order[selected]]
+        selected_rows = list(zip(df_sorted.to_dict("records"), used[selected].tolist()))
+
+    return summarize_fueleu_fill(df_expanded, selected_rows)
+
+# 발열량 채워넣기 결과 (WtW 순서의 (연료 행, 반영 발열량) 목록)로 결과 표, 평균 GHG Intensity, CB, 탄소세 계산
+@traced("fueleu.summarize_fueleu_fill", rows=lambda df_expanded, selected_rows: len(selected_rows))
+def summarize_fueleu_fill(df_expanded: pd.DataFrame, selected_rows: list) -> dict:
+    penalty_lhv_dict = {}
+    penalty_emission_dict = {}
+
+    for row, used_energy in selected_rows:
+        fuel = row["연료종류"]
+        gfi = row["WtW"]
+        emission = used_energy * gfi / 1_000_000
+        penalty_lhv_dict[fuel] = used_energy
+        penalty_emission_dict[fuel] = emission
+
+    # 결과 계산
+    total_energy = 0
+    total_emission = 0
+    table = []
+    for idx, (row, used_energy) in enumerate(selected_rows, start=1):
+        ghg_intensity = row["WtW"]
+        emission = used_energy * ghg_intensity / 1_000_000
+        table.append({
+            "No.": idx,
+            "연료종류": row["연료종류"],
+            "GHG Intensity (gCO₂eq/MJ)": round(ghg_intensity, 15),
+            "반영 LCV (MJ)": round(used_energy, 15),
+            "배출량 (tCO₂eq)": round(emission, 15)
+        })
+        total_energy += used_energy
+        total_emission += emission
+
+    avg_ghg_intensity = round(total_emission * 1_000_000 / total_energy, 15) if total_energy > 0 else 0
+    standard_now = round(FEUM_REFERENCE * 0.98, 15)
+    cb = round((standard_now - avg_ghg_intensity) * total_energy / 1_000_000, 15)
+    
+    result = {
+        "standard_now": standard_now,
+        "total_energy": total_energy,
+        "total_emission": total_emission
+    }
+
+    if avg_ghg_intensity > standard_now:
+        penalty_eur = round((standard_now - avg_ghg_intensity) * total_energy * PENALTY_EUR_PER_TON / VLSFO_LHV / avg_ghg_intensity, 15)
+    else:
+        penalty_eur = 0
+
+    df_result = pd.DataFrame(table)
+    df_result.loc["합계"] = {
+        "No.": "-",
+        "연료종류": "Total",
+        "GHG Intensity (gCO₂eq/MJ)": f"{avg_ghg_intensity:,.2f}",
+        "반영 LCV (MJ)": f"{total_energy:,.2f}",
+        "배출량 (tCO₂eq)": f"{total_emission:,.2f}"
+    }
+
+    return {
+        "df_result": df_result,
+        "avg_ghg_intensity": avg_ghg_intensity,
+        "standard_now": standard_now,
+        "cb": cb,
+        "penalty_eur": penalty_eur,
+        "total_energy": total_energy,
+        "total_emission": total_emission,
+        "df_expanded": df_expanded,
+        "selected_rows": selected_rows,
+        "penalty_lhv_dict": penalty_lhv_dict,        
+    "penalty_emission_dict": penalty_emission_dict
+    }
+
+# LNG, LPG, B100, B24, B30 역내 사용량 계산
+def calculate_required_green_fuel_inside(result, fuel_type, fuel_defaults_FEUM):
+    std = result["standard_now"]
+    total_energy = result["total_energy"]
+    total_emission = result["total_emission"] * 1_000_000  # tCO₂eq → gCO₂eq
+
+    lhv = fuel_defaults_FEUM[fuel_type]["LHV"]
+    gfi = fuel_defaults_FEUM[fuel_type]["WtW"]
+
+    numerator = total_emission - std * total_energy
+    denominator = lhv * (std - gfi)
+
+    if numerator <= 0 or denominator <= 0:
+        return 0.0
+
+    required_mj = numerator / denominator
+    return round(required_mj, 15)
+
+# 혼합연료 역외 사용량 계산 -> 혼합연료 1톤 역외 사용 시 벌금 기준 발열량은 0.5 × 혼합 LHV만큼 늘어나고
+# 바이오/대체 연료분은 전량 반영, 나머지 (0.5 × 화석연료분 - 0.5 × 바이오분)는 화석연료 WtW로 반영된다고 보고 CB = 0이 되는 양
+def calculate_blend_outside_ton(result, fuel_type, fuel_defaults_FEUM):
+    std = result["standard_now"]
+    pb_energy = result["total_energy"]
+    emission = result["total_emission"] * 1_000_000  # tCO₂eq → gCO₂eq
+
+    if fuel_type not in fuel_defaults_FEUM or fuel_type not in FEUM_BLEND_COMPONENTS:
+        return 0.0
+
+    (fossil, fossil_ratio), *others = FEUM_BLEND_COMPONENTS[fuel_type]
+    fossil_lhv = fuel_defaults_FEUM[fossil]["LHV"]
+    fossil_gfi = fuel_defaults_FEUM[fossil]["WtW"]
+
+    part1 = 0.0
+    other_half_energy = 0.0
+    for name, ratio in others:
+        part1 += ratio * fuel_defaults_FEUM[name]["LHV"] * (std - fuel_defaults_FEUM[name]["WtW"])
+        other_half_energy += ratio * 0.5 * fuel_defaults_FEUM[name]["LHV"]
+
+    numerator = emission - std * pb_energy
+    part2 = (fossil_ratio * 0.5 * fossil_lhv - other_half_energy) * (fossil_gfi - std)
+    denominator = part1 - part2
+
+    if denominator <= 0 or numerator / denominator <= 0:
+        return 0.0
+    return round(numerator / denominator, 4)
+
+# 이전 이름 (B24, B30 전용이던 함수)
+calculate_b24_b30_outside_ton = calculate_blend_outside_ton
+
+# 친환경 연료 역외 사용량 계산 -> 발열량 채워넣기 결과를 WtW 높은 연료부터 차례로 대체하면서
+# 누적 에너지/배출량을 이어받아 계산 (반영 연료 수에 대해 O(n), 연료 개수 제한 없음)
+#  연료 1종만 대체하는 경우는 이전 step1~3 함수와 같은 값, 2종 이상을 대체하는 경우는 값이 다를 수 있음 (많을 수도 적을 수도 있음):
+#  이전 step2/step3는 앞 단계에서 넣은 친환경 연료 배출량과 밀어낸 화석연료 배출량을 누적값에 잘못 (중복) 반영해서
+#  계산한 양을 넣으면 CB가 0에서 벗어났음 (대부분 적자가 남고, 일부는 0을 넘겨 과다 계산)
+#  지금은 단계마다 실제 누적값을 이어받으므로 계산한 양을 넣으면 CB가 0
+def calculate_green_fuel_outside_required(result, fuel_defaults_FEUM, green_fuel_type):
+    std = result["standard_now"]
+
+    # Surplus면 필요량 없음
+    if result["penalty_eur"] >= 0:
+        return 0.0
+
+    green_lhv = fuel_defaults_FEUM[green_fuel_type]["LHV"]
+    green_gfi = fuel_defaults_FEUM[green_fuel_type]["WtW"]
+    # 역외 사용 시 계산 기준 발열량 반영 비율 (HFO 50%, 나머지 100%) -> 벌금 기준 발열량은 50% 반영
+    adj_ratio = 0.5 if green_fuel_type in OUTSIDE_HALF_FUELS else 1.0
+    displaced_ratio = adj_ratio - 0.5  # 친환경 연료 1톤이 밀어내는 기존 연료 발열량 비율
+
+    # 현재 벌금 기준 누적 에너지/배출량
+    cumulative_energy = result["total_energy"]
+    cumulative_emission = result["total_emission"] * 1_000_000  # tCO₂eq → gCO₂eq
+
+    green_total = 0.0
+    for row, used_energy in reversed(result["selected_rows"]):
+        gfi = row["WtW"]
+        if gfi <= green_gfi:
+            break
+        if used_energy <= 0:
+            continue
+
+        # 친환경 연료 1톤 역외 사용 시 CB 변화 (음수여야 대체 효과 있음)
+        denominator = green_lhv * (adj_ratio * green_gfi - displaced_ratio * gfi - std * 0.5)
+        if denominator >= 0:
+            continue
+
+        # 실질값: 남은 적자를 없애는 양
+        actual_green = (std * cumulative_energy - cumulative_emission) / denominator
+        if actual_green <= 0:
+            break
+
+        # 이론값: 해당 연료의 반영 발열량 전량 대체
+        theo_green = used_energy / (green_lhv * displaced_ratio) if displaced_ratio > 0 else float("inf")
+
+        step = min(theo_green, actual_green)
+        green_total += step
+        cumulative_energy += 0.5 * step * green_lhv
+        cumulative_emission += step * green_lhv * (adj_ratio * green_gfi - displaced_ratio * gfi)
+
+        # 적자 해소 시 종료
+        if actual_green <= theo_green:
+            break
+
+    return round(green_total, 15)
+
+# Deficit 상태에서 탄소세 상쇄를 위한 친환경 연료 후보
+GREEN_FUEL_CANDIDATES = [
+    "LNG / LNG Diesel (dual fuel slow speed)",
+    "B24(HFO)", "B24(LFO)",
+    "B30(HFO)", "B30(LFO)",
+    "Bio(Fame)",
+    "LPG - Propane", "LPG - Butane"
+]
+
+# 탄소세 상쇄를 위해 필요한 각 유종별 연료량 (역내 / 역외 톤수)
+@traced("fueleu.calculate_green_fuel_table", rows=lambda result, *_, **__: len(result["selected_rows"]))
+def calculate_green_fuel_table(result, fuel_defaults_FEUM, green_fuels=None) -> pd.DataFrame:
+    green_table = {
+        "연료": [],
+        "역내 톤수": [],
+        "역외 톤수": []
+    }
+    for fuel in green_fuels or GREEN_FUEL_CANDIDATES:
+        in_ton = calculate_required_green_fuel_inside(result, fuel, fuel_defaults_FEUM)
+
+        if fuel in FEUM_BLEND_COMPONENTS:
+            out_ton = calculate_blend_outside_ton(result, fuel, fuel_defaults_FEUM)
+        else:
+            out_ton = calculate_green_fuel_outside_required(result, fuel_defaults_FEUM, fuel)
+
+        green_table["연료"].append(fuel)
+        green_table["역내 톤수"].append(in_ton)
+        green_table["역외 톤수"].append(out_ton)
+
+    return pd.DataFrame(green_table)
+
+# 엔진 진입점 (FuelEU) -> LHV/WtW가 없는 레코드는 기본값으로 채우고 중복 연료를 합쳐서 계산
+def calculate_fueleu(fuel_data: list[dict], fuel_defaults_FEUM: dict | None = None) -> FuelEUResult:
+    if fuel_defaults_FEUM is None:
+        fuel_defaults_FEUM = get_factor_table("FEUM").defaults
+    if not fuel_data:
+        raise ValueError("연료 데이터가 비어 있습니다.")
+
+    records = fill_fuel_defaults(fuel_data, fuel_defaults_FEUM)
+    result = calculate_fueleu_result(get_merged_fueleu_data(records), fuel_defaults_FEUM)
+
+    return FuelEUResult(
+        avg_ghg_intensity=float(result["avg_ghg_intensity"]),
+        standard=float(result["standard_now"]),
+        cb=float(result["cb"]),
+        penalty_eur=float(result["penalty_eur"]),
+        total_energy=float(result["total_energy"]),
+        total_emission=float(result["total_emission"]),
+        table=result["df_result"],
+        penalty_lhv=result["penalty_lhv_dict"],
+        penalty_emission=result["penalty_emission_dict"]
+    )
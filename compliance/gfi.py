@@ -0,0 +1,126 @@
+# GFI 계산 엔진 (IMO 중기조치)
+
+from collections import defaultdict
+
+import pandas as pd
+
+from .blends import GFI_BLEND_COMPONENTS
+from .factors import fill_fuel_defaults, get_factor_table
+from .results import GFIResult
+from .trace import traced
+
+#GFI 계산기용 혼합연료 구분하기 -> 혼합연료는 구성 연료 (blends.GFI_BLEND_COMPONENTS) 기본값 × 비율로 분리
+@traced("gfi.expand_mixed_fuel_GFI", rows=lambda fuel_data, *_: len(fuel_data))
+def expand_mixed_fuel_GFI(fuel_data: list[dict], fuel_defaults_GFI: dict) -> list[dict]:
+    expanded_rows = []
+    for row in fuel_data:
+        parts = GFI_BLEND_COMPONENTS.get(row["연료종류"])
+        if parts is None:
+            expanded_rows.append(row)
+            continue
+        for name, ratio in parts:
+            expanded_rows.append({
+                "연료종류": name,
+                "LHV": fuel_defaults_GFI[name]["LHV"],
+                "WtW": fuel_defaults_GFI[name]["WtW"],
+                "사용량": row["사용량"] * ratio
+            })
+
+    return expanded_rows
+
+#GFI 입력 연료들 합치기 -> 중복 연료 합치기
+@traced("gfi.get_merged_gfi_data", rows=lambda fuel_data_list: len(fuel_data_list))
+def get_merged_gfi_data(fuel_data_list):
+    grouped = defaultdict(lambda: {"사용량": 0.0, "LHV": 0.0, "WtW": 0.0})
+    for row in fuel_data_list:
+        key = (row["연료종류"], row["LHV"], row["WtW"])
+        grouped[key]["사용량"] += row["사용량"]
+        grouped[key]["LHV"] = row["LHV"]
+        grouped[key]["WtW"] = row["WtW"]
+
+    merged_list = []
+    for (fuel_type, lhv, wtw), values in grouped.items():
+        merged_list.append({
+            "연료종류": fuel_type,
+            "LHV": lhv,
+            "WtW": wtw,
+            "사용량": values["사용량"]
+        })
+    return merged_list
+
+# GFI 기준값 (2028년 기준)
+GFI_REFERENCE = 93.3
+BASE_GFI_2028 = GFI_REFERENCE * (1 - 0.04)     # Tier 2 기준
+DIRECT_GFI_2028 = GFI_REFERENCE * (1 - 0.17)   # Tier 1 기준 (17% 감축)
+
+#GFI 계산 함수 -> 입력된 연료 리스트에 혼합연료를 구분하고 Tier, CB, 탄소세까지 계산
+@traced("gfi.calculate_gfi_result", rows=lambda fuel_data, *_: len(fuel_data))
+def calculate_gfi_result(fuel_data: list[dict], fuel_defaults_GFI: dict) -> dict | None:
+    expanded_fuel_data = expand_mixed_fuel_GFI(fuel_data, fuel_defaults_GFI)
+    df = pd.DataFrame(expanded_fuel_data)
+    if df.empty:
+        return None
+
+    df["총배출량(tCO2eq)"] = df["LHV"] * df["WtW"] * df["사용량"] * 1e-6
+    df["총에너지(MJ)"] = df["LHV"] * df["사용량"]
+    return summarize_gfi(df, df["총에너지(MJ)"].sum(), df["총배출량(tCO2eq)"].sum())
+
+# 연료별 표와 총 에너지/배출량으로 GFI, Tier, CB, 탄소세 계산
+@traced("gfi.summarize_gfi", rows=lambda df, *_: len(df))
+def summarize_gfi(df: pd.DataFrame, total_energy: float, total_emission: float) -> dict:
+    gfi = total_emission * 1_000_000 / total_energy
+
+    # 연료별 GFI 계산을 위한 열 추가
+    df["GHG Intensity (gCO₂eq/MJ)"] = df["WtW"]
+    df["총 에너지 (MJ)"] = df["LHV"] * df["사용량"]
+    df["총 배출량 (tCO₂eq)"] = df["LHV"] * df["WtW"] * df["사용량"] * 1e-6
+
+    base_now = BASE_GFI_2028
+    direct_now = DIRECT_GFI_2028
+
+    # Tier 구분 및 CB, Penalty 계산
+    if gfi >= base_now:
+        tier = "Tier 2"
+        cb2 = round(round(gfi - base_now, 4) * round(total_energy, 4) / 1e6, 4)
+        cb1 = round(round(base_now - direct_now, 4) * round(total_energy, 4) / 1e6, 4)
+        cb_total = cb1 + cb2
+        penalty = round(cb1 * 100,0) + round(cb2 * 380, 0)
+    elif gfi >= direct_now:
+        tier = "Tier 1"
+        cb1 = round(round(gfi - direct_now, 4) * round(total_energy, 4) / 1e6, 4)
+        cb_total = cb1
+        penalty = round(cb1 * 100, 0)
+    else:
+        tier = "Surplus"
+        cb_total = round(round(gfi - direct_now, 4) * round(total_energy, 4)/ 1e6, 4)
+        penalty = 0
+
+    return {
+        "df": df,
+        "gfi": gfi,
+        "total_energy": total_energy,
+        "total_emission": total_emission,
+        "tier": tier,
+        "cb_total": cb_total,
+        "penalty": penalty
+    }
+
+# 엔진 진입점 (GFI) -> LHV/WtW가 없는 레코드는 기본값으로 채워서 계산
+def calculate_gfi(fuel_data: list[dict], fuel_defaults_GFI: dict | None = None) -> GFIResult:
+    if fuel_defaults_GFI is None:
+        fuel_defaults_GFI = get_factor_table("GFI").defaults
+
+    records = fill_fuel_defaults(fuel_data, fuel_defaults_GFI)
+    result = calculate_gfi_result(records, fuel_defaults_GFI)
+    if result is None:
+        raise ValueError("연료 데이터가 비어 있습니다.")
+
+    return GFIResult(
+        gfi=float(result["gfi"]),
+        tier=result["tier"],
+        cb=float(result["cb_total"]),
+        penalty=float(result["penalty"]),
+        total_energy=float(result["total_energy"]),
+        total_emission=float(result["total_emission"]),
+        table=result["df"]
+    )
@@ -0,0 +1,315 @@
+# 연료 한 행 추가/수정/삭제 시 결과 증분 갱신 -> 전체 목록을 다시 합치고 정렬하지 않고 바뀐 행만 반영
+#
+# FuelEU: (연료종류, LHV, WtW) 그룹별 합계, 벌금 기준 / 계산 기준 발열량 누적값, WtW 정렬 배분 구조 (SortedAllocation)를 유지
+#  정렬 키 (WtW, 그룹 첫 행 번호, 혼합연료 구성 순서)는 calculate_fueleu_result의 안정 정렬 순서와 같음
+# GFI: 행별 분리 결과와 총 에너지/배출량 누적값을 유지
+# 누적값은 Fraction으로 정확히 더하고 빼므로 추가/수정/삭제 순서와 관계없이 같은 값 (되돌리면 처음 결과와 같음)
+#  -> 매번 전체를 다시 계산하는 함수 (float 순서대로 합산)와는 부동소수점 오차 범위에서 같음 (끝자리는 다를 수 있음)
+# cache (ResultCache)를 넘기면 결과와 memo 값을 디스크에도 저장 -> 같은 연료 목록을 다시 열면 계산 없이 바로 반환
+
+from bisect import bisect_left, insort
+from fractions import Fraction
+
+import pandas as pd
+
+from .allocation import SortedAllocation
+from .cache import result_key
+from .factors import get_factor_table
+from .fueleu import FEUM_BLEND_COMPONENTS, OUTSIDE_HALF_FUELS, get_merged_fueleu_data, summarize_fueleu_fill
+from .gfi import expand_mixed_fuel_GFI, summarize_gfi
+from .trace import traced
+
+EXPANDED_COLUMNS = ["연료종류", "LHV", "WtW", "역내", "역외", "역내_LHV", "역외_LHV", "adj_outside_LHV", "total_adj_LHV"]
+
+# 행 목록 + 결과 캐시 공통 부분 (rows는 UI의 연료 목록으로 그대로 사용)
+class _IncrementalModel:
+    regime = None
+
+    def __init__(self, fuel_defaults: dict, fuel_data=None, cache=None):
+        self.fuel_defaults = fuel_defaults
+        self.cache = cache
+        self.rows = []
+        self.version = 0
+        self._ids = []
+        self._next_id = 0
+        self._cache = {}
+        for row in fuel_data or []:
+            self.add(row)
+
+    def _changed(self):
+        self.version += 1
+        self._cache = {}
+
+    # 연료 행 추가
+    @traced("incremental.add")
+    def add(self, row: dict):
+        row_id = self._next_id
+        self._attach(row_id, row)  # 계산할 수 없는 행이면 목록을 바꾸기 전에 예외
+        self._next_id += 1
+        self.rows.append(row)
+        self._ids.append(row_id)
+        self._changed()
+
+    # 여러 행 한 번에 추가 (파일 일괄 입력) -> 계산할 수 없는 행이 있으면 아무 행도 추가하지 않음
+    @traced("incremental.add_many", rows=lambda self, rows: len(rows))
+    def add_many(self, rows):
+        rows = list(rows)
+        ids = list(range(self._next_id, self._next_id + len(rows)))
+        self._attach_many(list(zip(ids, rows)))
+        self._next_id += len(rows)
+        self.rows.extend(rows)
+        self._ids.extend(ids)
+        self._changed()
+
+    def _attach_many(self, pairs):
+        attached = []
+        try:
+            for row_id, row in pairs:
+                self._attach(row_id, row)
+                attached.append((row_id, row))
+        except Exception:
+            for row_id, row in reversed(attached):
+                self._detach(row_id, row)
+            raise
+
+    # index 행 수정 (행 번호는 그대로 유지 -> 목록 순서 보존)
+    @traced("incremental.update")
+    def update(self, index: int, row: dict):
+        row_id, old_row = self._ids[index], self.rows[index]
+        self._detach(row_id, old_row)
+        try:
+            self._attach(row_id, row)
+        except Exception:
+            self._attach(row_id, old_row)
+            raise
+        self.rows[index] = row
+        self._changed()
+
+    # 선택한 행 삭제
+    @traced("incremental.remove")
+    def remove(self, indices):
+        for index in sorted(set(indices), reverse=True):
+            self._detach(self._ids[index], self.rows[index])
+            del self.rows[index]
+            del self._ids[index]
+        if not self.rows:
+            self._reset_totals()
+        self._changed()
+
+    # 모든 행 삭제 (rows 리스트 객체는 그대로 유지)
+    def clear(self):
+        self.rows.clear()
+        self._ids.clear()
+        self._reset_totals()
+        self._changed()
+
+    # 결과에서 파생되는 값 (Pooling 표, 친환경 연료 표 등)을 다음 변경 전까지 재사용
+    #  디스크 캐시를 쓰면 name이 캐시 키에 들어가므로 같은 name에는 같은 계산을 넘길 것
+    def memo(self, name: str, func):
+        if name not in self._cache:
+            self._cache[name] = self._stored(name, lambda: func(self.result()))
+        return self._cache[name]
+
+    # 현재 목록의 계산 결과 (연료가 없으면 None)
+    def result(self):
+        if "result" not in self._cache:
+            self._cache["result"] = self._stored("result", self._result)
+        return self._cache["result"]
+
+    def _stored(self, name: str, compute):
+        if self.cache is None or not self.rows:
+            return compute()
+        key = result_key(f"{self.kind}.{name}", self._key_rows(), self.regime, self.fuel_defaults)
+        return self.cache.get_or_compute(key, compute)
+
+# FuelEU 증분 계산 모델 -> result()는 calculate_fueleu_result(get_merged_fueleu_data(rows))와 부동소수점 오차 범위에서 같은 결과
+#  (CB 상대 오차 5e-14 이하, selected_rows는 끝의 반영 발열량 0 블록 유무가 다를 수 있음)
+class IncrementalFuelEU(_IncrementalModel):
+    regime, kind = "FEUM", "fueleu"
+
+    def __init__(self, fuel_defaults_FEUM: dict | None = None, fuel_data=None, cache=None):
+        self._groups = {}   # (연료종류, LHV, WtW) -> {"ids": 행 번호, "rows": 행, "keys": 정렬 키}
+        self._order = []    # WtW 정렬 키 목록
+        self._blocks = []   # 정렬 키 순서의 분리된 연료 행
+        self._allocation = SortedAllocation([], [])
+        self._reset_totals()
+        super().__init__(fuel_defaults_FEUM if fuel_defaults_FEUM is not None else get_factor_table("FEUM").defaults, fuel_data, cache)
+
+    def _reset_totals(self):
+        self._inside = Fraction(0)
+        self._outside = Fraction(0)
+        self._adjusted = Fraction(0)
+
+    # 벌금 기준 발열량 합계 (역내 합계 + 역외 50% 합계, calculate_fueleu_result와 같은 방식)
+    @property
+    def penalty_basis_energy(self) -> float:
+        return float(self._inside) + float(self._outside)
+
+    # 계산 기준 발열량 합계
+    @property
+    def adjusted_energy(self) -> float:
+        return float(self._adjusted)
+
+    def _attach(self, row_id, row):
+        key = (row["연료종류"], row["LHV"], row["WtW"])
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {"ids": [], "rows": {}, "keys": []}
+        else:
+            self._drop_blocks(group)
+        insort(group["ids"], row_id)
+        group["rows"][row_id] = row
+        self._put_blocks(key, group)
+
+    # 여러 행 추가 -> 그룹별로 분리 블록을 한 번만 다시 만듦 (같은 연료 수백 행도 그룹 합계는 한 번만 계산)
+    def _attach_many(self, pairs):
+        touched = {}
+        try:
+            for row_id, row in pairs:
+                key = (row["연료종류"], row["LHV"], row["WtW"])
+                group = self._groups.get(key)
+                if group is None:
+                    group = self._groups[key] = {"ids": [], "rows": {}, "keys": []}
+                if key not in touched:
+                    self._drop_blocks(group)
+                    touched[key] = group
+                insort(group["ids"], row_id)
+                group["rows"][row_id] = row
+            for key, group in touched.items():
+                self._put_blocks(key, group)
+        except Exception:
+            # 추가 전 상태로 되돌림
+            added = {row_id for row_id, _ in pairs}
+            for key, group in touched.items():
+                self._drop_blocks(group)
+                group["ids"] = [row_id for row_id in group["ids"] if row_id not in added]
+                group["rows"] = {row_id: row for row_id, row in group["rows"].items() if row_id not in added}
+                if group["ids"]:
+                    self._put_blocks(key, group)
+                else:
+                    del self._groups[key]
+            raise
+
+    def _detach(self, row_id, row):
+        key = (row["연료종류"], row["LHV"], row["WtW"])
+        group = self._groups[key]
+        self._drop_blocks(group)
+        group["ids"].remove(row_id)
+        del group["rows"][row_id]
+        if group["ids"]:
+            self._put_blocks(key, group)
+        else:
+            del self._groups[key]
+
+    # 그룹 합계를 목록 순서대로 다시 더하고 (get_merged_fueleu_data와 같은 합산 순서) 분리 블록을 정렬 목록에 삽입
+    def _put_blocks(self, key, group):
+        fuel_type, lhv, wtw = key
+        inside = outside = 0.0
+        for row_id in group["ids"]:
+            inside += group["rows"][row_id]["역내"]
+            outside += group["rows"][row_id]["역외"]
+
+        if fuel_type in FEUM_BLEND_COMPONENTS:
+            parts = [(name, self.fuel_defaults[name]["LHV"], self.fuel_defaults[name]["WtW"], inside * ratio, outside * ratio)
+                     for name, ratio in FEUM_BLEND_COMPONENTS[fuel_type]]
+        else:
+            parts = [(fuel_type, lhv, wtw, inside, outside)]
+
+        group["keys"] = []
+        for i, (name, part_lhv, part_wtw, part_inside, part_outside) in enumerate(parts):
+            inside_lhv = part_inside * part_lhv
+            outside_lhv = part_outside * part_lhv * 0.5
+            adj_outside = part_outside * part_lhv * 0.5 if name in OUTSIDE_HALF_FUELS else part_outside * part_lhv
+            block = {
+                "연료종류": name, "LHV": part_lhv, "WtW": part_wtw, "역내": part_inside, "역외": part_outside,
+                "역내_LHV": inside_lhv, "역외_LHV": outside_lhv,
+                "adj_outside_LHV": adj_outside, "total_adj_LHV": inside_lhv + adj_outside
+            }
+            sort_key = (part_wtw, group["ids"][0], i)
+            position = bisect_left(self._order, sort_key)
+            self._order.insert(position, sort_key)
+            self._blocks.insert(position, block)
+            self._allocation.insert(part_wtw, block["total_adj_LHV"], position=position)
+            group["keys"].append(sort_key)
+            self._inside += Fraction(inside_lhv)
+            self._outside += Fraction(outside_lhv)
+            self._adjusted += Fraction(block["total_adj_LHV"])
+
+    def _drop_blocks(self, group):
+        for sort_key in group["keys"]:
+            position = bisect_left(self._order, sort_key)
+            del self._order[position]
+            block = self._blocks.pop(position)
+            self._allocation.remove(position)
+            self._inside -= Fraction(block["역내_LHV"])
+            self._outside -= Fraction(block["역외_LHV"])
+            self._adjusted -= Fraction(block["total_adj_LHV"])
+        group["keys"] = []
+
+    # 캐시 키 연료 목록 (calculate_fueleu_result 입력과 같은 병합 목록)
+    def _key_rows(self):
+        return get_merged_fueleu_data(self.rows)
+
+    # 발열량 채워넣기 -> [(분리된 연료 행, 반영 발열량)]
+    def fill(self) -> list:
+        used = self._allocation.fill(self.penalty_basis_energy)
+        return list(zip(self._blocks[:len(used)], used.tolist()))
+
+    # 반영 발열량 합계 (MJ)와 배출량 합계 (tCO₂eq)
+    def totals(self) -> tuple[float, float]:
+        energy, emission = self._allocation.totals(self.penalty_basis_energy)
+        return energy, emission / 1_000_000
+
+    @traced("incremental.fueleu_result", rows=lambda self: len(self.rows))
+    def _result(self) -> dict | None:
+        if not self._order:
+            return None
+        # 분리 표는 그룹 첫 행 순서 (get_merged_fueleu_data 순서)
+        expanded = [self._blocks[i] for i in sorted(range(len(self._order)), key=lambda i: self._order[i][1:])]
+        df_expanded = pd.DataFrame(expanded, columns=EXPANDED_COLUMNS)
+        return summarize_fueleu_fill(df_expanded, self.fill())
+
+# GFI 증분 계산 모델 -> result()는 calculate_gfi_result(rows)와 부동소수점 오차 범위에서 같은 결과
+class IncrementalGFI(_IncrementalModel):
+    regime, kind = "GFI", "gfi"
+
+    def __init__(self, fuel_defaults_GFI: dict | None = None, fuel_data=None, cache=None):
+        self._parts = {}    # 행 번호 -> 분리된 연료 행
+        self._reset_totals()
+        super().__init__(fuel_defaults_GFI if fuel_defaults_GFI is not None else get_factor_table("GFI").defaults, fuel_data, cache)
+
+    def _reset_totals(self):
+        self._energy = Fraction(0)
+        self._emission = Fraction(0)
+
+    @property
+    def total_energy(self) -> float:
+        return float(self._energy)
+
+    @property
+    def total_emission(self) -> float:
+        return float(self._emission)
+
+    def _key_rows(self):
+        return self.rows
+
+    def _attach(self, row_id, row):
+        parts = expand_mixed_fuel_GFI([row], self.fuel_defaults)
+        self._parts[row_id] = parts
+        for part in parts:
+            self._energy += Fraction(part["LHV"] * part["사용량"])
+            self._emission += Fraction(part["LHV"] * part["WtW"] * part["사용량"] * 1e-6)
+
+    def _detach(self, row_id, row):
+        for part in self._parts.pop(row_id):
+            self._energy -= Fraction(part["LHV"] * part["사용량"])
+            self._emission -= Fraction(part["LHV"] * part["WtW"] * part["사용량"] * 1e-6)
+
+    @traced("incremental.gfi_result", rows=lambda self: len(self.rows))
+    def _result(self) -> dict | None:
+        if not self.rows:
+            return None
+        df = pd.DataFrame([part for row_id in self._ids for part in self._parts[row_id]])
+        df["총배출량(tCO2eq)"] = df["LHV"] * df["WtW"] * df["사용량"] * 1e-6
+        df["총에너지(MJ)"] = df["LHV"] * df["사용량"]
+        return summarize_gfi(df, self.total_energy, self.total_emission)
@@ -0,0 +1,289 @@
+# 운항/벙커 로그 스트리밍 수집 -> CSV/Parquet을 청크 단위로 읽어 선박/기간/연료별 사용량을 누적
+# 누적 표 크기는 (선박 × 기간 × 연료) 수에만 비례하므로 파일 전체를 메모리에 올리지 않음
+# 계산기 일괄 입력용 연료 목록 파일 (CSV / 엑셀) 읽기 + 검증 (read_fuel_sheet)
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .batch import calculate_fueleu_batch
+from .factors import FactorTable, get_factor_table
+
+# 로그에 자주 쓰이는 연료 이름 -> 계산기 연료 이름 (대소문자/공백 무시)
+FEUM_NAME_ALIASES = {
+    "HFO": "HFO (Grades RME to RMK)",
+    "HSFO": "HFO (Grades RME to RMK)",
+    "IFO": "HFO (Grades RME to RMK)",
+    "IFO380": "HFO (Grades RME to RMK)",
+    "LFO": "LFO (Grades RMA to RMD)",
+    "VLSFO": "LFO (Grades RMA to RMD)",
+    "ULSFO": "LFO (Grades RMA to RMD)",
+    "MGO": "MDO MGO (Grades DMX to DMB)",
+    "MDO": "MDO MGO (Grades DMX to DMB)",
+    "LSMGO": "MDO MGO (Grades DMX to DMB)",
+    "LNG": "LNG / LNG Otto (dual fuel medium speed)",
+    "FAME": "Bio(Fame)",
+    "B100": "Bio(Fame)",
+    "HVO": "Hydrotreated Vegetable Oil (waste cooking oil)",
+    "METHANOL": "Methanol (natural gas)",
+    "LPG": "LPG - Propane",
+    "B24(HSFO)": "B24(HFO)",
+    "B30(HSFO)": "B30(HFO)",
+    "B24(VLSFO)": "B24(LFO)",
+    "B30(VLSFO)": "B30(LFO)",
+    "B10(HSFO)": "B10(HFO)",
+    "B50(HSFO)": "B50(HFO)",
+    "B10(VLSFO)": "B10(LFO)",
+    "B50(VLSFO)": "B50(LFO)",
+    "HVO30(VLSFO)": "HVO30(LFO)",
+    "HVO50(VLSFO)": "HVO50(LFO)",
+}
+
+GFI_NAME_ALIASES = {
+    "HFO": "HSFO",
+    "IFO": "HSFO",
+    "IFO380": "HSFO",
+    "HFO (GRADES RME TO RMK)": "HSFO",
+    "LFO": "VLSFO",
+    "ULSFO": "VLSFO",
+    "LFO (GRADES RMA TO RMD)": "VLSFO",
+    "MGO": "LSMGO",
+    "MDO": "LSMGO",
+    "MDO MGO (GRADES DMX TO DMB)": "LSMGO",
+    "LNG": "LNG / LNG Otto (dual fuel medium speed)",
+    "FAME": "Bio(Fame)",
+    "B100": "Bio(Fame)",
+    "LPG": "LPG(Propane)",
+    "B24(HFO)": "B24(HSFO)",
+    "B30(HFO)": "B30(HSFO)",
+    "B24(LFO)": "B24(VLSFO)",
+    "B30(LFO)": "B30(VLSFO)",
+    "B10(HFO)": "B10(HSFO)",
+    "B50(HFO)": "B50(HSFO)",
+    "B10(LFO)": "B10(VLSFO)",
+    "B50(LFO)": "B50(VLSFO)",
+}
+
+NAME_ALIASES = {"FEUM": FEUM_NAME_ALIASES, "GFI": GFI_NAME_ALIASES}
+
+def _normalize(name) -> str:
+    return " ".join(str(name).split()).upper()
+
+# 정규화된 이름 -> 계수표 연료 이름 (계수표 이름이 별칭보다 우선)
+def build_name_map(table: FactorTable, aliases: dict | None = None) -> dict:
+    name_map = {_normalize(alias): name for alias, name in (aliases or {}).items() if name in table}
+    name_map.update({_normalize(name): name for name in table.names})
+    return name_map
+
+# 연료 이름 열을 계수표 이름으로 변환 (모르는 이름은 NaN) -> 고유 이름 단위로만 변환해서 청크 크기와 무관하게 빠름
+def map_fuel_names(names: pd.Series, name_map: dict) -> pd.Series:
+    codes, uniques = pd.factorize(names)
+    mapped = np.array([name_map.get(_normalize(u)) for u in uniques] + [None], dtype=object)
+    return pd.Series(mapped[codes], index=names.index, dtype=object)  # 빈 이름(-1)은 마지막 None
+
+# CSV / Parquet 파일을 청크 단위로 읽기 (Parquet은 pyarrow 필요), columns를 주면 파일에 있는 열 중 해당 열만 읽음
+def iter_log_chunks(path, columns=None, chunksize: int = 200_000):
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet 파일을 읽으려면 pyarrow가 필요합니다 (pip install pyarrow)") from e
+        parquet = pq.ParquetFile(path)
+        if columns is not None:
+            columns = [name for name in parquet.schema_arrow.names if name in columns]
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        usecols = None if columns is None else (lambda name: name in columns)
+        yield from pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+
+# 선박/기간/연료별 사용량 누적기 -> get_merged_fueleu_data와 같은 기준 (연료종류, LHV, WtW)으로 합침
+class FuelLogAccumulator:
+    def __init__(self, regime: str = "FEUM", vessel_col: str = "선박", period_col: str = "기간",
+                 fuel_col: str = "연료종류", inside_col: str = "역내", outside_col: str = "역외",
+                 amount_col: str = "사용량", date_col: str | None = None, freq: str = "Y",
+                 aliases: dict | None = None, fuel_defaults: dict | None = None, errors: str = "raise"):
+        if regime not in NAME_ALIASES:
+            raise ValueError(f"알 수 없는 규제: {regime}")
+        if errors not in ("raise", "skip"):
+            raise ValueError("errors는 'raise' 또는 'skip'이어야 합니다.")
+
+        self.regime = regime
+        self.table = get_factor_table(regime) if fuel_defaults is None else FactorTable.from_defaults(fuel_defaults, regime)
+        self.name_map = build_name_map(self.table, {**NAME_ALIASES[regime], **(aliases or {})})
+        self.vessel_col, self.period_col, self.fuel_col = vessel_col, period_col, fuel_col
+        self.inside_col, self.outside_col, self.amount_col = inside_col, outside_col, amount_col
+        self.date_col, self.freq, self.errors = date_col, freq, errors
+
+        self.values = ["역내", "역외"] if regime == "FEUM" else ["사용량"]
+        self.keys = ["선박", "기간", "연료종류", "LHV", "WtW"]
+        self.merged = pd.DataFrame(columns=self.keys + self.values)
+        self.rows = 0
+        self.unknown = {}  # errors="skip"일 때 건너뛴 연료 이름별 행 수
+
+    # 로그 파일에서 읽을 열
+    @property
+    def columns(self) -> set:
+        columns = {self.vessel_col, self.fuel_col, self.inside_col, self.outside_col, self.amount_col, "LHV", "WtW"}
+        columns.add(self.date_col if self.date_col is not None else self.period_col)
+        return columns
+
+    # 청크 하나를 표준 열 (선박, 기간, 연료종류, LHV, WtW, 사용량 열)로 변환
+    def _standardize(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.date_col is not None:
+            period = pd.to_datetime(chunk[self.date_col]).dt.to_period(self.freq).astype(str)
+        else:
+            period = chunk[self.period_col]
+
+        fuel = map_fuel_names(chunk[self.fuel_col], self.name_map)
+        unknown = fuel.isna()
+        if unknown.any():
+            names = chunk.loc[unknown, self.fuel_col].astype(str).value_counts()
+            if self.errors == "raise":
+                raise ValueError(f"알 수 없는 연료 종류: {', '.join(names.index)}")
+            for name, count in names.items():
+                self.unknown[name] = self.unknown.get(name, 0) + int(count)
+
+        idx = self.table.lookup(fuel.where(~unknown, ""))
+        data = pd.DataFrame({"선박": chunk[self.vessel_col], "기간": period, "연료종류": fuel})
+        for col, values in [("LHV", self.table.lhv), ("WtW", self.table.wtw)]:
+            defaults = pd.Series(np.where(idx >= 0, values[np.clip(idx, 0, None)], np.nan), index=chunk.index)
+            data[col] = chunk[col].astype(float).fillna(defaults) if col in chunk.columns else defaults
+
+        if self.regime == "FEUM":
+            data["역내"] = chunk[self.inside_col].astype(float).fillna(0.0)
+            data["역외"] = chunk[self.outside_col].astype(float).fillna(0.0)
+        elif self.amount_col in chunk.columns:
+            data["사용량"] = chunk[self.amount_col].astype(float).fillna(0.0)
+        else:
+            data["사용량"] = chunk[self.inside_col].astype(float).fillna(0.0) + chunk[self.outside_col].astype(float).fillna(0.0)
+        return data[~unknown.to_numpy()]
+
+    # 청크 누적 -> 청크를 먼저 합친 뒤 누적 표와 다시 합침
+    def add(self, chunk: pd.DataFrame) -> "FuelLogAccumulator":
+        self.rows += len(chunk)
+        data = self._standardize(chunk)
+        if data.empty:
+            return self
+        part = data.groupby(self.keys, sort=False, dropna=False)[self.values].sum().reset_index()
+        merged = pd.concat([self.merged, part], ignore_index=True) if len(self.merged) else part
+        self.merged = merged.groupby(self.keys, sort=False, dropna=False)[self.values].sum().reset_index()
+        return self
+
+    # 선박/기간별 에너지, 배출량 합계
+    #  FuelEU: 발열량 채워넣기까지 적용한 calculate_fueleu_batch 결과
+    #  GFI: 총 에너지, 총 배출량, 평균 GFI
+    def summary(self) -> pd.DataFrame:
+        if self.regime == "FEUM":
+            return calculate_fueleu_batch(self.merged, self.table, vessel_col="선박", period_col="기간")
+
+        df = self.merged.assign(
+            total_energy=self.merged["LHV"] * self.merged["사용량"],
+            total_emission=self.merged["LHV"] * self.merged["WtW"] * self.merged["사용량"] * 1e-6
+        )
+        totals = df.groupby(["선박", "기간"], sort=True)[["total_energy", "total_emission"]].sum().reset_index()
+        totals["gfi"] = totals["total_emission"] * 1_000_000 / totals["total_energy"]
+        return totals
+
+# 로그 파일 하나를 스트리밍으로 읽어 누적기 반환
+def ingest_fuel_log(path, regime: str = "FEUM", chunksize: int = 200_000, **options) -> FuelLogAccumulator:
+    accumulator = FuelLogAccumulator(regime, **options)
+    for chunk in iter_log_chunks(path, accumulator.columns, chunksize):
+        accumulator.add(chunk)
+    return accumulator
+
+# 연료 목록 파일 (계산기 일괄 입력) 열 -> 계산기 한 행 형식
+SHEET_COLUMNS = {"FEUM": ["연료종류", "LHV", "WtW", "역내", "역외"], "GFI": ["연료종류", "LHV", "WtW", "사용량"]}
+
+# 파일 머리글 별칭 (대소문자/공백 무시) -> 계산기 열 이름
+SHEET_HEADER_ALIASES = {
+    "연료": "연료종류",
+    "연료 종류": "연료종류",
+    "FUEL": "연료종류",
+    "FUEL TYPE": "연료종류",
+    "LCV": "LHV",
+    "GFI": "WtW",
+    "GHG INTENSITY": "WtW",
+    "WTW": "WtW",
+    "사용량 (톤)": "사용량",
+    "AMOUNT": "사용량",
+    "역내 사용량": "역내",
+    "역내 사용량 (톤)": "역내",
+    "INSIDE": "역내",
+    "역외 사용량": "역외",
+    "역외 사용량 (톤)": "역외",
+    "OUTSIDE": "역외",
+}
+
+# 업로드 파일 (경로 또는 파일 객체) -> 표, CSV는 UTF-8 (BOM 포함) 또는 CP949 (한글 엑셀 저장)
+def _read_sheet(source) -> pd.DataFrame:
+    name = str(getattr(source, "name", source))
+    data = source.read() if hasattr(source, "read") else Path(source).read_bytes()
+    if Path(name).suffix.lower() in (".xlsx", ".xlsm", ".xls"):
+        try:
+            return pd.read_excel(io.BytesIO(data))
+        except ImportError as e:
+            raise ImportError("엑셀 파일을 읽으려면 openpyxl이 필요합니다 (pip install openpyxl)") from e
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return pd.read_csv(io.BytesIO(data), encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("CSV 파일 인코딩을 읽을 수 없습니다 (UTF-8 또는 CP949로 저장해 주세요).")
+
+# 연료 목록 파일 읽기 + 검증 -> (계산기 행 리스트, 건너뛴 행 표)
+#  연료 이름은 계수표 이름 또는 별칭, LHV/WtW를 비우면 기본값, 사용량은 0 이상 숫자 (FuelEU 역내/역외는 비우면 0)
+#  검증은 열 단위로 한 번에 처리 (행 수와 무관하게 연료 이름 변환은 고유 이름 수만큼)
+#  건너뛴 행 표: 행 (파일 기준 행 번호, 머리글 = 1), 연료종류, 오류
+def read_fuel_sheet(source, regime: str = "FEUM", aliases: dict | None = None,
+                    fuel_defaults: dict | None = None) -> tuple[list[dict], pd.DataFrame]:
+    if regime not in SHEET_COLUMNS:
+        raise ValueError(f"알 수 없는 규제: {regime}")
+    df = _read_sheet(source)
+    header_map = {_normalize(alias): col for alias, col in SHEET_HEADER_ALIASES.items()}
+    header_map.update({_normalize(col): col for col in SHEET_COLUMNS[regime]})
+    df = df.rename(columns=lambda col: header_map.get(_normalize(col), col))
+
+    amount_cols = SHEET_COLUMNS[regime][3:]
+    required = ["연료종류"] + (["사용량"] if regime == "GFI" else [])
+    missing = [col for col in required if col not in df.columns]
+    if regime == "FEUM" and not any(col in df.columns for col in amount_cols):
+        missing.append("역내 / 역외")
+    if missing:
+        raise ValueError(f"필수 열이 없습니다: {', '.join(missing)}")
+    df = df.dropna(how="all")  # 원래 행 번호 유지 (건너뛴 행 표의 행 번호)
+
+    table = get_factor_table(regime) if fuel_defaults is None else FactorTable.from_defaults(fuel_defaults, regime)
+    fuel = map_fuel_names(df["연료종류"], build_name_map(table, {**NAME_ALIASES[regime], **(aliases or {})}))
+    idx = table.lookup(fuel.fillna(""))
+    safe = np.clip(idx, 0, None)
+
+    rows = pd.DataFrame({"연료종류": fuel})
+    invalid = pd.Series(False, index=df.index)
+    for col, defaults in [("LHV", table.lhv), ("WtW", table.wtw)]:
+        given = pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(np.nan, index=df.index)
+        if col in df.columns:
+            invalid |= given.isna() & df[col].notna()
+        rows[col] = given.fillna(pd.Series(np.where(idx >= 0, defaults[safe], np.nan), index=df.index))
+    negative = pd.Series(False, index=df.index)
+    for col in amount_cols:
+        given = pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(np.nan, index=df.index)
+        if col in df.columns:
+            invalid |= given.isna() & df[col].notna()
+        negative |= given < 0
+        rows[col] = given.fillna(0.0) if regime == "FEUM" else given
+    invalid |= rows[amount_cols].isna().any(axis=1)
+    negative |= (rows[["LHV", "WtW"]] < 0).any(axis=1)
+
+    reasons = np.select(
+        [fuel.isna().to_numpy(), invalid.to_numpy(), negative.to_numpy()],
+        ["알 수 없는 연료 종류", "숫자가 아닌 값 또는 빈 사용량", "음수 값"],
+        ""
+    )
+    bad = reasons != ""
+    errors = pd.DataFrame({"행": df.index[bad] + 2, "연료종류": df.loc[bad, "연료종류"].astype(str), "오류": reasons[bad]})
+    records = rows.loc[~bad, SHEET_COLUMNS[regime]].astype({col: float for col in SHEET_COLUMNS[regime][1:]})
+    return records.to_dict("records"), errors.reset_index(drop=True)
@@ -0,0 +1,211 @@
+# 최소 비용 연료 조합 계획 (선형계획법) -> FuelEU 탄소세 0 (및 선택적으로 GFI 목표) 달성을 위한 친환경 연료 구매량
+#
+# FuelEU 모델은 기존 계산과 동일
+#  - 역내 사용: 1톤당 CB 변화 = LHV × (기준값 - WtW)  (calculate_required_green_fuel_inside와 동일)
+#  - 역외 사용: 벌금 기준 발열량은 50%만 늘고 계산 기준 발열량은 100% 반영되므로,
+#    발열량 채워넣기에서 WtW가 높은 반영 연료를 밀어냄 (calculate_green_fuel_outside_required와 동일)
+#    -> 밀어내는 반영 연료별로 변수를 두고, 각 반영 연료의 반영 발열량을 상한으로 둠
+#  - 혼합연료 역외 사용: 자신의 화석연료 성분이 한계 연료가 됨 (calculate_blend_outside_ton과 동일)
+# GFI 모델은 사용 위치와 관계없이 1톤당 LHV × (목표 GFI - WtW)
+
+import numpy as np
+import pandas as pd
+
+from .factors import get_factor_table
+from .fueleu import FEUM_BLEND_COMPONENTS, OUTSIDE_HALF_FUELS
+
+# 변수 하나 = (선박, 연료, 위치, 밀어내는 반영 연료)
+def _build_columns(vessel, result, candidate, fuel_defaults_FEUM):
+    fuel = candidate["연료종류"]
+    std = result["standard_now"]
+    lhv = fuel_defaults_FEUM[fuel]["LHV"]
+    wtw = fuel_defaults_FEUM[fuel]["WtW"]
+    columns = []
+
+    # 역내 사용
+    columns.append({"위치": "역내", "gain": lhv * (std - wtw), "cap_row": None, "cap_use": 0.0})
+
+    # 역외 사용
+    if fuel in FEUM_BLEND_COMPONENTS:
+        (fossil, fossil_ratio), *others = FEUM_BLEND_COMPONENTS[fuel]
+        fossil_lhv = fuel_defaults_FEUM[fossil]["LHV"]
+        fossil_gfi = fuel_defaults_FEUM[fossil]["WtW"]
+        part1 = 0.0
+        other_half_energy = 0.0
+        for name, ratio in others:
+            part1 += ratio * fuel_defaults_FEUM[name]["LHV"] * (std - fuel_defaults_FEUM[name]["WtW"])
+            other_half_energy += ratio * 0.5 * fuel_defaults_FEUM[name]["LHV"]
+        part2 = (fossil_ratio * 0.5 * fossil_lhv - other_half_energy) * (fossil_gfi - std)
+        columns.append({"위치": "역외", "gain": part1 - part2, "cap_row": None, "cap_use": 0.0})
+    else:
+        adj_ratio = 0.5 if fuel in OUTSIDE_HALF_FUELS else 1.0
+        displaced_ratio = adj_ratio - 0.5
+        if displaced_ratio == 0:
+            columns.append({"위치": "역외", "gain": 0.5 * lhv * (std - wtw), "cap_row": None, "cap_use": 0.0})
+        else:
+            for k, (row, used_energy) in enumerate(result["selected_rows"]):
+                if row["WtW"] <= wtw or used_energy <= 0:
+                    continue
+                gain = lhv * (0.5 * std - adj_ratio * wtw + displaced_ratio * row["WtW"])
+                columns.append({
+                    "위치": "역외",
+                    "gain": gain,
+                    "cap_row": (vessel, k),
+                    "cap_use": lhv * displaced_ratio,
+                    "cap": used_energy
+                })
+    return columns
+
+# 선대 최소 비용 연료 조합 계산
+#  results: {선박: calculate_fueleu_result 결과}
+#  candidates: [{"연료종류", "가격"(€/톤), "한도"(선대 총 가용량, 톤), "역내한도", "역외한도", "GFI연료"}]
+#  gfi_results / gfi_target: {선박: calculate_gfi_result 결과} 와 목표 GFI(gCO₂eq/MJ)를 주면 GFI 조건도 함께 적용
+def plan_fleet_fuel_mix(results: dict, candidates: list[dict], fuel_defaults_FEUM: dict | None = None,
+                        cb_target: float = 0.0, gfi_results: dict | None = None, gfi_target: float | None = None,
+                        fuel_defaults_GFI: dict | None = None) -> dict:
+    # scipy는 계획 기능에서만 필요하므로 여기서 import
+    try:
+        from scipy.optimize import linprog
+        from scipy.sparse import coo_matrix, vstack
+    except ImportError as e:
+        raise ImportError("연료 조합 계획에는 scipy가 필요합니다 (pip install scipy)") from e
+
+    if fuel_defaults_FEUM is None:
+        fuel_defaults_FEUM = get_factor_table("FEUM").defaults
+    use_gfi = gfi_results is not None and gfi_target is not None
+    if use_gfi and fuel_defaults_GFI is None:
+        fuel_defaults_GFI = get_factor_table("GFI").defaults
+
+    vessels = list(results)
+    vessel_row = {vessel: i for i, vessel in enumerate(vessels)}
+    n_vessels = len(vessels)
+
+    # 변수 목록 구성
+    var_vessel, var_fuel, var_place, var_cost = [], [], [], []
+    gain_rows, gain_cols, gain_vals = [], [], []
+    gfi_rows, gfi_cols, gfi_vals = [], [], []
+    cap_keys, cap_limits = {}, []
+    cap_rows, cap_cols, cap_vals = [], [], []
+
+    for vessel in vessels:
+        result = results[vessel]
+        for c, candidate in enumerate(candidates):
+            fuel = candidate["연료종류"]
+            if fuel not in fuel_defaults_FEUM:
+                raise ValueError(f"알 수 없는 연료 종류: {fuel}")
+            if use_gfi:
+                gfi_fuel = candidate.get("GFI연료", fuel)
+                if gfi_fuel not in fuel_defaults_GFI:
+                    raise ValueError(f"GFI 계수가 없는 연료: {fuel} (GFI연료 지정 필요)")
+                gfi_gain = fuel_defaults_GFI[gfi_fuel]["LHV"] * (gfi_target - fuel_defaults_GFI[gfi_fuel]["WtW"])
+
+            for column in _build_columns(vessel, result, candidate, fuel_defaults_FEUM):
+                j = len(var_vessel)
+                var_vessel.append(vessel)
+                var_fuel.append(c)
+                var_place.append(column["위치"])
+                var_cost.append(float(candidate["가격"]))
+
+                gain_rows.append(vessel_row[vessel])
+                gain_cols.append(j)
+                gain_vals.append(column["gain"])
+
+                if use_gfi:
+                    gfi_rows.append(vessel_row[vessel])
+                    gfi_cols.append(j)
+                    gfi_vals.append(gfi_gain)
+
+                # 밀어내는 반영 연료의 반영 발열량 상한
+                if column["cap_row"] is not None:
+                    if column["cap_row"] not in cap_keys:
+                        cap_keys[column["cap_row"]] = len(cap_limits)
+                        cap_limits.append(column["cap"])
+                    cap_rows.append(cap_keys[column["cap_row"]])
+                    cap_cols.append(j)
+                    cap_vals.append(column["cap_use"])
+
+    n_vars = len(var_vessel)
+    var_fuel = np.array(var_fuel, dtype=int)
+    var_place = np.array(var_place)
+    cost = np.array(var_cost, dtype=float)
+
+    # 부등식 조건 A_ub x <= b_ub
+    blocks, bounds_ub = [], []
+
+    # FuelEU: CB + Σ gain x >= 목표  ->  -Σ gain x <= CB - 목표 (gCO₂eq)
+    cb_now = np.array([results[vessel]["cb"] for vessel in vessels], dtype=float)
+    blocks.append(coo_matrix((-np.array(gain_vals), (gain_rows, gain_cols)), shape=(n_vessels, n_vars)))
+    bounds_ub.append((cb_now - cb_target) * 1_000_000)
+
+    # GFI: Σ gfi_gain x >= 배출량 - 목표 × 에너지
+    if use_gfi:
+        gfi_need = np.array([
+            gfi_results[vessel]["total_emission"] * 1_000_000 - gfi_target * gfi_results[vessel]["total_energy"]
+            for vessel in vessels
+        ], dtype=float)
+        blocks.append(coo_matrix((-np.array(gfi_vals), (gfi_rows, gfi_cols)), shape=(n_vessels, n_vars)))
+        bounds_ub.append(-gfi_need)
+
+    # 반영 연료별 밀어낼 수 있는 발열량 상한
+    if cap_limits:
+        blocks.append(coo_matrix((cap_vals, (cap_rows, cap_cols)), shape=(len(cap_limits), n_vars)))
+        bounds_ub.append(np.array(cap_limits, dtype=float))
+
+    # 연료별 가용량 (선대 합계)
+    limit_rows, limit_cols, limit_b = [], [], []
+    for c, candidate in enumerate(candidates):
+        for key, mask in [("한도", np.ones(n_vars, dtype=bool)),
+                          ("역내한도", var_place == "역내"),
+                          ("역외한도", var_place == "역외")]:
+            if candidate.get(key) is None:
+                continue
+            cols = np.flatnonzero((var_fuel == c) & mask)
+            limit_rows.extend([len(limit_b)] * len(cols))
+            limit_cols.extend(cols)
+            limit_b.append(float(candidate[key]))
+    if limit_b:
+        blocks.append(coo_matrix((np.ones(len(limit_rows)), (limit_rows, limit_cols)), shape=(len(limit_b), n_vars)))
+        bounds_ub.append(np.array(limit_b))
+
+    A_ub = vstack(blocks).tocsr()
+    b_ub = np.concatenate(bounds_ub)
+
+    solution = linprog(cost, A_ub=A_ub, b_ub=b_ub, bounds=(0, None), method="highs")
+    if solution.status == 2:
+        raise ValueError("주어진 가용량으로는 목표를 달성할 수 없습니다.")
+    if not solution.success:
+        raise RuntimeError(f"연료 조합 계산 실패: {solution.message}")
+
+    # 선박/연료별 역내·역외 톤수 합치기
+    tons = np.where(solution.x > 1e-9, solution.x, 0.0)
+    df_vars = pd.DataFrame({
+        "선박": var_vessel,
+        "연료": [candidates[c]["연료종류"] for c in var_fuel],
+        "위치": var_place,
+        "톤수": tons,
+        "비용 (€)": tons * cost
+    })
+    df_plan = df_vars.pivot_table(index=["선박", "연료"], columns="위치", values="톤수", aggfunc="sum", fill_value=0.0, sort=False)
+    df_plan = df_plan.reindex(columns=["역내", "역외"], fill_value=0.0).rename(columns={"역내": "역내 톤수", "역외": "역외 톤수"})
+    df_plan["비용 (€)"] = df_vars.groupby(["선박", "연료"], sort=False)["비용 (€)"].sum()
+    df_plan = df_plan.reset_index()
+    df_plan.columns.name = None
+    df_plan = df_plan[(df_plan["역내 톤수"] > 0) | (df_plan["역외 톤수"] > 0)].reset_index(drop=True)
+
+    cb_gain = np.bincount(gain_rows, weights=np.array(gain_vals) * tons[gain_cols], minlength=n_vessels) / 1_000_000
+    return {
+        "df_plan": df_plan,
+        "total_cost": float(tons @ cost),
+        "cb_after": dict(zip(vessels, (cb_now + cb_gain).tolist()))
+    }
+
+# 단일 선박 최소 비용 연료 조합 계산
+def plan_fuel_mix(result: dict, candidates: list[dict], fuel_defaults_FEUM: dict | None = None,
+                  cb_target: float = 0.0, gfi_result: dict | None = None, gfi_target: float | None = None,
+                  fuel_defaults_GFI: dict | None = None) -> dict:
+    plan = plan_fleet_fuel_mix(
+        {"-": result}, candidates, fuel_defaults_FEUM, cb_target,
+        {"-": gfi_result} if gfi_result is not None else None, gfi_target, fuel_defaults_GFI
+    )
+    df_plan = plan["df_plan"].drop(columns="선박")
+    return {"df_plan": df_plan, "total_cost": plan["total_cost"], "cb_after": plan["cb_after"]["-"]}
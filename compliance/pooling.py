@@ -0,0 +1,150 @@
+# FuelEU 선대 Pooling -> Surplus 선박의 CB를 Deficit 선박에 배분해서 선대 전체 탄소세를 최소화
+#
+# Deficit 선박의 탄소세 = CB × 1e6 × 2400 / (41000 × 평균 GHG Intensity) 이므로
+# CB 1톤당 탄소세는 평균 GHG Intensity가 낮은 선박일수록 큼
+# -> 탄소세율 높은 Deficit 선박부터 Surplus를 채우는 것이 최적 (분할 가능한 배낭 문제라 그리디가 LP 최적해와 같음)
+
+import numpy as np
+import pandas as pd
+
+from .allocation import SortedAllocation
+from .fueleu import FEUM_BLEND_COMPONENTS, OUTSIDE_HALF_FUELS, PENALTY_EUR_PER_TON, VLSFO_LHV
+from .trace import traced
+
+# CB 1 tCO₂eq당 탄소세 (€)
+def penalty_rate(avg_ghg_intensity):
+    return 1_000_000 * PENALTY_EUR_PER_TON / (VLSFO_LHV * np.asarray(avg_ghg_intensity, dtype=float))
+
+# Surplus 가치 (€) -> 평균 GHG Intensity가 avg인 Deficit 선박에 넘겼을 때 줄어드는 탄소세
+def surplus_value(cb, avg_ghg_intensity):
+    return np.asarray(cb, dtype=float) * penalty_rate(avg_ghg_intensity)
+
+# 선대 Pooling 배분 계산
+#  fleet: 선박별 cb, avg_ghg_intensity 열이 있는 표 (calculate_fueleu_batch 결과 그대로 사용 가능)
+#  반환: 선박별 Pooling 전후 CB/탄소세 표, 공여→수혜 이전 내역 표, 전후 총 탄소세
+@traced("pooling.optimize_pooling", rows=lambda fleet, *_, **__: len(fleet))
+def optimize_pooling(fleet: pd.DataFrame, vessel_col: str = "선박") -> dict:
+    vessels = fleet[vessel_col].to_numpy()
+    cb = fleet["cb"].to_numpy(dtype=float)
+    avg = fleet["avg_ghg_intensity"].to_numpy(dtype=float)
+
+    donors = np.flatnonzero(cb > 0)
+    receivers = np.flatnonzero(cb < 0)
+    with np.errstate(divide="ignore"):
+        rate = np.where(cb < 0, penalty_rate(avg), 0.0)
+
+    # 공여 선박은 Surplus 큰 순서, 수혜 선박은 탄소세율 높은 순서
+    donors = donors[np.argsort(-cb[donors], kind="stable")]
+    receivers = receivers[np.argsort(-rate[receivers], kind="stable")]
+
+    supply = np.cumsum(cb[donors])
+    demand = np.cumsum(-cb[receivers])
+    pooled = min(supply[-1] if len(supply) else 0.0, demand[-1] if len(demand) else 0.0)
+
+    # 누적 공급/수요의 경계점으로 구간을 나누면 구간마다 (공여, 수혜) 한 쌍 -> 두 포인터 병합과 같은 결과
+    points = np.unique(np.concatenate([[0.0], supply[supply < pooled], demand[demand < pooled], [pooled]]))
+    amounts = np.diff(points)
+    mids = points[:-1] + amounts / 2
+    donor_idx = donors[np.searchsorted(supply, mids)] if len(amounts) else np.zeros(0, dtype=int)
+    receiver_idx = receivers[np.searchsorted(demand, mids)] if len(amounts) else np.zeros(0, dtype=int)
+
+    keep = amounts > 0
+    amounts, donor_idx, receiver_idx = amounts[keep], donor_idx[keep], receiver_idx[keep]
+    df_transfer = pd.DataFrame({
+        "공여 선박": vessels[donor_idx],
+        "수혜 선박": vessels[receiver_idx],
+        "이전 CB (tCO₂eq)": amounts,
+        "절감 탄소세 (€)": amounts * rate[receiver_idx]
+    })
+
+    moved = np.bincount(receiver_idx, weights=amounts, minlength=len(cb)) - np.bincount(donor_idx, weights=amounts, minlength=len(cb))
+    cb_after = cb + moved
+    penalty_before = np.where(cb < 0, cb * rate, 0.0)
+    penalty_after = np.where(cb_after < 0, cb_after * rate, 0.0)
+
+    df_vessel = pd.DataFrame({
+        vessel_col: vessels,
+        "cb": cb,
+        "cb_after": cb_after,
+        "penalty_eur": penalty_before,
+        "penalty_eur_after": penalty_after
+    })
+    return {
+        "df_vessel": df_vessel,
+        "df_transfer": df_transfer,
+        "pool_cb": float(cb.sum()),
+        "total_penalty_before": float(penalty_before.sum()),
+        "total_penalty_after": float(penalty_after.sum())
+    }
+
+# 단일 선박 Pooling 가능량 계산에 쓰는 기본 후보 연료
+POOLING_CANDIDATES = ["HFO (Grades RME to RMK)", "LFO (Grades RMA to RMD)", "MDO MGO (Grades DMX to DMB)"]
+
+# 추가 연료 1톤당 (WtW, 계산 기준 발열량) 블록 목록과 벌금 기준 발열량 증가분
+def _added_blocks(fuel_type, fuel_defaults_FEUM, place):
+    components = FEUM_BLEND_COMPONENTS.get(fuel_type, [(fuel_type, 1.0)])
+
+    wtw, size, pbe_per_ton = [], [], 0.0
+    for name, ratio in components:
+        energy = ratio * fuel_defaults_FEUM[name]["LHV"]
+        if place == "역내":
+            adj, pbe_ratio = 1.0, 1.0
+        else:
+            adj, pbe_ratio = (0.5 if name in OUTSIDE_HALF_FUELS else 1.0), 0.5
+        wtw.append(fuel_defaults_FEUM[name]["WtW"])
+        size.append(energy * adj)
+        pbe_per_ton += energy * pbe_ratio
+    return np.array(wtw), np.array(size), pbe_per_ton
+
+# Surplus 선박의 Pooling 가능량 (톤) -> 해당 연료를 더 써도 CB가 0 이상으로 남는 최대 사용량
+#  발열량 채워넣기에서 각 블록 크기와 벌금 기준 발열량이 모두 사용량 x에 대해 1차식이므로 CB(x)는 구간별 1차식
+#  -> 블록 경계가 바뀌는 x를 모두 구해 한 번에 CB를 계산하고, 처음 0 아래로 내려가는 구간에서 정확한 해를 구함
+@traced("pooling.calculate_pooling_capacity", rows=lambda result, *_, **__: len(result["df_expanded"]))
+def calculate_pooling_capacity(result: dict, fuel_type: str, fuel_defaults_FEUM: dict, place: str = "역내") -> float:
+    std = result["standard_now"]
+    df = result["df_expanded"]
+    pbe0 = df["역내_LHV"].sum() + df["역외_LHV"].sum()
+    new_wtw, new_size, pbe_per_ton = _added_blocks(fuel_type, fuel_defaults_FEUM, place)
+
+    # 기존 블록 (크기 고정) + 추가 블록 (크기 = 톤당 크기 × x), WtW 낮은 순서 (같은 값이면 기존 블록 먼저)
+    allocation = SortedAllocation(
+        np.concatenate([df["WtW"].to_numpy(dtype=float), new_wtw]),
+        np.concatenate([df["total_adj_LHV"].to_numpy(dtype=float), np.zeros(len(new_wtw))]),
+        np.concatenate([np.zeros(len(df)), new_size])
+    )
+
+    def cb_at(x):
+        energy, emission = allocation.totals(pbe0 + pbe_per_ton * x, x)
+        return std * energy - emission
+
+    # 채워넣기 경계 (pbe0 + p·x = 블록 시작/끝)가 되는 x
+    fixed_bounds = np.concatenate([allocation.start, allocation.end])
+    per_ton_bounds = np.concatenate([allocation.per_unit_start, allocation.per_unit_end])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bounds = (fixed_bounds - pbe0) / (pbe_per_ton - per_ton_bounds)
+    bounds = np.unique(bounds[np.isfinite(bounds) & (bounds > 0)])
+    points = np.concatenate([[0.0], bounds, [bounds[-1] * 2 + 1 if len(bounds) else 1.0]])
+    values = np.array([cb_at(x) for x in points])
+
+    if values[0] <= 0:
+        return 0.0
+    below = np.flatnonzero(values[1:] < 0)
+    if len(below) == 0:
+        # 마지막 구간에서도 CB가 줄지 않으면 한도 없음
+        return float("inf") if values[-1] >= values[-2] else float(points[-1] + values[-1] * (points[-1] - points[-2]) / (values[-2] - values[-1]))
+    b = below[0] + 1
+    a = b - 1
+    return float(points[a] + values[a] * (points[b] - points[a]) / (values[a] - values[b]))
+
+# 후보 연료별 역내/역외 Pooling 가능량 표
+@traced("pooling.calculate_pooling_table", rows=lambda result, *_, **__: len(result["df_expanded"]))
+def calculate_pooling_table(result: dict, fuel_defaults_FEUM: dict, pooling_fuels=None) -> pd.DataFrame:
+    if pooling_fuels is None:
+        pooling_fuels = POOLING_CANDIDATES
+
+    table = {"연료": [], "역내 톤수": [], "역외 톤수": []}
+    for fuel in pooling_fuels:
+        table["연료"].append(fuel)
+        table["역내 톤수"].append(round(calculate_pooling_capacity(result, fuel, fuel_defaults_FEUM, "역내"), 4))
+        table["역외 톤수"].append(round(calculate_pooling_capacity(result, fuel, fuel_defaults_FEUM, "역외"), 4))
+    return pd.DataFrame(table)
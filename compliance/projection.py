@@ -0,0 +1,234 @@
+# 연도별 Compliance 전망 (GFI, FuelEU) -> 연도 배열 단위로 한 번에 계산하고, 표시용 문자열 변환은 UI에서 처리
+
+import numpy as np
+import pandas as pd
+
+from .batch import calculate_fueleu_batch
+from .factors import FactorTable, get_factor_table
+from .fueleu import FEUM_REFERENCE, PENALTY_EUR_PER_TON, VLSFO_LHV
+from .gfi import GFI_REFERENCE
+from .trace import traced
+
+PROJECTION_YEARS = range(2025, 2051)
+
+# FuelEU 기준 GHG Intensity 감축률 (시작 연도, 감축률) -> 다음 구간 시작 전까지 적용
+FEUM_REDUCTION_STEPS = [
+    (2025, 0.02),
+    (2030, 0.06),
+    (2035, 0.145),
+    (2040, 0.31),
+    (2045, 0.62),
+    (2050, 0.80),
+]
+
+# GFI 연도별 기준 (2028 ~ 2035), Base = Tier 2 기준 비율, Direct = Tier 1 감축률
+GFI_YEARS = list(range(2028, 2036))
+GFI_BASE_RATIOS = [0.96, 0.94, 0.92, 0.876, 0.832, 0.788, 0.744, 0.7]
+GFI_DIRECT_REDUCTIONS = [0.17, 0.19, 0.21, 0.254, 0.298, 0.342, 0.386, 0.43]
+GFI_TIER1_PRICE = 100   # $/tCO₂eq
+GFI_TIER2_PRICE = 380   # $/tCO₂eq
+
+# 연도별 FuelEU 기준 GHG Intensity
+def fueleu_standard(years, digits: int = 4) -> np.ndarray:
+    years = np.asarray(years)
+    starts = np.array([start for start, _ in FEUM_REDUCTION_STEPS])
+    reductions = np.array([reduction for _, reduction in FEUM_REDUCTION_STEPS])
+    step = np.clip(np.searchsorted(starts, years, side="right") - 1, 0, None)
+    return np.round(FEUM_REFERENCE * (1 - reductions[step]), digits)
+
+# FuelEU 기준 구간 목록 [(시작 연도, 끝 연도, 기준 GHG Intensity)]
+def fueleu_standard_steps(last_year: int = 2050, digits: int = 4) -> list[tuple[int, int, float]]:
+    starts = [start for start, _ in FEUM_REDUCTION_STEPS]
+    ends = [start - 1 for start in starts[1:]] + [last_year]
+    return [(start, end, float(value)) for start, end, value in zip(starts, ends, fueleu_standard(starts, digits))]
+
+# 연도별 GFI Base(Tier 2) / Direct(Tier 1) 기준 -> 2028 ~ 2035 밖의 연도는 NaN
+def gfi_targets(years) -> tuple[np.ndarray, np.ndarray]:
+    years = np.asarray(years)
+    base = np.full(years.shape, np.nan)
+    direct = np.full(years.shape, np.nan)
+    in_range = (years >= GFI_YEARS[0]) & (years <= GFI_YEARS[-1])
+    idx = years[in_range] - GFI_YEARS[0]
+    base[in_range] = np.round(GFI_REFERENCE * np.array(GFI_BASE_RATIOS), 5)[idx]
+    direct[in_range] = (GFI_REFERENCE * (1 - np.array(GFI_DIRECT_REDUCTIONS)))[idx]
+    return base, direct
+
+# 연도별 GFI Compliance 계산 (gfi, total_energy, years는 같은 길이의 배열 또는 스칼라)
+#  tier1_price / tier2_price: Tier 1 / Tier 2 CB 1톤당 탄소세 ($, 기본 100 / 380)
+@traced("projection.calculate_gfi_projection", rows=lambda gfi, total_energy, years, *_, **__: np.size(years))
+def calculate_gfi_projection(gfi, total_energy, years, tier1_price: float = GFI_TIER1_PRICE,
+                             tier2_price: float = GFI_TIER2_PRICE) -> pd.DataFrame:
+    years = np.asarray(years)
+    gfi, total_energy = np.broadcast_to(gfi, years.shape).astype(float), np.broadcast_to(total_energy, years.shape).astype(float)
+    base, direct = gfi_targets(years)
+    energy = np.round(total_energy, 4)
+
+    defined = ~np.isnan(base)
+    tier2 = defined & (gfi >= base)
+    tier1 = defined & ~tier2 & (gfi >= direct)
+    surplus = defined & ~tier2 & ~tier1
+
+    cb1 = np.where(tier2, np.round(np.round(base - direct, 4) * energy / 1e6, 4),
+                   np.where(tier1, np.round(np.round(gfi - direct, 4) * energy / 1e6, 4), 0.0))
+    cb2 = np.where(tier2, np.round(np.round(gfi - base, 4) * energy / 1e6, 4), 0.0)
+    p1 = np.round(cb1 * tier1_price, 0)
+    p2 = np.round(cb2 * tier2_price, 0)
+
+    df = pd.DataFrame({
+        "연도": years,
+        "GFI (gCO₂eq/MJ)": gfi,
+        "Base GFI": base,
+        "Direct GFI": direct,
+        "Tier": np.select([tier2, tier1, surplus], ["Tier 2", "Tier 1", "Surplus"], "-"),
+        "Tier 1 CB (tCO₂eq)": cb1,
+        "Tier 2 CB (tCO₂eq)": cb2,
+        "Tier 1 탄소세 ($)": p1,
+        "Tier 2 탄소세 ($)": p2,
+        "총 탄소세 ($)": p1 + p2,
+        "Surplus (tCO₂eq)": np.where(surplus, np.round(np.round(direct - gfi, 4) * energy / 1e6, 4), 0.0)
+    })
+    numeric = df.columns.drop(["연도", "GFI (gCO₂eq/MJ)", "Base GFI", "Direct GFI", "Tier"])
+    df.loc[~defined, numeric] = np.nan
+    return df
+
+# Surplus 연도별로 Tier 2 탄소세를 상쇄할 수 있는 유종별 연료량 (톤) -> calculate_gfi_projection 결과의 Surplus 행
+#  유종 GFI가 그 해 Base GFI보다 높을 때만 계산 (아니면 0), 톤은 소수 둘째 자리 반올림
+def calculate_gfi_surplus_offset(df_projection: pd.DataFrame, fuel_defaults_GFI: dict) -> pd.DataFrame:
+    rows = df_projection[df_projection["Tier"] == "Surplus"]
+    fuels = list(fuel_defaults_GFI)
+    wtw = np.array([fuel_defaults_GFI[fuel]["WtW"] for fuel in fuels], dtype=float)
+    lhv = np.array([fuel_defaults_GFI[fuel]["LHV"] for fuel in fuels], dtype=float)
+
+    delta = wtw[None, :] - rows["Base GFI"].to_numpy(dtype=float)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tonnage = rows["Surplus (tCO₂eq)"].to_numpy(dtype=float)[:, None] * 1_000_000 / delta / lhv[None, :]
+    tonnage = np.round(np.where(delta > 0, tonnage, 0.0), 2)
+
+    df = pd.DataFrame(tonnage, columns=fuels)
+    df.insert(0, "연도", rows["연도"].astype(int).to_numpy())
+    return df
+
+# 연도별 FuelEU Compliance 계산 (avg_ghg_intensity, total_energy, years는 같은 길이의 배열 또는 스칼라)
+@traced("projection.calculate_fueleu_projection", rows=lambda avg_ghg_intensity, total_energy, years: np.size(years))
+def calculate_fueleu_projection(avg_ghg_intensity, total_energy, years) -> pd.DataFrame:
+    years = np.asarray(years)
+    avg = np.broadcast_to(avg_ghg_intensity, years.shape).astype(float)
+    total_energy = np.broadcast_to(total_energy, years.shape).astype(float)
+    standard = fueleu_standard(years)
+
+    delta = standard - avg
+    deficit = delta < 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        penalty = np.where(deficit, delta * total_energy * PENALTY_EUR_PER_TON / VLSFO_LHV / avg, 0.0)
+    cb = delta * total_energy / 1_000_000
+
+    return pd.DataFrame({
+        "연도": years,
+        "기준 GHG Intensity": standard,
+        "평균 GHG Intensity": avg,
+        "Tier": np.where(deficit, "Deficit", "Surplus"),
+        "CB (tCO₂eq)": cb,
+        "탄소세 (€)": penalty,
+        "Surplus (tCO₂eq)": np.where(deficit, 0.0, cb)
+    })
+
+# 연도별 소비 프로필을 전망 연도에 맞추기 -> 각 연도에는 그 이전 가장 최근 프로필 연도의 결과를 적용
+def _align_years(totals: pd.DataFrame, years, vessel_col: str) -> pd.DataFrame:
+    grid = pd.DataFrame({vessel_col: totals[vessel_col].unique()}).merge(
+        pd.DataFrame({"연도": np.asarray(years, dtype=int)}), how="cross"
+    ).sort_values("연도", kind="stable")
+    totals = totals.assign(연도=totals["연도"].astype(int)).sort_values("연도", kind="stable")
+    aligned = pd.merge_asof(grid, totals, on="연도", by=vessel_col, direction="backward")
+    return aligned.dropna(subset=["total_energy"]).sort_values([vessel_col, "연도"], kind="stable").reset_index(drop=True)
+
+# 소비 프로필 표 정리 -> 리스트면 모든 연도에 같은 프로필 적용, 선박 열이 없으면 단일 선박
+def _profile_frame(profile, years, vessel_col: str) -> tuple[pd.DataFrame, bool]:
+    df = pd.DataFrame(profile).copy()
+    single = vessel_col not in df.columns
+    if single:
+        df[vessel_col] = "-"
+    if "연도" not in df.columns:
+        df["연도"] = min(years)
+    return df, single
+
+# FuelEU 연도별 전망 -> 프로필 (선박, 연도, 연료종류, 역내, 역외)
+@traced("projection.project_fueleu", rows=lambda profile, *_, **__: len(profile))
+def project_fueleu(profile, years=PROJECTION_YEARS, fuel_defaults_FEUM=None, vessel_col: str = "선박") -> pd.DataFrame:
+    df, single = _profile_frame(profile, years, vessel_col)
+    totals = calculate_fueleu_batch(df, fuel_defaults_FEUM, vessel_col=vessel_col, period_col="연도")
+    totals = totals[[vessel_col, "연도", "total_energy", "avg_ghg_intensity"]]
+
+    aligned = _align_years(totals, years, vessel_col)
+    projection = calculate_fueleu_projection(aligned["avg_ghg_intensity"], aligned["total_energy"], aligned["연도"])
+    projection.insert(0, vessel_col, aligned[vessel_col])
+    return projection.drop(columns=vessel_col) if single else projection
+
+# GFI 선박/기간별 총 에너지, 총 배출량, GFI (열 단위 표: 연료종류, 사용량[, LHV, WtW])
+# 혼합연료는 기본값의 혼합 LHV/WtW로 바로 계산 (분리 후 합계와 같은 값)
+def _gfi_totals(df: pd.DataFrame, fuel_defaults_GFI, keys: list[str]) -> pd.DataFrame:
+    if fuel_defaults_GFI is None:
+        table = get_factor_table("GFI")
+    elif isinstance(fuel_defaults_GFI, FactorTable):
+        table = fuel_defaults_GFI
+    else:
+        table = FactorTable.from_defaults(fuel_defaults_GFI, "GFI")
+    idx = table.lookup(df["연료종류"])
+    lhv = np.where(idx >= 0, table.lhv[idx], np.nan)
+    wtw = np.where(idx >= 0, table.wtw[idx], np.nan)
+    if "LHV" in df.columns:
+        lhv = df["LHV"].astype(float).fillna(pd.Series(lhv, index=df.index)).to_numpy()
+    if "WtW" in df.columns:
+        wtw = df["WtW"].astype(float).fillna(pd.Series(wtw, index=df.index)).to_numpy()
+
+    unknown = df.loc[np.isnan(lhv) | np.isnan(wtw), "연료종류"].unique()
+    if len(unknown) > 0:
+        raise ValueError(f"알 수 없는 연료 종류: {', '.join(map(str, unknown))}")
+
+    amount = df["사용량"].to_numpy(dtype=float)
+    df = df.assign(total_energy=lhv * amount, total_emission=lhv * wtw * amount * 1e-6)
+    totals = df.groupby(keys, sort=True)[["total_energy", "total_emission"]].sum().reset_index()
+    totals["gfi"] = totals["total_emission"] * 1_000_000 / totals["total_energy"]
+    return totals
+
+# GFI 선대 일괄 계산 -> 열 단위 표 (선박, 연료종류, 사용량[, LHV, WtW])를 받아 선박별 결과 반환
+#  결과 열은 calculate_gfi_result 요약과 같음 (gfi, tier, cb, penalty, total_energy, total_emission, surplus)
+#  year: Tier 기준 연도 (기본 2028, calculate_gfi_result와 같은 기준)
+@traced("projection.calculate_gfi_batch", rows=lambda df, *_, **__: len(df))
+def calculate_gfi_batch(df: pd.DataFrame, fuel_defaults_GFI=None, vessel_col: str = "선박", year: int = GFI_YEARS[0],
+                        tier1_price: float = GFI_TIER1_PRICE, tier2_price: float = GFI_TIER2_PRICE) -> pd.DataFrame:
+    totals = _gfi_totals(df, fuel_defaults_GFI, [vessel_col])
+    projection = calculate_gfi_projection(totals["gfi"].to_numpy(), totals["total_energy"].to_numpy(),
+                                          np.full(len(totals), year), tier1_price, tier2_price)
+    # Surplus CB는 음수 (calculate_gfi_result와 같은 부호)
+    cb = projection["Tier 1 CB (tCO₂eq)"] + projection["Tier 2 CB (tCO₂eq)"] - projection["Surplus (tCO₂eq)"]
+    return pd.DataFrame({
+        vessel_col: totals[vessel_col],
+        "gfi": totals["gfi"],
+        "tier": projection["Tier"],
+        "cb": cb,
+        "penalty": projection["총 탄소세 ($)"],
+        "total_energy": totals["total_energy"],
+        "total_emission": totals["total_emission"],
+        "surplus": projection["Tier"] == "Surplus"
+    })
+
+# GFI 연도별 전망 -> 프로필 (선박, 연도, 연료종류, 사용량)
+@traced("projection.project_gfi", rows=lambda profile, *_, **__: len(profile))
+def project_gfi(profile, years=PROJECTION_YEARS, fuel_defaults_GFI=None, vessel_col: str = "선박",
+                tier1_price: float = GFI_TIER1_PRICE, tier2_price: float = GFI_TIER2_PRICE) -> pd.DataFrame:
+    df, single = _profile_frame(profile, years, vessel_col)
+    totals = _gfi_totals(df, fuel_defaults_GFI, [vessel_col, "연도"])
+
+    aligned = _align_years(totals, years, vessel_col)
+    projection = calculate_gfi_projection(aligned["gfi"].to_numpy(), aligned["total_energy"].to_numpy(), aligned["연도"].to_numpy(),
+                                          tier1_price, tier2_price)
+    projection.insert(0, vessel_col, aligned[vessel_col])
+    return projection.drop(columns=vessel_col) if single else projection
+
+# GFI + FuelEU 연도별 전망
+def project_compliance(gfi_profile=None, fueleu_profile=None, years=PROJECTION_YEARS,
+                       fuel_defaults_GFI=None, fuel_defaults_FEUM=None, vessel_col: str = "선박") -> dict:
+    return {
+        "GFI": project_gfi(gfi_profile, years, fuel_defaults_GFI, vessel_col) if gfi_profile is not None else None,
+        "FuelEU": project_fueleu(fueleu_profile, years, fuel_defaults_FEUM, vessel_col) if fueleu_profile is not None else None
+    }
@@ -0,0 +1,39 @@
+# 계산 결과 타입 (UI 없이 엔진을 호출하는 배치/서비스용)
+
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+
+# GFI 계산 결과 (IMO 중기조치, 2028년 기준)
+@dataclass(frozen=True)
+class GFIResult:
+    gfi: float                # 평균 GFI (gCO₂eq/MJ)
+    tier: str                 # "Tier 2" / "Tier 1" / "Surplus"
+    cb: float                 # Compliance Balance (tCO₂eq), Surplus는 음수
+    penalty: float            # 예상 탄소세 ($)
+    total_energy: float       # 총 에너지 (MJ)
+    total_emission: float     # 총 배출량 (tCO₂eq)
+    table: pd.DataFrame = field(repr=False)  # 혼합연료 분리 후 연료별 계산표
+
+    @property
+    def surplus(self) -> bool:
+        return self.tier == "Surplus"
+
+
+# FuelEU Maritime 계산 결과
+@dataclass(frozen=True)
+class FuelEUResult:
+    avg_ghg_intensity: float  # 평균 GHG Intensity (gCO₂eq/MJ)
+    standard: float           # 기준 GHG Intensity (gCO₂eq/MJ)
+    cb: float                 # Compliance Balance (tCO₂eq), Deficit는 음수
+    penalty_eur: float        # 예상 탄소세 (€), Deficit는 음수
+    total_energy: float       # 벌금 기준 발열량 (MJ)
+    total_emission: float     # 반영 배출량 (tCO₂eq)
+    table: pd.DataFrame = field(repr=False)  # 반영 연료별 계산표 (합계 행 포함)
+    penalty_lhv: dict = field(default_factory=dict, repr=False)
+    penalty_emission: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def surplus(self) -> bool:
+        return self.avg_ghg_intensity < self.standard
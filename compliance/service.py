@@ -0,0 +1,298 @@
+# 계산 HTTP 서비스 (표준 라이브러리 http.server) -> 다른 시스템 (항차 계획, 벙커 구매 등)에서 계산 함수를 HTTP로 호출
+#
+#  python -m compliance.service --port 8765
+#  curl -s localhost:8765/fueleu -d '{"fuel_data": [{"연료종류": "HFO (Grades RME to RMK)", "역내": 1000, "역외": 500}]}'
+#
+#  GET  /health            상태, 계수표 버전
+#  POST /fueleu            FuelEU 결과 (calculate_fueleu_result)
+#  POST /fueleu/green      Deficit -> 친환경 연료 필요량 표, Surplus -> Pooling 가능량 표
+#  POST /gfi               GFI Tier, CB, 탄소세 (calculate_gfi_result)
+#  POST /gfi/projection    연도별 GFI Compliance + Surplus 상쇄 연료량
+#
+# 요청 본문 (JSON): {"fuel_data": [연료 행, ...]} -> 선박 1척 (연료별 계산표 포함)
+#                  {"vessels": {선박: [연료 행, ...], ...}} -> 한 요청에 여러 척 (선대 일괄 계산 경로로 한 번에 계산)
+#  연료 행은 UI 입력과 같은 키 (연료종류, 역내/역외 또는 사용량, LHV/WtW는 없으면 기본값)
+#
+# 서버 프로세스가 계속 떠 있으므로 계수표는 시작할 때 한 번 만들고 (get_factor_table) 요청마다 그대로 사용,
+# 선박 1척 결과는 디스크 결과 캐시 (cached_fueleu_result / cached_gfi_result)도 UI와 함께 사용
+
+import argparse
+import json
+import math
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .batch import calculate_fueleu_batch
+from .cache import ResultCache, cached_fueleu_result, cached_gfi_result, default_cache
+from .export import result_summary, typed_frame
+from .factors import get_factor_table
+from .fleet import FLEET_TOTAL_COLUMNS
+from .fueleu import PENALTY_EUR_PER_TON, calculate_green_fuel_table
+from .pooling import calculate_pooling_table
+from .projection import (
+    GFI_TIER1_PRICE,
+    GFI_TIER2_PRICE,
+    GFI_YEARS,
+    calculate_gfi_batch,
+    calculate_gfi_projection,
+    calculate_gfi_surplus_offset,
+    project_gfi,
+)
+from .trace import stage
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 32 * 1024 * 1024   # 요청 본문 최대 크기 (선박 수만 척 일괄 요청 정도)
+
+# JSON 변환 (numpy 값 -> 파이썬 값, NaN -> null)
+def _json_default(value):
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"JSON으로 변환할 수 없는 값: {type(value).__name__}")
+
+def _clean(value):
+    if isinstance(value, dict):
+        return {str(k): _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if isinstance(value, (float, np.floating)) and math.isnan(value):
+        return None
+    return value
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+# 연료 행 필수 키 (값은 숫자), LHV/WtW는 없으면 기본값 (있으면 숫자)
+REQUIRED_AMOUNTS = {"FEUM": ("역내", "역외"), "GFI": ("사용량",)}
+OPTIONAL_FACTORS = ("LHV", "WtW")
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+# 연료 행 검증 -> 잘못된 값은 어느 선박 몇 번째 행의 어느 값인지 알려 줌
+def _check_rows(regime: str, name, fuel_data, single: bool):
+    where = "" if single else f"선박 {name} "
+    if not isinstance(fuel_data, list):
+        raise ValueError(f"{where}연료 데이터는 연료 행 목록 (JSON 배열)이어야 합니다.")
+    if not fuel_data:
+        raise ValueError("연료 데이터가 비어 있습니다." if single else f"연료 데이터가 비어 있습니다: {name}")
+    for i, row in enumerate(fuel_data, start=1):
+        if not isinstance(row, dict):
+            raise ValueError(f"연료 행은 JSON 객체여야 합니다 ({where}{i}번째 행)")
+        missing = [key for key in ("연료종류",) + REQUIRED_AMOUNTS[regime] if key not in row]
+        if missing:
+            raise ValueError(f"필수 값이 없습니다: {', '.join(missing)} ({where}{i}번째 행)")
+        if not isinstance(row["연료종류"], str):
+            raise ValueError(f"연료종류는 문자열이어야 합니다 ({where}{i}번째 행)")
+        for key in REQUIRED_AMOUNTS[regime] + tuple(key for key in OPTIONAL_FACTORS if key in row):
+            if not _is_number(row[key]):
+                raise ValueError(f"숫자가 아닌 값: {key} ({where}{i}번째 행)")
+
+# 요청 본문 -> (선박 1척 여부, {선박: 연료 행 리스트})
+def _vessels(payload: dict, regime: str) -> tuple[bool, dict]:
+    if "vessels" in payload:
+        single, vessels = False, payload["vessels"]
+        if not isinstance(vessels, dict) or not vessels:
+            raise ValueError("vessels는 {선박: 연료 목록} 형식이어야 합니다.")
+    elif "fuel_data" in payload:
+        single, vessels = True, {"-": payload["fuel_data"]}
+    else:
+        raise ValueError("fuel_data 또는 vessels가 필요합니다.")
+    for name, fuel_data in vessels.items():
+        _check_rows(regime, name, fuel_data, single)
+    return single, vessels
+
+# 선박별 연료 행 -> 열 단위 표 (선박 열 추가)
+def _fleet_frame(vessels: dict, vessel_col: str = "선박") -> pd.DataFrame:
+    rows = [{**row, vessel_col: str(name)} for name, fuel_data in vessels.items() for row in fuel_data]
+    if not rows:
+        raise ValueError("연료 데이터가 비어 있습니다.")
+    return pd.DataFrame(rows)
+
+# 선대 합계 (Fleet.totals와 같은 형식)
+def _fleet_totals(df: pd.DataFrame, regime: str) -> dict:
+    totals = {col: float(df[col].sum()) for col in FLEET_TOTAL_COLUMNS[regime]}
+    totals.update({"vessels": len(df), "surplus": int(df["surplus"].sum())})
+    return totals
+
+def _single_result(regime: str, result) -> dict:
+    if result is None:
+        raise ValueError("연료 데이터가 비어 있습니다.")
+    _, summary, table = result_summary(result)
+    return {"regime": regime, "summary": summary, "table": _records(table)}
+
+# 계산 서비스 -> 계수표 / 결과 캐시를 들고 있는 요청 처리 객체 (HTTP와 무관하게 호출 가능)
+class ComplianceService:
+    def __init__(self, cache: ResultCache | None = None):
+        # 계수표는 프로세스당 한 번 생성 (get_factor_table은 계수 버전별로 캐시)
+        self.tables = {regime: get_factor_table(regime) for regime in ("GFI", "FEUM")}
+        self.cache = default_cache() if cache is None else cache
+        self.routes = {
+            "/fueleu": self.fueleu,
+            "/fueleu/green": self.fueleu_green,
+            "/gfi": self.gfi,
+            "/gfi/projection": self.gfi_projection,
+        }
+
+    def health(self) -> dict:
+        return {"status": "ok", "factor_set_version": {regime: table.version for regime, table in self.tables.items()}}
+
+    # FuelEU 결과 -> 1척: 요약 + 연료별 계산표, 여러 척: 선박별 요약 + 선대 합계
+    def fueleu(self, payload: dict) -> dict:
+        single, vessels = _vessels(payload, "FEUM")
+        table = self.tables["FEUM"]
+        penalty_price = float(payload.get("penalty_price", PENALTY_EUR_PER_TON))
+        if single and penalty_price == PENALTY_EUR_PER_TON:
+            return _single_result("FEUM", cached_fueleu_result(vessels["-"], table.defaults, cache=self.cache))
+
+        df = _fleet_frame(vessels)
+        if "기간" not in df.columns:
+            df["기간"] = 0
+        batch = calculate_fueleu_batch(df, table, penalty_price=penalty_price)
+        batch["surplus"] = batch["avg_ghg_intensity"] < batch["standard_now"]
+        batch = typed_frame(batch.drop(columns=["기간", "penalty_basis_energy"]), "FEUM")
+        if single:
+            return {"regime": "FEUM", "summary": _records(batch.drop(columns="선박"))[0]}
+        return {"regime": "FEUM", "results": _records(batch), "totals": _fleet_totals(batch, "FEUM")}
+
+    # Deficit -> 탄소세를 0으로 만드는 친환경 연료량, Surplus -> Pooling 가능한 화석연료량 (fuels로 후보 연료 지정)
+    def fueleu_green(self, payload: dict) -> dict:
+        single, vessels = _vessels(payload, "FEUM")
+        defaults = self.tables["FEUM"].defaults
+        results = {}
+        for name, fuel_data in vessels.items():
+            result = cached_fueleu_result(fuel_data, defaults, cache=self.cache)
+            if result["avg_ghg_intensity"] < result["standard_now"]:
+                status, df = "Surplus", calculate_pooling_table(result, defaults, payload.get("fuels"))
+            elif result["avg_ghg_intensity"] > result["standard_now"]:
+                status, df = "Deficit", calculate_green_fuel_table(result, defaults, payload.get("fuels"))
+            else:
+                status, df = "Compliant", pd.DataFrame()
+            results[str(name)] = {"status": status, "table": _records(df)}
+        if single:
+            return {"regime": "FEUM", **results["-"]}
+        return {"regime": "FEUM", "results": results}
+
+    # GFI 결과 -> 1척: 요약 + 연료별 계산표, 여러 척: 선박별 요약 + 선대 합계 (year로 Tier 기준 연도 지정)
+    def gfi(self, payload: dict) -> dict:
+        single, vessels = _vessels(payload, "GFI")
+        table = self.tables["GFI"]
+        year = int(payload.get("year", GFI_YEARS[0]))
+        tier1_price = float(payload.get("tier1_price", GFI_TIER1_PRICE))
+        tier2_price = float(payload.get("tier2_price", GFI_TIER2_PRICE))
+        default_basis = (year, tier1_price, tier2_price) == (GFI_YEARS[0], GFI_TIER1_PRICE, GFI_TIER2_PRICE)
+        if single and default_basis:
+            return _single_result("GFI", cached_gfi_result(vessels["-"], table.defaults, cache=self.cache))
+
+        batch = typed_frame(calculate_gfi_batch(_fleet_frame(vessels), table, year=year,
+                                                tier1_price=tier1_price, tier2_price=tier2_price), "GFI")
+        if single:
+            return {"regime": "GFI", "summary": _records(batch.drop(columns="선박"))[0]}
+        return {"regime": "GFI", "results": _records(batch), "totals": _fleet_totals(batch, "GFI")}
+
+    # 연도별 GFI Compliance (years 기본 2028 ~ 2035) + 1척이면 Surplus 연도별 상쇄 연료량
+    def gfi_projection(self, payload: dict) -> dict:
+        single, vessels = _vessels(payload, "GFI")
+        table = self.tables["GFI"]
+        years = [int(year) for year in payload.get("years", GFI_YEARS)]
+        if not single:
+            projection = project_gfi(_fleet_frame(vessels), years, table)
+            return {"regime": "GFI", "projection": _records(projection)}
+
+        result = cached_gfi_result(vessels["-"], table.defaults, cache=self.cache)
+        if result is None:
+            raise ValueError("연료 데이터가 비어 있습니다.")
+        projection = calculate_gfi_projection(result["gfi"], result["total_energy"], years)
+        offset = calculate_gfi_surplus_offset(projection, table.defaults)
+        return {"regime": "GFI", "projection": _records(projection), "surplus_offset": _records(offset)}
+
+    # 경로별 요청 처리 -> (HTTP 상태, 응답 dict)
+    def handle(self, path: str, payload: dict) -> tuple[int, dict]:
+        route = self.routes.get(path)
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"없는 경로입니다: {path}"}
+        if not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "요청 본문은 JSON 객체여야 합니다."}
+        rows = payload.get("vessels") or payload.get("fuel_data")
+        try:
+            with stage("service" + path.replace("/", "."), rows=len(rows) if isinstance(rows, (list, dict)) else 0):
+                return HTTPStatus.OK, route(payload)
+        except KeyError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"필수 값이 없습니다: {e.args[0]}"}
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive (부하 테스트처럼 연결을 재사용하는 클라이언트)
+    disable_nagle_algorithm = True  # 헤더와 본문을 따로 쓰므로 TCP_NODELAY (keep-alive에서 응답마다 지연 ACK 대기 방지)
+    server_version = "ComplianceService/1"
+    service: ComplianceService = None
+    quiet = False
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(_clean(body), ensure_ascii=False, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send(HTTPStatus.OK, self.service.health())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"없는 경로입니다: {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"요청 본문이 너무 큽니다 (최대 {MAX_BODY_BYTES:,} bytes)"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"JSON 형식이 아닙니다: {e}"})
+            return
+        self._send(*self.service.handle(self.path.rstrip("/"), payload))
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+# HTTP 서버 생성 (port 0이면 빈 포트 자동 선택 -> server.server_address로 확인)
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache: ResultCache | None = None,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    handler = type("ComplianceHandler", (_Handler,), {"service": ComplianceService(cache), "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+# 서버 실행 (Ctrl+C로 종료)
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache: ResultCache | None = None, quiet: bool = False):
+    server = make_server(host, port, cache, quiet)
+    print(f"계산 서비스 시작: http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GFI / FuelEU 계산 HTTP 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"바인드 주소 (기본 {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본 {DEFAULT_PORT})")
+    parser.add_argument("--cache-dir", default=None, help="결과 캐시 폴더 (기본: COMPLIANCE_CACHE_DIR 또는 사용자 캐시 폴더)")
+    parser.add_argument("--quiet", action="store_true", help="요청 로그 출력 안 함")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, ResultCache(args.cache_dir) if args.cache_dir else None, args.quiet)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
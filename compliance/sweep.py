@@ -0,0 +1,153 @@
+# 시나리오 분석 (가격 / 규제 민감도 격자) -> 격자점마다 선대 전체를 다시 계산해서 하나의 결과 표로 모음
+#
+#  grid = {"penalty_price": [2400, 3000], "bio_share": np.linspace(0, 1, 11), "slip_scale": [0.5, 1, 2]}
+#  result = run_sweep(fleet, grid, regime="FEUM", workers=4)
+#
+# 격자점은 프로세스 풀로 나눠서 계산
+#  선대 자료는 작업자 초기화 때 한 번만 넘기고 작업에는 시나리오 값만 넘김 (작업마다 선대 자료를 다시 pickle 하지 않음)
+#  계수표는 작업자마다 slip 시나리오별로 한 번만 컴파일 (get_factor_table 캐시)
+#
+# 시나리오 변수 (지정하지 않은 값은 SWEEP_DEFAULTS 사용)
+#  penalty_price: FuelEU VLSFO 환산 톤당 탄소세 (€)
+#  tier1_price / tier2_price: GFI Tier 1 / Tier 2 CB 1톤당 탄소세 ($)
+#  bio_share: 화석 연료유 사용량 중 Bio(Fame)로 바꾸는 비율 (0 ~ 1, 0.24면 B24, 1이면 B100)
+#  slip_scale: LNG 계열 메탄 슬립 배율 (기본 계수 × slip_scale)
+#  year: GFI 기준 연도 (2028 ~ 2035)
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .batch import calculate_fueleu_batch
+from .factors import REGIMES, get_factor_table
+from .fueleu import PENALTY_EUR_PER_TON
+from .projection import GFI_TIER1_PRICE, GFI_TIER2_PRICE, project_gfi
+from .trace import traced
+
+SWEEP_DEFAULTS = {
+    "FEUM": {"penalty_price": PENALTY_EUR_PER_TON, "bio_share": 0.0, "slip_scale": 1.0},
+    "GFI": {"tier1_price": GFI_TIER1_PRICE, "tier2_price": GFI_TIER2_PRICE, "bio_share": 0.0, "slip_scale": 1.0, "year": 2028},
+}
+
+# bio_share 적용 대상 화석 연료유
+FOSSIL_OILS = {
+    "FEUM": ["HFO (Grades RME to RMK)", "LFO (Grades RMA to RMD)", "MDO MGO (Grades DMX to DMB)"],
+    "GFI": ["VLSFO", "HSFO", "LSMGO"],
+}
+
+AMOUNT_COLUMNS = {"FEUM": ["역내", "역외"], "GFI": ["사용량"]}
+
+# 선대 Summary 합계 열
+SUMMARY_COLUMNS = {
+    "FEUM": ["total_energy", "total_emission", "cb", "penalty_eur"],
+    "GFI": ["Tier 1 CB (tCO₂eq)", "Tier 2 CB (tCO₂eq)", "Surplus (tCO₂eq)", "총 탄소세 ($)"],
+}
+
+# 격자 -> 시나리오 목록 (격자 변수 순서대로 모든 조합)
+def scenario_grid(grid: dict, regime: str = "FEUM") -> list[dict]:
+    if regime not in SWEEP_DEFAULTS:
+        raise ValueError(f"알 수 없는 규제: {regime}")
+    unknown = set(grid) - set(SWEEP_DEFAULTS[regime])
+    if unknown:
+        raise ValueError(f"알 수 없는 시나리오 변수: {', '.join(sorted(unknown))}")
+    names = list(grid)
+    values = [np.atleast_1d(grid[name]).tolist() for name in names]
+    return [{**SWEEP_DEFAULTS[regime], **dict(zip(names, combo))} for combo in itertools.product(*values)]
+
+# 선대 자료 정리 -> {선박: 연료 리스트} 또는 선박 열이 있는 표
+#  기본값과 같은 LHV/WtW는 비워 둠 (slip 시나리오의 계수표 값이 적용되도록, 직접 입력한 값은 그대로 유지)
+def _fleet_frame(fleet, regime: str, vessel_col: str) -> pd.DataFrame:
+    if isinstance(fleet, pd.DataFrame):
+        df = fleet.reset_index(drop=True).copy()
+    else:
+        df = pd.DataFrame([{vessel_col: vessel, **row} for vessel, rows in fleet.items() for row in rows])
+    if df.empty:
+        raise ValueError("연료 데이터가 비어 있습니다.")
+    if regime == "FEUM" and "기간" not in df.columns:
+        df["기간"] = "-"
+
+    table = get_factor_table(regime)
+    idx = table.lookup(df["연료종류"])
+    for col, values in [("LHV", table.lhv), ("WtW", table.wtw)]:
+        if col in df.columns:
+            defaults = np.where(idx >= 0, values[idx], np.nan)
+            df[col] = df[col].astype(float).mask(df[col].astype(float) == defaults)
+    return df
+
+# slip 배율 -> 계수 overrides (배율 1이면 기본 계수표)
+def _slip_overrides(regime: str, scale: float) -> dict | None:
+    if scale == 1:
+        return None
+    ttw_factors = REGIMES[regime][1]
+    return {"TTW": {fuel: {"SLIP": ttw["SLIP"] * scale} for fuel, ttw in ttw_factors.items() if ttw.get("SLIP", 0) > 0}}
+
+# 화석 연료유 행을 화석연료 (1 - share) + Bio(Fame) share 행으로 분리 (Bio 행은 원래 행 바로 뒤)
+def _apply_bio_share(df: pd.DataFrame, regime: str, share: float) -> pd.DataFrame:
+    if share == 0:
+        return df
+    fossil = df["연료종류"].isin(FOSSIL_OILS[regime])
+    bio = df[fossil].copy()
+    bio["연료종류"] = "Bio(Fame)"
+    for col in ["LHV", "WtW"]:
+        if col in bio.columns:
+            bio[col] = np.nan
+    df = df.copy()
+    for col in AMOUNT_COLUMNS[regime]:
+        bio[col] = bio[col] * share
+        df.loc[fossil, col] = df.loc[fossil, col] * (1 - share)
+    return pd.concat([df, bio]).sort_index(kind="stable").reset_index(drop=True)
+
+# 시나리오 하나 계산 -> 선박별 결과 앞에 시나리오 번호와 시나리오 값 열 추가
+def _evaluate(regime: str, fleet: pd.DataFrame, vessel_col: str, index: int, scenario: dict) -> pd.DataFrame:
+    table = get_factor_table(regime, _slip_overrides(regime, scenario["slip_scale"]))
+    df = _apply_bio_share(fleet, regime, scenario["bio_share"])
+    if regime == "FEUM":
+        result = calculate_fueleu_batch(df, table, vessel_col, "기간", penalty_price=scenario["penalty_price"])
+    else:
+        result = project_gfi(df, [scenario["year"]], table, vessel_col, scenario["tier1_price"], scenario["tier2_price"])
+    scenario_columns = pd.DataFrame({"시나리오": index, **scenario}, index=result.index)
+    return pd.concat([scenario_columns, result], axis=1)
+
+# 작업자 프로세스 상태 (초기화 때 한 번 설정)
+_worker = {}
+
+def _init_worker(regime: str, fleet: pd.DataFrame, vessel_col: str):
+    _worker.update(regime=regime, fleet=fleet, vessel_col=vessel_col)
+
+def _run_chunk(items: list) -> list[pd.DataFrame]:
+    return [_evaluate(_worker["regime"], _worker["fleet"], _worker["vessel_col"], index, scenario) for index, scenario in items]
+
+# 시나리오 결과를 계산이 끝나는 대로 하나씩 반환 (작업자가 여럿이면 끝나는 순서, 시나리오 열로 구분)
+def iter_sweep(fleet, grid, regime: str = "FEUM", workers: int | None = None, vessel_col: str = "선박", chunk_size: int | None = None):
+    scenarios = list(enumerate(scenario_grid(grid, regime) if isinstance(grid, dict) else grid))
+    frame = _fleet_frame(fleet, regime, vessel_col)
+
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(scenarios) <= 1:
+        for index, scenario in scenarios:
+            yield _evaluate(regime, frame, vessel_col, index, scenario)
+        return
+
+    # 작업 단위는 시나리오 묶음 (작업자당 4묶음 정도로 나눠서 작업 전달 비용과 부하 균형을 맞춤)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(scenarios) // (workers * 4)))
+    chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(regime, frame, vessel_col)) as executor:
+        futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+# 시나리오 분석 -> 선박별 결과 표 (시나리오 번호 순서)와 시나리오별 선대 합계 표
+#  grid: {시나리오 변수: 값 목록} (모든 조합 계산) 또는 시나리오 dict 목록
+@traced("sweep.run_sweep", rows=lambda fleet, *_, **__: len(fleet))
+def run_sweep(fleet, grid, regime: str = "FEUM", workers: int | None = None, vessel_col: str = "선박",
+              chunk_size: int | None = None) -> dict:
+    frames = list(iter_sweep(fleet, grid, regime, workers, vessel_col, chunk_size))
+    df_result = pd.concat(frames).sort_values("시나리오", kind="stable").reset_index(drop=True)
+
+    scenario_columns = ["시나리오"] + list(SWEEP_DEFAULTS[regime])
+    df_summary = df_result.groupby(scenario_columns, sort=True)[SUMMARY_COLUMNS[regime]].sum().reset_index()
+    return {"df_result": df_result, "df_summary": df_summary}
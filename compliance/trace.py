@@ -0,0 +1,130 @@
+# 계산 단계별 성능 추적 -> 단계 이름별 호출 수, 소요 시간, 처리 행 수를 모아 JSON / 표로 출력
+#
+#  trace = start_tracing()        # 현재 실행 흐름 (스레드 / Streamlit 세션)에서 추적 시작
+#  ...계산...
+#  stop_tracing(); print(trace.to_json())
+#
+# 추적을 켜지 않으면 단계마다 ContextVar 조회 한 번만 하고 바로 실행 (사실상 비용 없음)
+
+import functools
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+
+_current = ContextVar("compliance_trace", default=None)
+
+# 추적 결과 -> stages: 단계별 합계, events: 호출 순서대로의 기록 (시작 시각, 소요 시간, 행 수, 중첩 깊이)
+class Trace:
+    def __init__(self, max_events: int = 10_000):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.events = []
+        self.max_events = max_events
+        self.depth = 0
+
+    def record(self, name: str, start: float, seconds: float, rows, depth: int):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {"calls": 0, "seconds": 0.0, "rows": 0}
+        stage["calls"] += 1
+        stage["seconds"] += seconds
+        if rows is not None:
+            stage["rows"] += int(rows)
+        if len(self.events) < self.max_events:
+            self.events.append({"stage": name, "start": start - self.started, "seconds": seconds, "rows": rows, "depth": depth})
+
+    def to_dict(self) -> dict:
+        stages = sorted(self.stages.items(), key=lambda item: -item[1]["seconds"])
+        return {
+            "total_seconds": time.perf_counter() - self.started,
+            "stages": [{"stage": name, **values} for name, values in stages],
+            "events": self.events
+        }
+
+    def to_json(self, **options) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **options)
+
+    # 단계별 합계 표 (소요 시간 큰 순서)
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.to_dict()["stages"], columns=["stage", "calls", "seconds", "rows"])
+        df["ms/call"] = df["seconds"] * 1000 / df["calls"].where(df["calls"] > 0)
+        return df
+
+class _Stage:
+    __slots__ = ("trace", "name", "rows", "start", "depth")
+
+    def __init__(self, trace, name, rows):
+        self.trace, self.name, self.rows = trace, name, rows
+
+    def __enter__(self):
+        self.depth = self.trace.depth
+        self.trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        self.trace.depth -= 1
+        self.trace.record(self.name, self.start, seconds, self.rows, self.depth)
+        return False
+
+# 추적이 꺼져 있을 때 쓰는 빈 단계 (rows를 넣어도 무시)
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+_NO_STAGE = _NoStage()
+
+# 추적 시작 -> 이전 추적이 남아 있어도 새로 시작 (Streamlit 재실행마다 호출해도 됨), enabled=False면 추적 끔
+def start_tracing(enabled: bool = True) -> Trace | None:
+    trace = Trace() if enabled else None
+    _current.set(trace)
+    return trace
+
+def stop_tracing() -> Trace | None:
+    trace = _current.get()
+    _current.set(None)
+    return trace
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+# with 블록 추적 범위 (블록이 끝나면 이전 상태로 복원)
+@contextmanager
+def tracing(enabled: bool = True):
+    token = _current.set(Trace() if enabled else None)
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+# 단계 하나 기록 -> with stage("fueleu.fill", rows=len(df)) as s: ... (s.rows로 나중에 지정 가능)
+def stage(name: str, rows=None):
+    trace = _current.get()
+    if trace is None:
+        return _NO_STAGE
+    return _Stage(trace, name, rows)
+
+# 함수 단위 추적 데코레이터 -> rows는 함수 인자를 받아 처리 행 수를 돌려주는 함수
+def traced(name: str, rows=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Stage(trace, name, rows(*args, **kwargs) if rows is not None else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,210 @@
+# 배출계수 불확실성 Monte Carlo 분석 -> SLIP, Cfug, GWP, WtT 범위를 표본 추출해서 GFI / CB / 탄소세 분포 계산
+#
+# TtW 계산식은 generate_*_fuel_defaults의 calculate_ttw와 같음 (배열로 한 번에 계산)
+#  비산분 = SLIP × (1 - Cfug/100) + Cfug/100   (FuelEU는 Cfug 없음 -> 비산분 = SLIP)
+#  TtW = ((1 - 비산분) × 연소 배출 + 비산분 × 슬립 배출) / LCV
+# 범위는 (최소, 최대)면 균등분포, (최소, 최빈, 최대)면 삼각분포로 추출
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .factors import (
+    FEUM_GWP_FACTORS,
+    FEUM_TTW_FACTORS,
+    FEUM_WTT_FACTORS,
+    GFI_GWP_FACTORS,
+    GFI_TTW_FACTORS,
+    GFI_WTT_FACTORS,
+    get_factor_table,
+)
+from .fueleu import FEUM_BLEND_COMPONENTS, OUTSIDE_HALF_FUELS, PENALTY_EUR_PER_TON, VLSFO_LHV
+from .gfi import GFI_BLEND_COMPONENTS
+from .projection import calculate_gfi_projection, fueleu_standard
+
+REGIME_FACTORS = {
+    "FEUM": (FEUM_GWP_FACTORS, FEUM_TTW_FACTORS, FEUM_WTT_FACTORS, FEUM_BLEND_COMPONENTS),
+    "GFI": (GFI_GWP_FACTORS, GFI_TTW_FACTORS, GFI_WTT_FACTORS, GFI_BLEND_COMPONENTS),
+}
+
+# 기본 가정 -> GWP는 AR4(25/298)와 AR5(28/265) 사이, 메탄 슬립은 기준값의 0.5 ~ 2배 (최빈값 = 기준값)
+def default_ranges(regime: str = "FEUM") -> dict:
+    _, ttw_factors, _, _ = REGIME_FACTORS[regime]
+    return {
+        "GWP": {"CH4": (25, 28), "N2O": (265, 298)},
+        "SLIP": {
+            fuel: (ttw["SLIP"] * 0.5, ttw["SLIP"], ttw["SLIP"] * 2)
+            for fuel, ttw in ttw_factors.items() if ttw.get("SLIP", 0) > 0
+        }
+    }
+
+PERCENTILES = (5, 50, 95)
+CHUNK_DRAWS = 25_000
+
+def _sample(rng, spec, n, point):
+    if spec is None:
+        return np.full(n, float(point))
+    if len(spec) == 2:
+        return rng.uniform(spec[0], spec[1], n)
+    left, mode, right = spec
+    if left == right:
+        return np.full(n, float(mode))
+    return rng.triangular(left, mode, right, n)
+
+# 연료별 WtW 표본 (n × 연료 수)
+def sample_wtw(regime: str, fuels: list[str], n: int, ranges: dict, rng) -> np.ndarray:
+    gwp_factors, ttw_factors, wtt_factors, _ = REGIME_FACTORS[regime]
+    gwp_ranges = ranges.get("GWP", {})
+    gwp = {gas: _sample(rng, gwp_ranges.get(gas), n, gwp_factors[gas]) for gas in ("CO2", "CH4", "N2O")}
+
+    columns = []
+    for fuel in fuels:
+        ttw = ttw_factors[fuel]
+        slip = _sample(rng, ranges.get("SLIP", {}).get(fuel), n, ttw.get("SLIP", 0.0))
+        cfug = _sample(rng, ranges.get("Cfug", {}).get(fuel), n, ttw.get("Cfug", 0.0)) / 100
+        wtt = _sample(rng, ranges.get("WtT", {}).get(fuel), n, wtt_factors.get(fuel, 0.0))
+
+        unoxidized = slip * (1 - cfug) + cfug
+        combustion = ttw.get("CO2", 0.0) * gwp["CO2"] + ttw.get("CH4", 0.0) * gwp["CH4"] + ttw.get("N2O", 0.0) * gwp["N2O"]
+        slip_emission = ttw.get("CO2_slip", 0.0) * gwp["CO2"] + ttw.get("CH4_slip", 0.0) * gwp["CH4"] + ttw.get("N2O_slip", 0.0) * gwp["N2O"]
+        columns.append(wtt + ((1 - unoxidized) * combustion + unoxidized * slip_emission) / ttw["LCV"])
+    return np.column_stack(columns) if columns else np.zeros((n, 0))
+
+# 입력 연료를 계산 블록으로 분리 -> 혼합연료는 구성 연료별 블록, WtW를 직접 입력한 연료는 고정값
+def _blocks(regime: str, fuel_data: list[dict]) -> dict:
+    _, ttw_factors, _, blend_components = REGIME_FACTORS[regime]
+    defaults = get_factor_table(regime).defaults
+
+    rows = []
+    for row in fuel_data:
+        fuel = row["연료종류"]
+        parts = blend_components.get(fuel, [(fuel, 1.0)])
+        for name, ratio in parts:
+            if name not in defaults and "WtW" not in row:
+                raise ValueError(f"알 수 없는 연료 종류: {name}")
+            lhv = defaults[name]["LHV"] if len(parts) > 1 or "LHV" not in row else row["LHV"]
+            fixed_wtw = None
+            if len(parts) == 1 and "WtW" in row and (name not in defaults or row["WtW"] != defaults[name]["WtW"]):
+                fixed_wtw = row["WtW"]
+            elif name not in ttw_factors:
+                fixed_wtw = defaults[name]["WtW"]
+            amounts = {key: row.get(key, 0.0) * ratio for key in ("역내", "역외", "사용량")}
+            rows.append({"연료종류": name, "LHV": lhv, "fixed_wtw": fixed_wtw, **amounts})
+
+    fuels = sorted({r["연료종류"] for r in rows if r["fixed_wtw"] is None})
+    column = {fuel: i for i, fuel in enumerate(fuels)}
+    lhv = np.array([r["LHV"] for r in rows], dtype=float)
+    blocks = {
+        "fuels": fuels,
+        "column": np.array([column.get(r["연료종류"], -1) if r["fixed_wtw"] is None else -1 for r in rows]),
+        "fixed_wtw": np.array([np.nan if r["fixed_wtw"] is None else r["fixed_wtw"] for r in rows], dtype=float),
+    }
+    if regime == "FEUM":
+        inside = lhv * np.array([r["역내"] for r in rows], dtype=float)
+        outside = lhv * np.array([r["역외"] for r in rows], dtype=float)
+        half = np.array([r["연료종류"] in OUTSIDE_HALF_FUELS for r in rows])
+        blocks["penalty_basis_energy"] = inside.sum() + (outside * 0.5).sum()
+        blocks["size"] = inside + np.where(half, outside * 0.5, outside)
+    else:
+        blocks["energy"] = lhv * np.array([r["사용량"] for r in rows], dtype=float)
+    return blocks
+
+# 표본 WtW를 블록 순서로 펼치기
+def _block_wtw(blocks, wtw_samples, n):
+    column = blocks["column"]
+    wtw = np.broadcast_to(blocks["fixed_wtw"], (n, len(column))).copy()
+    sampled = column >= 0
+    wtw[:, sampled] = wtw_samples[:, column[sampled]]
+    return wtw
+
+# 표본 묶음 하나 계산 (프로세스 작업 단위)
+def _simulate_chunk(regime, blocks, n, ranges, seed, year):
+    rng = np.random.default_rng(seed)
+    wtw = _block_wtw(blocks, sample_wtw(regime, blocks["fuels"], n, ranges, rng), n)
+
+    if regime == "GFI":
+        energy = blocks["energy"]
+        total_energy = energy.sum()
+        gfi = wtw @ energy / total_energy
+        df = calculate_gfi_projection(gfi, total_energy, np.full(n, year))
+        cb = df["Tier 1 CB (tCO₂eq)"] + df["Tier 2 CB (tCO₂eq)"] - df["Surplus (tCO₂eq)"]
+        return {"gfi": gfi, "cb": cb.to_numpy(), "penalty": df["총 탄소세 ($)"].to_numpy()}
+
+    # 표본마다 WtW 순서가 달라질 수 있으므로 행별로 정렬해서 발열량 채워넣기
+    order = np.argsort(wtw, axis=1, kind="stable")
+    wtw_sorted = np.take_along_axis(wtw, order, axis=1)
+    size = blocks["size"][order]
+    start = np.cumsum(size, axis=1) - size
+    used = np.clip(blocks["penalty_basis_energy"] - start, 0, size)
+
+    total_energy = used.sum(axis=1)
+    total_emission = (used * wtw_sorted).sum(axis=1) / 1_000_000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = np.where(total_energy > 0, total_emission * 1_000_000 / total_energy, 0.0)
+    std = float(fueleu_standard([year], 15)[0])
+    cb = (std - avg) * total_energy / 1_000_000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        penalty = np.where(avg > std, (std - avg) * total_energy * PENALTY_EUR_PER_TON / VLSFO_LHV / avg, 0.0)
+    return {"avg_ghg_intensity": avg, "cb": cb, "penalty_eur": penalty}
+
+# 선대 Monte Carlo 분석
+#  fleet: {선박: 연료 리스트}  (FEUM: 연료종류/역내/역외, GFI: 연료종류/사용량)
+#  같은 seed면 작업자 수와 관계없이 같은 결과 (표본 묶음마다 SeedSequence를 나눠서 사용)
+def run_monte_carlo(fleet: dict, regime: str = "FEUM", n_draws: int = 100_000, ranges: dict | None = None,
+                    seed: int = 0, workers: int | None = None, year: int | None = None,
+                    percentiles=PERCENTILES, keep_samples: bool = False) -> dict:
+    if regime not in REGIME_FACTORS:
+        raise ValueError(f"알 수 없는 규제: {regime}")
+    if ranges is None:
+        ranges = default_ranges(regime)
+    if year is None:
+        year = 2025 if regime == "FEUM" else 2028
+
+    vessels = list(fleet)
+    n_chunks = -(-n_draws // CHUNK_DRAWS)
+    chunk_sizes = [min(CHUNK_DRAWS, n_draws - i * CHUNK_DRAWS) for i in range(n_chunks)]
+    vessel_seeds = np.random.SeedSequence(seed).spawn(len(vessels))
+
+    tasks = []
+    for vessel, vessel_seed in zip(vessels, vessel_seeds):
+        blocks = _blocks(regime, fleet[vessel])
+        for size, chunk_seed in zip(chunk_sizes, vessel_seed.spawn(n_chunks)):
+            tasks.append((regime, blocks, size, ranges, chunk_seed, year))
+
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(tasks) == 1:
+        outputs = [_simulate_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_simulate_chunk, *zip(*tasks)))
+
+    rows, samples = [], {}
+    for v, vessel in enumerate(vessels):
+        parts = outputs[v * n_chunks:(v + 1) * n_chunks]
+        merged = {metric: np.concatenate([part[metric] for part in parts]) for metric in parts[0]}
+        samples[vessel] = merged
+        for metric, values in merged.items():
+            row = {"선박": vessel, "지표": metric, "평균": values.mean()}
+            row.update({f"P{p}": value for p, value in zip(percentiles, np.percentile(values, percentiles))})
+            rows.append(row)
+
+    # 탄소세 발생 확률
+    penalty_key = "penalty_eur" if regime == "FEUM" else "penalty"
+    probability = {vessel: float((samples[vessel][penalty_key] != 0).mean()) for vessel in vessels}
+
+    return {
+        "df_summary": pd.DataFrame(rows),
+        "penalty_probability": probability,
+        "samples": samples if keep_samples else None
+    }
+
+# 단일 선박 Monte Carlo 분석
+def run_monte_carlo_vessel(fuel_data: list[dict], regime: str = "FEUM", **options) -> dict:
+    result = run_monte_carlo({"-": fuel_data}, regime, **options)
+    return {
+        "df_summary": result["df_summary"].drop(columns="선박"),
+        "penalty_probability": result["penalty_probability"]["-"],
+        "samples": result["samples"]["-"] if result["samples"] is not None else None
+    }